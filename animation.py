@@ -0,0 +1,116 @@
+"""Tk 이벤트 루프(after) 기반 이동 애니메이션 스케줄러
+
+time.sleep 대신 after 콜백으로 프레임을 진행하므로 애니메이션 중에도
+입력, 리사이즈, 다시 그리기가 막히지 않습니다.
+"""
+import time
+
+from tracing import traced
+
+FRAME_MS = 16  # 약 60fps
+FRAME_BUDGET_MS = 8  # 한 프레임에서 애니메이션 갱신에 쓸 수 있는 최대 시간
+
+
+class PathAnimation:
+    """말 하나를 칸 경로를 따라 한 칸씩 움직이는 트윈
+
+    on_frame(from_square, to_square, t)는 두 칸 사이 진행도 t(0~1)로 호출되고,
+    경로 끝에 도달하면 on_done()이 한 번 호출됩니다.
+    """
+    def __init__(self, start_square, path, step_ms, on_frame, on_done=None):
+        self.squares = [start_square] + list(path)
+        self.step_ms = step_ms
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.started_at = None
+        self.finished = False
+        self.cancelled = False
+
+    @property
+    def duration_ms(self):
+        return self.step_ms * (len(self.squares) - 1)
+
+    def advance(self, now):
+        """now(초) 시점의 위치로 갱신하고, 끝났으면 True를 반환합니다."""
+        if self.started_at is None:
+            self.started_at = now
+        elapsed_ms = (now - self.started_at) * 1000
+        steps = len(self.squares) - 1
+        if self.step_ms <= 0 or elapsed_ms >= self.duration_ms or steps == 0:
+            self.on_frame(self.squares[-2] if steps else self.squares[-1], self.squares[-1], 1.0)
+            return True
+        step, remainder = divmod(elapsed_ms, self.step_ms)
+        step = int(step)
+        self.on_frame(self.squares[step], self.squares[step + 1], remainder / self.step_ms)
+        return False
+
+    def cancel(self):
+        """애니메이션을 멈춥니다. (on_done은 호출되지 않음)"""
+        self.cancelled = True
+
+
+class AnimationScheduler:
+    """root.after로 프레임을 돌리며 진행 중인 애니메이션을 모두 갱신합니다."""
+    def __init__(self, root, frame_ms=FRAME_MS, frame_budget_ms=FRAME_BUDGET_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.frame_budget_ms = frame_budget_ms
+        self.animations = []
+        self.after_id = None
+
+    @property
+    def busy(self):
+        return bool(self.animations)
+
+    def start(self, animation):
+        """애니메이션을 등록합니다. 길이가 0이면 즉시 끝냅니다."""
+        if animation.duration_ms <= 0:
+            self._finish(animation, time.perf_counter())
+            return animation
+        self.animations.append(animation)
+        if self.after_id is None:
+            self.after_id = self.root.after(0, self._tick)
+        return animation
+
+    def _finish(self, animation, now):
+        animation.advance(now)
+        animation.finished = True
+        if animation.on_done is not None:
+            animation.on_done()
+
+    @traced("animation_frame")
+    def _tick(self):
+        """한 프레임: 프레임 예산 안에서 애니메이션을 갱신하고 다음 프레임을 예약합니다."""
+        self.after_id = None
+        frame_start = time.perf_counter()
+        deadline = frame_start + self.frame_budget_ms / 1000
+
+        # 예산을 넘기면 남은 애니메이션은 다음 프레임으로 미룹니다 (시간 기반이라 자연스럽게 따라잡음)
+        pending = self.animations
+        self.animations = []
+        for index, animation in enumerate(pending):
+            if animation.cancelled:
+                continue
+            now = time.perf_counter()
+            if now > deadline:
+                self.animations.extend(a for a in pending[index:] if not a.cancelled)
+                break
+            if animation.advance(now):
+                animation.finished = True
+                if animation.on_done is not None:
+                    animation.on_done()
+            else:
+                self.animations.append(animation)
+
+        if self.animations and self.after_id is None:
+            spent_ms = int((time.perf_counter() - frame_start) * 1000)
+            self.after_id = self.root.after(max(1, self.frame_ms - spent_ms), self._tick)
+
+    def cancel_all(self):
+        """진행 중인 모든 애니메이션과 예약된 프레임을 취소합니다."""
+        for animation in self.animations:
+            animation.cancel()
+        self.animations = []
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
@@ -0,0 +1,465 @@
+"""뱀 사다리 게임 핫 패스 벤치마크
+
+측정 항목:
+  - 시작 시간 (python -X importtime으로 게임 모듈 가져오기, 무거운 모듈 지연 로딩 확인)
+  - draw_board / draw_players / 창 크기 조절 한 프레임 (여러 캔버스 크기, 가상 디스플레이 사용)
+  - PIL 헤드리스 보드 렌더링과 썸네일 저장
+  - get_coords (배치표 조회) 처리량
+  - setup_board_elements (보드 생성) 밀도별 시간
+  - UI 없는 게임 로직의 턴 처리량, 기록 재생/검증, 배치/멀티코어 시뮬레이션, 마르코프 해석, 승리 확률,
+    보드 저장소 넣기/질의
+  - load_player_sprites (로컬 대역 HTTP 서버 + 지연 주입)
+
+사용법:
+  python benchmarks/run_benchmarks.py --output results.json
+  python benchmarks/run_benchmarks.py --output new.json --compare results.json --threshold 0.2
+
+게임이 쓰는 기록, 스프라이트 캐시, 보드 저장소는 실행 동안 임시 폴더로 돌립니다.
+Tk 벤치마크는 DISPLAY가 필요합니다. 없으면 Xvfb가 설치되어 있을 때 가상 디스플레이를 띄우고,
+그것도 안 되면 해당 항목만 건너뜁니다. --compare로 이전 결과보다 중앙값이 threshold 이상 느려진
+항목이 있으면 표시하고 종료 코드 1을 반환합니다.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from board_layout import BoardLayout  # noqa: E402
+from game_engine import RULE_VARIANTS, GameEngine, RuleSet, generate_board  # noqa: E402
+from replay_log import GameRecord, decode_game, encode_game, game_rngs, verify_game  # noqa: E402
+
+CANVAS_SIZES = (400, 600, 900)
+BOARD_DENSITIES = ((5, 5), (10, 10), (15, 15), (20, 20))
+SPRITE_LATENCIES_MS = (0, 50)
+XVFB_DISPLAY = ":97"
+STARTUP_REPEAT = 5
+HEAVY_IMPORTS = ("requests", "PIL", "numpy", "scipy")  # 설정 화면 전에 가져오면 안 되는 모듈
+
+
+def measure(fn, repeat=20, number=1, setup=None):
+    """fn을 number번 실행하는 시간을 repeat번 재서 요약합니다. (setup은 측정에서 제외)"""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    median = statistics.median(samples)
+    return {
+        'median_ms': median * 1000,
+        'min_ms': min(samples) * 1000,
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'ops_per_sec': 1 / median if median > 0 else float('inf'),
+        'repeat': repeat,
+        'number': number,
+    }
+
+
+# --- 개별 벤치마크 ---
+def import_time_ms(module):
+    """새 인터프리터에서 module을 가져오는 누적 시간(ms)과 함께 로드된 무거운 모듈 목록"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY_IMPORTS!r} if m in sys.modules))")
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_DIR,
+                               capture_output=True, text=True, check=True)
+    for line in completed.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000, [name for name in completed.stdout.strip().split(",") if name]
+    raise RuntimeError(f"{module} 가져오기 시간을 찾지 못했습니다.")
+
+
+def bench_startup():
+    samples = []
+    heavy = []
+    for _ in range(STARTUP_REPEAT):
+        elapsed_ms, heavy = import_time_ms("snake_and_ladder_game")
+        samples.append(elapsed_ms)
+    median = statistics.median(samples)
+    result = {
+        'median_ms': median,
+        'min_ms': min(samples),
+        'mean_ms': statistics.fmean(samples),
+        'ops_per_sec': 1000 / median if median > 0 else float('inf'),
+        'repeat': STARTUP_REPEAT,
+        'number': 1,
+        'heavy_modules_loaded': heavy,
+    }
+    return {'import snake_and_ladder_game': result}
+
+
+def bench_get_coords():
+    layout = BoardLayout(600, 600)
+    squares = list(range(1, 101)) * 100
+    results = {'get_coords': measure(lambda: [layout.center(square) for square in squares], repeat=10)}
+    results['get_coords']['ops_per_sec'] *= len(squares)  # 조회 한 번 기준
+
+    sizes = iter(range(10 ** 9))
+    results['layout_rebuild'] = measure(lambda: layout.resize(600 + next(sizes) % 50, 600), repeat=50, number=10)
+    return results
+
+
+def bench_board_generation():
+    results = {}
+    for num_snakes, num_ladders in BOARD_DENSITIES:
+        rng = random.Random(1)
+        results[f'setup_board_elements[{num_snakes}s/{num_ladders}l]'] = measure(
+            lambda: generate_board(num_snakes, num_ladders, rng), repeat=20, number=50)
+    rng = random.Random(1)
+    results['setup_board_elements[10^4 squares, 2000s/2000l]'] = measure(
+        lambda: generate_board(2000, 2000, rng, board_size=10 ** 4, grid_dim=100), repeat=5)
+    return results
+
+
+def bench_game_logic():
+    snakes, ladders = generate_board(10, 10, random.Random(1))
+    engine = GameEngine(4, snakes, ladders, random.Random(1))
+
+    def play_turns(count=10000):
+        for _ in range(count):
+            if engine.game_over:
+                engine.reset()
+            engine.play_turn()
+
+    results = {'engine_turns[x10000]': measure(play_turns, repeat=10)}
+    results['engine_turns[x10000]']['turns_per_sec'] = 10000 / (results['engine_turns[x10000]']['median_ms'] / 1000)
+    engine = GameEngine(4, snakes, ladders, random.Random(1), rules=RuleSet.from_names(RULE_VARIANTS))
+    results['engine_turns[x10000, all rule variants]'] = measure(play_turns, repeat=10)
+
+    archive = [encode_game(record_game(seed, snakes, ladders, 4)) for seed in range(1000)]
+    results['verify_replays[x1000]'] = measure(lambda: [verify_game(decode_game(data)) for data in archive], repeat=5)
+
+    try:
+        from simulation import simulate_games
+        from markov_solver import clear_cache, solve_board
+        from parallel_simulation import simulate_corpus
+        from win_probability import WinProbabilityTable
+        from board_store import BoardStore
+    except ImportError as e:
+        print(f"  (NumPy/SciPy 없음, 시뮬레이션/해석 건너뜀: {e})")
+        return results
+    results['simulate_games[100k games, 2p]'] = measure(
+        lambda: simulate_games(snakes, ladders, 100000, 2, seed=1), repeat=5)
+    corpus = [generate_board(10, 10, random.Random(index)) for index in range(8)]
+    workers = os.cpu_count() or 1
+    name = f'simulate_corpus[8 boards x 50k games, {workers} workers]'
+    results[name] = measure(lambda: simulate_corpus(corpus, 50000, 2, seed=1, workers=workers), repeat=3)
+    results[name]['games_per_sec'] = 400000 / (results[name]['median_ms'] / 1000)
+    results['solve_board'] = measure(lambda: solve_board(snakes, ladders), setup=clear_cache, repeat=20)
+    results['win_probability_table'] = measure(lambda: WinProbabilityTable(snakes, ladders), repeat=20)
+    table = WinProbabilityTable(snakes, ladders)
+    state_rng = random.Random(1)
+    states = [([state_rng.randint(1, 99) for _ in range(4)], state_rng.randrange(4)) for _ in range(1000)]
+    results['win_probabilities[x1000 states, uncached]'] = measure(
+        lambda: [table.probabilities(*state) for state in states],
+        setup=table.cache.clear, repeat=10)
+    crowd = [([state_rng.randint(1, 99) for _ in range(500)], state_rng.randrange(500)) for _ in range(100)]
+    results['win_probabilities[x100 states, 500 players]'] = measure(
+        lambda: [table.probabilities(*state) for state in crowd], setup=table.cache.clear, repeat=10)
+    store_dir = tempfile.mkdtemp(prefix="board-store-bench-")
+    try:
+        with BoardStore(os.path.join(store_dir, "boards.sqlite3")) as store:
+            name = 'board_store_add[1024 boards]'
+            results[name] = measure(lambda: store.add_boards(generate_board(10, 10, random.Random(index))
+                                                             for index in range(1024)), repeat=1)
+            results['board_store_query[ladders=10, length 20-25]'] = measure(
+                lambda: store.query(num_ladders=10, min_length=20, max_length=25), repeat=20)
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+    return results
+
+
+def record_game(seed, snakes, ladders, num_players):
+    """시드의 주사위로 게임 하나를 끝까지 진행한 GameRecord"""
+    engine = GameEngine(num_players, snakes, ladders, game_rngs(seed)[1])
+    rolls = bytearray()
+    while not engine.game_over:
+        rolls.append(engine.play_turn().roll)
+    return GameRecord(seed, engine.board_size, num_players, snakes, ladders, bytes(rolls))
+
+
+def bench_board_image():
+    try:
+        from board_image import render_board, static_layer
+    except ImportError as e:
+        print(f"  (Pillow 없음, 헤드리스 렌더링 건너뜀: {e})")
+        return {}
+    import io
+
+    snakes, ladders = generate_board(10, 10, random.Random(1))
+    results = {'static_layer[60px, uncached]': measure(lambda: static_layer(60), setup=static_layer.cache_clear,
+                                                        repeat=10)}
+    results['render_board[60px]'] = measure(lambda: render_board(snakes, ladders, 60, [1, 37, 64, 99]), repeat=20)
+
+    def thumbnail():
+        render_board(snakes, ladders, 12).save(io.BytesIO(), 'PNG')
+
+    results['thumbnail[12px, png]'] = measure(thumbnail, repeat=20, number=10)
+    results['thumbnail[12px, png]']['per_minute'] = 60 / (results['thumbnail[12px, png]']['median_ms'] / 1000)
+    return results
+
+
+def _wait_for(futures, timeout=30):
+    for future in futures:
+        try:
+            future.result(timeout)
+        except Exception:
+            pass
+
+
+def bench_sprite_loading():
+    try:
+        from stub_pokeapi import StubPokeAPI
+        from sprite_cache import SpriteCache
+        from sprite_loader import SpriteLoader
+    except ImportError as e:
+        print(f"  (requests/Pillow 없음, 스프라이트 로딩 건너뜀: {e})")
+        return {}
+
+    results = {}
+    for latency_ms in SPRITE_LATENCIES_MS:
+        with StubPokeAPI(latency=latency_ms / 1000) as stub:
+            cache_dir = tempfile.mkdtemp(prefix="sprite-bench-")
+            loader = SpriteLoader(SpriteCache(cache_dir), base_url=stub.base_url)
+
+            def load():
+                _wait_for(loader.load(4, lambda *a: None, lambda *a: None, dispatch=lambda callback: None))
+
+            def clear_cache():
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                loader.cache = SpriteCache(cache_dir)
+
+            results[f'load_player_sprites[cold, {latency_ms}ms]'] = measure(load, setup=clear_cache, repeat=5)
+            # 재시작 상황: 온라인 모드에서도 캐시에 있는 포켓몬을 먼저 고름 (네트워크 요청 0회여야 함)
+            load()
+            loader.cache = SpriteCache(cache_dir)
+            requests_before = stub.request_count
+            results[f'load_player_sprites[warm, {latency_ms}ms]'] = measure(load, repeat=5)
+            results[f'load_player_sprites[warm, {latency_ms}ms]']['http_requests'] = stub.request_count - requests_before
+            loader.shutdown()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def isolate_user_data():
+    """게임이 쓰는 기록/스프라이트 캐시/보드 저장소 경로를 임시 폴더로 돌립니다. (폴더를 반환)
+
+    벤치마크가 실제 SnakeAndLadderGame을 만들어도 사용자 홈 폴더에는 아무것도 쓰지 않습니다.
+    """
+    data_dir = tempfile.mkdtemp(prefix="ladder-bench-")
+    os.environ["LADDER_REPLAY_DIR"] = os.path.join(data_dir, "replays")
+    os.environ["LADDER_SPRITE_CACHE"] = os.path.join(data_dir, "sprites")
+    os.environ["LADDER_BOARD_STORE"] = os.path.join(data_dir, "boards.sqlite3")
+    return data_dir
+
+
+def ensure_display():
+    """DISPLAY가 없으면 Xvfb 가상 디스플레이를 띄웁니다. (띄운 프로세스를 반환)"""
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None
+    process = subprocess.Popen([xvfb, XVFB_DISPLAY, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = XVFB_DISPLAY
+    time.sleep(0.5)
+    return process
+
+
+def bench_rendering():
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  (디스플레이 없음, 렌더링 건너뜀: {e})")
+        return {}
+
+    import snake_and_ladder_game as game_module
+    from board_view import BoardView
+
+    results = {}
+    cache_dir = tempfile.mkdtemp(prefix="sprite-bench-")
+    try:
+        from stub_pokeapi import StubPokeAPI
+        from sprite_cache import SpriteCache
+        from sprite_loader import SpriteLoader
+        with StubPokeAPI() as stub:
+            game = game_module.SnakeAndLadderGame(root)
+            game.sprite_loader.shutdown()
+            game.sprite_loader = SpriteLoader(SpriteCache(cache_dir), base_url=stub.base_url)
+            game.on_setup_submit({'total_players': 4, 'computer_players': 3, 'ladders': 10, 'snakes': 10,
+                                  'player_names': ["벤치"]})
+            deadline = time.time() + 10
+            while game.sprites_pending and time.time() < deadline:
+                root.update()
+                time.sleep(0.01)
+
+        canvas = game.canvas
+        for size in CANVAS_SIZES:
+            def fresh_view():
+                canvas.delete("all")
+                game.layout.resize(size, size)
+                game.board_view = BoardView(canvas, game.layout)
+
+            def draw_board():
+                game.draw_board()
+                canvas.update_idletasks()
+
+            results[f'draw_board[cold, {size}px]'] = measure(draw_board, setup=fresh_view, repeat=20)
+
+            sizes = iter(range(10 ** 9))
+
+            def resize_and_draw():
+                new_size = size + next(sizes) % 2 * 37
+                game.layout.resize(new_size, new_size)
+                draw_board()
+
+            results[f'draw_board[resize, {size}px]'] = measure(resize_and_draw, repeat=20)
+
+            game.layout.resize(size, size)
+            squares = iter(range(10 ** 9))
+
+            def move_and_draw():
+                game.player_positions[0] = next(squares) % 99 + 1
+                game.draw_players()
+                canvas.update_idletasks()
+
+            results[f'draw_players[move, {size}px]'] = measure(move_and_draw, repeat=50)
+
+            def drag_frame():
+                # 창을 끄는 중 한 프레임: <Configure> 8개가 배치 계산과 미리보기 렌더링 한 번으로 합쳐집니다
+                new_size = size + next(sizes) % 2 * 37
+                for step in range(7, -1, -1):
+                    game.on_canvas_resize(SimpleNamespace(width=new_size + step, height=new_size + step))
+                root.after_cancel(game.resize_frame_after_id)
+                game.apply_canvas_resize()
+                canvas.update_idletasks()
+
+            results[f'canvas_resize[drag frame, {size}px]'] = measure(drag_frame, repeat=20)
+            root.after_cancel(game.resize_settle_after_id)
+            game.resize_settle_after_id = None
+
+        # 관전 모드: 500명을 칸별 더미로 그릴 때 한 명이 움직이는 비용 (바뀐 두 칸만 다시 그림)
+        crowd_rng = random.Random(1)
+        crowd = [crowd_rng.randint(1, 99) for _ in range(500)]
+        view = game.board_view
+        view.set_players(crowd, [])
+        view.render()
+
+        def move_one_of_crowd():
+            index = crowd_rng.randrange(len(crowd))
+            crowd[index] = crowd_rng.randint(1, 99)
+            view.set_players(crowd)
+            view.render()
+            canvas.update_idletasks()
+
+        results['draw_players[move, 500 players]'] = measure(move_one_of_crowd, repeat=50)
+        game.sprite_loader.shutdown()
+    finally:
+        root.destroy()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+    'get_coords': bench_get_coords,
+    'board_generation': bench_board_generation,
+    'game_logic': bench_game_logic,
+    'sprite_loading': bench_sprite_loading,
+    'board_image': bench_board_image,
+    'rendering': bench_rendering,
+}
+
+
+# --- 결과 저장/비교 ---
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """기준 결과보다 중앙값이 threshold 비율 이상 느려진 항목 목록을 반환합니다."""
+    regressions = []
+    print(f"\n{'benchmark':<50} {'base ms':>10} {'new ms':>10} {'ratio':>7}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result['median_ms'] / base['median_ms'] if base['median_ms'] else float('inf')
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <-- 느려짐"
+            regressions.append(name)
+        print(f"{name:<50} {base['median_ms']:>10.3f} {result['median_ms']:>10.3f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.2, help="느려짐으로 표시할 비율 (기본 0.2 = 20%%)")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="실행할 벤치마크 그룹")
+    args = parser.parse_args(argv)
+
+    data_dir = isolate_user_data()
+    xvfb = ensure_display() if not args.only or 'rendering' in args.only else None
+    results = {}
+    try:
+        for group, bench in BENCHMARKS.items():
+            if args.only and group not in args.only:
+                continue
+            print(f"[{group}]")
+            for name, result in bench().items():
+                print(f"  {name:<50} {result['median_ms']:>10.4f} ms")
+                results[name] = result
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n느려진 항목 {len(regressions)}개: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
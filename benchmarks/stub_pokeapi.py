@@ -0,0 +1,71 @@
+"""벤치마크/테스트용 로컬 PokeAPI 대역 서버
+
+pokemon-species 개수, pokemon JSON, 스프라이트 PNG를 응답하며
+요청마다 latency초 만큼 지연을 넣어 느린 네트워크를 흉내 냅니다.
+fail_ids에 든 포켓몬의 JSON 요청은 500 오류로 응답합니다.
+"""
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+SPECIES_COUNT = 151
+
+
+def _make_sprite_png(size=96):
+    buffer = io.BytesIO()
+    Image.new('RGBA', (size, size), (255, 99, 71, 255)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class StubPokeAPI:
+    """with 문으로 쓰는 로컬 HTTP 서버 (base_url 속성을 SpriteLoader에 넘기면 됨)"""
+    def __init__(self, latency=0.0, host='127.0.0.1', fail_ids=()):
+        self.latency = latency
+        self.fail_ids = {str(pokemon_id) for pokemon_id in fail_ids}
+        self.request_count = 0
+        sprite_png = _make_sprite_png()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.request_count += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if self.path.startswith('/pokemon-species/'):
+                    body, content_type = json.dumps({'count': SPECIES_COUNT}).encode(), 'application/json'
+                elif self.path.startswith('/pokemon/'):
+                    pokemon_id = self.path.rstrip('/').rsplit('/', 1)[-1]
+                    if pokemon_id in stub.fail_ids:
+                        self.send_error(500)
+                        return
+                    sprite_url = f"{stub.base_url}sprites/{pokemon_id}.png"
+                    body, content_type = json.dumps({'sprites': {'front_default': sprite_url}}).encode(), 'application/json'
+                elif self.path.startswith('/sprites/'):
+                    body, content_type = sprite_png, 'image/png'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, 0), Handler)
+        self.base_url = f"http://{host}:{self.server.server_port}/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,171 @@
+"""PIL 기반 헤드리스 보드 렌더러
+
+디스플레이 없이 칸, 번호, 뱀, 사다리, 말(스프라이트)을 PIL 이미지로 그립니다.
+칸과 번호만 있는 고정 배경은 셀 크기별로 한 번만 그려 캐시하고, 보드마다
+그 위에 선과 말만 덧그립니다. Tk 보드 화면(BoardView)도 같은 배경을 이미지 하나로 씁니다.
+
+사용법:
+  python board_image.py --count 1000 --cell-size 12 --out thumbnails
+"""
+import argparse
+import functools
+import math
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFont
+
+from board_layout import (CELL_COLORS, CLUSTER_MIN_PLAYERS, CLUSTER_STACK, GRID_OUTLINE, LADDER_COLOR, SNAKE_COLOR,
+                          BoardLayout, arrow_size, cluster_offset, line_width, number_font_size, player_color,
+                          player_radius, player_spread, sprite_size)
+from game_engine import BOARD_SIZE, GRID_DIM, generate_board
+
+STATIC_CACHE_SIZE = 32  # 캐시할 배경(셀 크기) 개수
+SPRITE_CACHE_SIZE = 64  # (스프라이트, 크기)별 리사이즈 결과 캐시 항목 수
+DEFAULT_CELL_SIZE = 60
+DEFAULT_THUMBNAIL_CELL_SIZE = 12
+
+_sprite_cache = OrderedDict()
+
+
+def board_layout(cell_size, board_size=BOARD_SIZE, grid_dim=GRID_DIM):
+    """셀 크기가 cell_size가 되도록 여백 없이 맞춘 배치표"""
+    rows = -(-board_size // grid_dim)
+    return BoardLayout(grid_dim * cell_size, rows * cell_size, board_size, grid_dim, min_cell_size=1)
+
+
+@functools.lru_cache(maxsize=16)
+def _font(size):
+    return ImageFont.load_default(size)
+
+
+@functools.lru_cache(maxsize=STATIC_CACHE_SIZE)
+def static_layer(cell_size, board_size=BOARD_SIZE, grid_dim=GRID_DIM):
+    """칸과 번호만 그린 고정 배경 (셀 크기별 캐시, 공유 객체이므로 수정하지 말고 copy()해서 쓸 것)"""
+    layout = board_layout(cell_size, board_size, grid_dim)
+    image = Image.new('RGB', (layout.width, layout.height), 'white')
+    draw = ImageDraw.Draw(image)
+    font = _font(number_font_size(cell_size))
+    half = cell_size / 2
+    for square in range(1, board_size + 1):
+        x, y = layout.centers[square]
+        col, row_from_top = int(x // cell_size), int(y // cell_size)
+        draw.rectangle((x - half, y - half, x + half, y + half),
+                       fill=CELL_COLORS[(row_from_top + col) % 2], outline=GRID_OUTLINE)
+        draw.text((x, y), str(square), fill='black', font=font, anchor='mm')
+    return image
+
+
+def _draw_arrow(draw, start, end, color, width, head):
+    """start에서 end로 가는 선과 끝의 삼각형 화살촉"""
+    (x1, y1), (x2, y2) = start, end
+    length = math.hypot(x2 - x1, y2 - y1)
+    if length == 0:
+        return
+    ux, uy = (x2 - x1) / length, (y2 - y1) / length
+    base_x, base_y = x2 - ux * head, y2 - uy * head
+    draw.line((x1, y1, base_x, base_y), fill=color, width=width)
+    wing = head / 2
+    draw.polygon(((x2, y2), (base_x - uy * wing, base_y + ux * wing), (base_x + uy * wing, base_y - ux * wing)),
+                 fill=color)
+
+
+def _resized_sprite(sprite, size):
+    """스프라이트를 size x size RGBA로 리사이즈합니다. (id 기준 LRU 캐시)"""
+    key = (id(sprite), size)
+    entry = _sprite_cache.get(key)
+    if entry is not None:
+        _sprite_cache.move_to_end(key)
+        return entry[1]
+    resized = sprite.convert('RGBA').resize((size, size), Image.Resampling.LANCZOS)
+    _sprite_cache[key] = (sprite, resized)  # 원본을 함께 보관해 id 재사용을 막습니다
+    if len(_sprite_cache) > SPRITE_CACHE_SIZE:
+        _sprite_cache.popitem(last=False)
+    return resized
+
+
+def render_board(snakes, ladders, cell_size=DEFAULT_CELL_SIZE, positions=(), sprites=None,
+                 board_size=BOARD_SIZE, grid_dim=GRID_DIM):
+    """보드 한 장을 RGB 이미지로 그립니다.
+
+    positions는 플레이어별 칸 번호, sprites는 같은 순서의 PIL 이미지 목록(없는 자리는 None)입니다.
+    플레이어가 CLUSTER_MIN_PLAYERS명 이상이면 BoardView처럼 칸별 더미와 인원수로 그립니다.
+    """
+    layout = board_layout(cell_size, board_size, grid_dim)
+    image = static_layer(cell_size, board_size, grid_dim).copy()
+    draw = ImageDraw.Draw(image)
+
+    width, head = line_width(cell_size), arrow_size(cell_size)
+    for jumps, color in ((ladders, LADDER_COLOR), (snakes, SNAKE_COLOR)):  # 사다리 < 뱀 < 말 순서로 쌓음
+        for start, end in jumps.items():
+            _draw_arrow(draw, layout.center(start), layout.center(end), color, width, head)
+
+    def draw_piece(index, x, y):
+        sprite = sprites[index] if sprites and index < len(sprites) else None
+        if sprite is not None:
+            piece = _resized_sprite(sprite, piece_size)
+            image.paste(piece, (int(x - piece_size / 2), int(y - piece_size / 2)), piece)
+        else:
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=player_color(index), outline='black')
+
+    radius, spread = player_radius(cell_size), player_spread(cell_size)
+    piece_size = sprite_size(cell_size)
+    if len(positions) < CLUSTER_MIN_PLAYERS:
+        for index, square in enumerate(positions):
+            x, y = layout.center(square)
+            draw_piece(index, x + (index - (len(positions) - 1) / 2) * spread, y)
+        return image
+
+    occupants = {}
+    for index, square in enumerate(positions):
+        occupants.setdefault(min(max(square, 1), board_size), []).append(index)
+    font = _font(number_font_size(cell_size))
+    for square, members in occupants.items():
+        x, y = layout.center(square)
+        top = members[-CLUSTER_STACK:]
+        for depth, index in enumerate(top):
+            dx, dy = cluster_offset(cell_size, depth, len(top))
+            draw_piece(index, x + dx, y + dy)
+        if len(members) > 1:
+            draw.text((x + cell_size / 2 - 2, y - cell_size / 2 + 1), str(len(members)), fill='black', font=font,
+                      anchor='ra')
+    return image
+
+
+def render_thumbnails(boards, directory, cell_size=DEFAULT_THUMBNAIL_CELL_SIZE, image_format='PNG'):
+    """(snakes, ladders) 목록을 directory에 차례로 저장하고 파일 경로 목록을 반환합니다."""
+    os.makedirs(directory, exist_ok=True)
+    extension = image_format.lower()
+    paths = []
+    for index, (snakes, ladders) in enumerate(boards):
+        path = os.path.join(directory, f"board-{index:06d}.{extension}")
+        render_board(snakes, ladders, cell_size).save(path, image_format)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="보드 썸네일 일괄 생성")
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--cell-size', type=int, default=DEFAULT_THUMBNAIL_CELL_SIZE)
+    parser.add_argument('--snakes', type=int, default=10)
+    parser.add_argument('--ladders', type=int, default=10)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--format', default='PNG')
+    parser.add_argument('--out', default='thumbnails')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    boards = [generate_board(args.snakes, args.ladders, rng) for _ in range(args.count)]
+    start = time.perf_counter()
+    render_thumbnails(boards, args.out, args.cell_size, args.format)
+    elapsed = time.perf_counter() - start
+    print(f"{args.count}장 저장: {args.out} ({elapsed:.2f}s, 분당 {args.count / elapsed * 60:,.0f}장)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""칸 번호 -> 캔버스 좌표 배치표
+
+캔버스 크기가 실제로 바뀔 때만 셀 크기, 오프셋, 칸 중심 좌표표를 다시 계산합니다.
+그리기, 애니메이션, 클릭 위치 판정이 모두 같은 배치표를 공유하므로
+매 프레임 winfo_width/winfo_height를 물어볼 필요가 없습니다.
+"""
+import colorsys
+
+from game_engine import BOARD_SIZE, GRID_DIM
+
+MIN_CELL_SIZE = 20  # 최소 셀 크기 (px)
+
+# --- 보드 스타일 (Tk 캔버스와 PIL 렌더러 공용) ---
+CELL_COLORS = ("#F0E68C", "#FFFACD")  # 체크무늬 칸 색
+GRID_OUTLINE = "black"
+LADDER_COLOR = "#0066CC"
+SNAKE_COLOR = "#CC0000"
+PLAYER_COLORS = ['#FF6347', '#4682B4', '#32CD32', '#FFD700']
+GOLDEN_RATIO = 0.6180339887  # 다섯 번째 플레이어부터 색상환을 이 비율씩 돌려 이웃 색이 겹치지 않게 함
+
+# --- 많은 플레이어 (관전/교실 모드) ---
+CLUSTER_MIN_PLAYERS = 7  # 이 이상이면 말을 가로로 벌리지 않고 칸별로 모아 쌓은 더미와 인원수로 그림
+CLUSTER_STACK = 3  # 더미 하나에 실제로 그리는 말 수 (나머지는 인원수로만 표시)
+
+
+def line_width(cell_size):
+    """뱀/사다리 선 두께"""
+    return max(2, int(cell_size / 10))
+
+
+def arrow_size(cell_size):
+    """뱀/사다리 화살촉 길이"""
+    return max(8, int(cell_size / 3))
+
+
+def number_font_size(cell_size):
+    """칸 번호 글꼴 크기"""
+    return max(8, int(cell_size / 6))
+
+
+def player_radius(cell_size):
+    """기본 말(원)의 반지름"""
+    return max(5, int(cell_size / 10))
+
+
+def player_spread(cell_size):
+    """같은 칸에 있는 말 사이의 가로 간격"""
+    return max(6, int(cell_size / 8))
+
+
+def player_color(index):
+    """index번 플레이어의 말 색 (처음 네 명은 PLAYER_COLORS, 그 뒤는 황금비 색상환)"""
+    if index < len(PLAYER_COLORS):
+        return PLAYER_COLORS[index]
+    hue = (index * GOLDEN_RATIO) % 1.0
+    lightness = (0.45, 0.6, 0.35)[index % 3]
+    red, green, blue = colorsys.hls_to_rgb(hue, lightness, 0.75)
+    return f"#{int(red * 255):02X}{int(green * 255):02X}{int(blue * 255):02X}"
+
+
+def cluster_offset(cell_size, depth, height=CLUSTER_STACK):
+    """height개를 쌓은 더미에서 depth번째(0이 맨 아래) 말의 칸 중심 대비 위치 (오른쪽 위로 비스듬히)"""
+    step = max(2, int(cell_size / 12))
+    shift = (depth - (height - 1) / 2) * step
+    return shift, -shift
+
+
+def sprite_size(cell_size):
+    """포켓몬 스프라이트 한 변의 크기 (셀 크기의 60%)"""
+    return max(20, int(cell_size * 0.6))
+
+
+class BoardLayout:
+    """캔버스 크기별 보드 배치 (셀 크기, 오프셋, 칸 중심 좌표)"""
+    def __init__(self, width=0, height=0, board_size=BOARD_SIZE, grid_dim=GRID_DIM, min_cell_size=MIN_CELL_SIZE):
+        self.board_size = board_size
+        self.grid_dim = grid_dim
+        self.min_cell_size = min_cell_size
+        self.rows = -(-board_size // grid_dim)
+
+        self.width = None
+        self.height = None
+        self.cell_size = min_cell_size
+        self.offset = (0, 0)
+        self.centers = []  # centers[칸 번호] = (x, y), 0번은 사용하지 않음
+        self.version = 0  # 다시 계산될 때마다 증가
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        """캔버스 크기가 바뀌었으면 배치표를 다시 만들고 True를 반환합니다."""
+        if width == self.width and height == self.height:
+            return False
+        self.width = width
+        self.height = height
+
+        # 가로와 세로 중 작은 값을 기준으로 셀 크기 결정, 보드는 캔버스 중앙에 배치
+        cell_size = max(min(width // self.grid_dim, height // self.rows), self.min_cell_size)
+        offset = (max(0, (width - self.grid_dim * cell_size) // 2),
+                  max(0, (height - self.rows * cell_size) // 2))
+        if cell_size == self.cell_size and offset == self.offset and self.centers:
+            return False
+        self.cell_size = cell_size
+        self.offset = offset
+        self.centers = self._build_centers()
+        self.version += 1
+        return True
+
+    def _build_centers(self):
+        """지그재그 배치(1번 칸이 왼쪽 아래)로 모든 칸의 중심 좌표를 계산합니다."""
+        cell_size = self.cell_size
+        half = cell_size / 2
+        offset_x, offset_y = self.offset
+        grid_dim, rows = self.grid_dim, self.rows
+        centers = [None] * (self.board_size + 1)
+        for square in range(1, self.board_size + 1):
+            row, col = divmod(square - 1, grid_dim)
+            if row % 2 != 0:  # 홀수 줄은 오른쪽에서 왼쪽으로
+                col = grid_dim - 1 - col
+            centers[square] = (offset_x + col * cell_size + half, offset_y + (rows - row - 1) * cell_size + half)
+        return centers
+
+    def center(self, square):
+        """칸 번호의 중심 좌표 (BOARD_SIZE를 넘으면 마지막 칸)"""
+        return self.centers[min(max(square, 1), self.board_size)]
+
+    def square_at(self, x, y):
+        """캔버스 좌표 (x, y)에 있는 칸 번호 (보드 밖이면 None)"""
+        col = int((x - self.offset[0]) // self.cell_size)
+        row_from_top = int((y - self.offset[1]) // self.cell_size)
+        if not (0 <= col < self.grid_dim and 0 <= row_from_top < self.rows):
+            return None
+        row = self.rows - 1 - row_from_top
+        if row % 2 != 0:
+            col = self.grid_dim - 1 - col
+        square = row * self.grid_dim + col + 1
+        return square if square <= self.board_size else None
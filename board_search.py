@@ -0,0 +1,87 @@
+"""목표 기대 게임 길이에 맞는 보드 탐색
+
+후보 보드를 많이 만들어 마르코프 해석기로 기대 라운드 수와 공정성(자리별 승률 차이)을
+정확히 계산하고, 목표에 가장 잘 맞는 보드를 고릅니다.
+후보는 고정 크기 묶음(chunk)으로 나누어 프로세스 풀에서 평가하며, 묶음마다
+(seed, 묶음 번호)로 정해진 난수를 쓰므로 작업자 수와 관계없이 결과가 같습니다.
+"""
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from game_engine import STANDARD_RULES, generate_board
+from markov_solver import expected_rounds, seat_win_probabilities, solve_board
+from parallel_simulation import pool_context
+
+# 탐색 결과
+#   score: 작을수록 좋음 (목표 범위 안이면 unfairness, 밖이면 1 + 목표와의 거리 / tolerance,
+#          tolerance가 0이면 1 + 목표와의 거리)
+#   expected_rounds: 기대 라운드 수 (각 플레이어가 주사위를 굴린 횟수)
+#   unfairness: 가장 유리한 자리와 불리한 자리의 승률 차이
+BoardCandidate = namedtuple('BoardCandidate', ['score', 'expected_rounds', 'unfairness', 'snakes', 'ladders',
+                                               'seed', 'candidate_index'])
+
+DEFAULT_CANDIDATES = 4096
+DEFAULT_TOLERANCE = 2.0
+CHUNK_SIZE = 128  # 작업자 하나가 한 번에 평가하는 후보 수
+
+
+def score_board(snakes, ladders, target_rounds, num_players, tolerance=DEFAULT_TOLERANCE, rules=STANDARD_RULES):
+    """보드 하나를 평가하여 (score, expected_rounds, unfairness)를 반환합니다.
+
+    목표 ± tolerance 안의 보드는 공정할수록 좋고, 밖의 보드는 목표에 가까울수록 좋습니다.
+    tolerance <= 0은 정확히 목표 길이인 보드만 범위 안으로 봅니다.
+    """
+    solution = solve_board(snakes, ladders, rules=rules)
+    rounds = expected_rounds(solution, num_players)
+    wins = seat_win_probabilities(solution, num_players)
+    unfairness = float(wins.max() - wins.min())
+    distance = abs(rounds - target_rounds)
+    if distance <= max(tolerance, 0.0):
+        score = unfairness
+    else:
+        score = 1.0 + (distance / tolerance if tolerance > 0 else distance)
+    return score, rounds, unfairness
+
+
+def chunk_rng(seed, chunk_index):
+    """묶음별 결정적 난수 생성기"""
+    return random.Random(f"{seed}:{chunk_index}")
+
+
+def _search_chunk(seed, chunk_index, chunk_size, num_snakes, num_ladders, target_rounds, num_players, tolerance,
+                  rules):
+    """작업자: 한 묶음의 후보를 만들어 평가하고 가장 좋은 후보를 반환합니다."""
+    rng = chunk_rng(seed, chunk_index)
+    best = None
+    for offset in range(chunk_size):
+        snakes, ladders = generate_board(num_snakes, num_ladders, rng)
+        score, rounds, unfairness = score_board(snakes, ladders, target_rounds, num_players, tolerance, rules)
+        if best is None or score < best.score:
+            best = BoardCandidate(score, rounds, unfairness, snakes, ladders, seed, chunk_index * chunk_size + offset)
+    return best
+
+
+def search_boards(target_rounds, num_snakes, num_ladders, num_players=2, tolerance=DEFAULT_TOLERANCE,
+                  candidates=DEFAULT_CANDIDATES, seed=None, workers=None, chunk_size=CHUNK_SIZE, rules=STANDARD_RULES):
+    """candidates개의 후보 중 목표 기대 라운드 수에 가장 잘 맞는 BoardCandidate를 반환합니다.
+
+    seed가 같으면 작업자 수와 관계없이 같은 보드를 돌려줍니다. workers=1이면 현재 프로세스에서 실행합니다.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    num_chunks = -(-candidates // chunk_size)
+    jobs = [(seed, index, min(chunk_size, candidates - index * chunk_size),
+             num_snakes, num_ladders, target_rounds, num_players, tolerance, rules) for index in range(num_chunks)]
+
+    if workers <= 1 or num_chunks == 1:
+        results = [_search_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, num_chunks), mp_context=pool_context()) as executor:
+            results = list(executor.map(_search_chunk, *zip(*jobs)))
+
+    # 점수가 같으면 앞 번호 후보를 고릅니다 (결정적)
+    return min(results, key=lambda candidate: (candidate.score, candidate.candidate_index))
@@ -0,0 +1,144 @@
+"""보드별 누적 통계 (스트리밍, 메모리 일정)
+
+실제로 둔 게임과 시뮬레이션한 게임을 같은 누적기에 모읍니다.
+  - 게임 길이(라운드) 분포: 고정 크기 히스토그램 + 웰퍼드(Welford) 평균/분산
+  - 뱀/사다리별 밟은 횟수, 칸별 머문 횟수
+  - 자리(턴 순서)별 승리 횟수
+게임을 따로 저장하지 않으므로 수백만 판을 모아도 메모리가 늘지 않고,
+턴마다 record_move()를 불러도 정수 몇 개를 더하는 비용뿐입니다.
+"""
+import math
+
+from game_engine import BOARD_SIZE, DICE_SIDES, MAX_DICE
+
+MAX_TRACKED_ROUNDS = 512  # 이보다 긴 게임은 마지막 칸(넘침)에 모읍니다
+
+
+class BoardStats:
+    """한 보드의 누적 통계"""
+    def __init__(self, snakes, ladders, num_players, board_size=BOARD_SIZE):
+        self.snakes = dict(snakes)
+        self.ladders = dict(ladders)
+        self.num_players = num_players
+        self.board_size = board_size
+
+        num_squares = board_size + MAX_DICE * DICE_SIDES + 1  # 어떤 규칙 변형의 굴림이든 담을 수 있게
+        self.landed_counts = [0] * num_squares  # 주사위로 도착한 칸 (뱀/사다리 적용 전)
+        self.final_counts = [0] * num_squares  # 이동을 마치고 머문 칸
+        self.moves = 0
+
+        self.games = 0
+        self.seat_wins = [0] * num_players
+        self.length_histogram = [0] * (MAX_TRACKED_ROUNDS + 1)  # [라운드 수], 마지막은 넘침
+        self.mean_rounds = 0.0
+        self._m2 = 0.0  # 웰퍼드 제곱 편차 합
+
+    # --- 기록 ---
+    def record_move(self, move):
+        """MoveResult 하나를 더합니다.
+
+        연속 굴림 제한으로 처음 칸에 보내진 이동('reset')은 도착한 칸이 아니므로 세지 않습니다.
+        (simulation.simulate_games의 집계와 같음)
+        """
+        if move.jump == 'reset':
+            return
+        self.landed_counts[move.landed] += 1
+        self.final_counts[move.final] += 1
+        self.moves += 1
+
+    def record_game(self, winner, rounds):
+        """끝난 게임 하나(승자 자리, 라운드 수)를 더합니다."""
+        self.seat_wins[winner] += 1
+        self._add_lengths(rounds, 1)
+
+    def _add_lengths(self, rounds, count):
+        """같은 길이의 게임 count개를 분포와 평균/분산에 더합니다. (병렬 웰퍼드 결합)"""
+        self.length_histogram[min(rounds, MAX_TRACKED_ROUNDS)] += count
+        total = self.games + count
+        delta = rounds - self.mean_rounds
+        self.mean_rounds += delta * count / total
+        self._m2 += delta * delta * self.games * count / total
+        self.games = total
+
+    def record_simulation(self, result):
+        """simulation.simulate_games 결과를 통째로 더합니다. (track_squares=True면 칸별 횟수 포함)"""
+        import numpy as np
+
+        finished = result.winners >= 0
+        for seat, wins in enumerate(np.bincount(result.winners[finished], minlength=self.num_players)):
+            self.seat_wins[seat] += int(wins)
+        # 분포 칸만 _add_lengths에서 자르고, 평균/분산에는 실제 길이를 넣습니다
+        for length, count in zip(*np.unique(result.rounds[finished], return_counts=True)):
+            self._add_lengths(int(length), int(count))
+        if result.landed_counts is not None:
+            for square, count in enumerate(result.landed_counts[:len(self.landed_counts)]):
+                self.landed_counts[square] += int(count)
+            for square, count in enumerate(result.final_counts[:len(self.final_counts)]):
+                self.final_counts[square] += int(count)
+            self.moves += int(result.landed_counts.sum())
+
+    def record_replay(self, replay):
+        """replay_log.Replay 하나(끝난 게임이면 결과까지)를 더합니다."""
+        for move in replay.moves[1:]:
+            self.record_move(move)
+        if replay.finished:
+            self.record_game(replay.winner, replay.rounds)
+
+    def merge(self, other):
+        """같은 보드의 다른 누적기를 합칩니다. (병렬 집계용)"""
+        for name in ('landed_counts', 'final_counts', 'seat_wins'):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            for index, count in enumerate(theirs):
+                mine[index] += count
+        self.moves += other.moves
+        for index, count in enumerate(other.length_histogram):
+            self.length_histogram[index] += count
+        if other.games:
+            total = self.games + other.games
+            delta = other.mean_rounds - self.mean_rounds
+            self._m2 += other._m2 + delta * delta * self.games * other.games / total
+            self.mean_rounds += delta * other.games / total
+            self.games = total
+
+    # --- 조회 ---
+    @property
+    def std_rounds(self):
+        return math.sqrt(self._m2 / self.games) if self.games else float('nan')
+
+    def length_percentile(self, q):
+        """게임 길이 분포의 q 분위수 (0~1, 라운드 단위)"""
+        if not self.games:
+            return float('nan')
+        target = q * self.games
+        cumulative = 0
+        for rounds, count in enumerate(self.length_histogram):
+            cumulative += count
+            if cumulative >= target and count:
+                return rounds
+        return MAX_TRACKED_ROUNDS
+
+    def seat_win_rates(self):
+        return [wins / self.games if self.games else 0.0 for wins in self.seat_wins]
+
+    def jump_hits(self, jumps):
+        """뱀 또는 사다리 시작 칸별 밟은 횟수"""
+        return {start: self.landed_counts[start] for start in sorted(jumps)}
+
+    def landing_frequency(self):
+        """칸별(1~board_size) 머문 비율, 인덱스 0은 쓰지 않음 (board_size 이상 도착은 마지막 칸에 합침)"""
+        counts = self.final_counts[:self.board_size + 1]
+        counts[self.board_size] += sum(self.final_counts[self.board_size + 1:])
+        return [count / self.moves if self.moves else 0.0 for count in counts]
+
+    def summary(self):
+        return {
+            'games': self.games,
+            'moves': self.moves,
+            'mean_rounds': self.mean_rounds if self.games else float('nan'),
+            'std_rounds': self.std_rounds,
+            'median_rounds': self.length_percentile(0.5),
+            'p90_rounds': self.length_percentile(0.9),
+            'seat_win_rates': self.seat_win_rates(),
+            'snake_hits': self.jump_hits(self.snakes),
+            'ladder_hits': self.jump_hits(self.ladders),
+        }
@@ -0,0 +1,412 @@
+"""보드 저장소 (SQLite)
+
+생성하거나 탐색한 보드를 정규화된 보드 해시(markov_solver.board_hash)를 키로 저장합니다.
+뱀/사다리 순서와 관계없이 같은 보드와 규칙은 한 번만 저장되며, 이미 있는 보드는
+해석하기 전에 걸러 냅니다. 마르코프 해석기로 계산한 지표(기대 턴/라운드 수, 뱀/사다리 수,
+자리별 승률 차이)는 색인된 열에 두므로 "사다리 10개, 기대 길이 20~25라운드" 같은 질의가
+보드 백만 개에서도 (사다리 수, 기대 라운드, 공정성) 복합 색인 하나로 몇 밀리초 안에 끝납니다.
+(공정성 순 정렬도 색인 안에서 끝나고, 테이블은 돌려줄 limit개 행만 읽습니다)
+
+기대 라운드 수와 공정성은 플레이어 수에 따라 달라지므로 저장소마다 기준 플레이어 수
+(metric_players)를 하나 정해 meta 테이블에 기록합니다.
+보드는 한 줄에 하나씩 JSON(JSON Lines)으로 한꺼번에 내보내고 가져올 수 있습니다.
+
+사용법:
+  python board_store.py generate --count 100000 --snakes 10 --ladders 10 --workers 8
+  python board_store.py query --ladders 10 --min-length 20 --max-length 25
+  python board_store.py export boards.jsonl --ladders 10
+  python board_store.py import boards.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import struct
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from game_engine import BOARD_SIZE, STANDARD_RULES, RuleSet, generate_board
+from markov_solver import board_hash, expected_rounds, seat_win_probabilities, solve_finish
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "ladderandchute", "boards.sqlite3")
+DEFAULT_METRIC_PLAYERS = 2
+INSERT_BATCH = 2048  # 한 트랜잭션에 넣는 보드 수 (해시 중복 확인도 이 단위)
+LOOKUP_BATCH = 500  # 중복 확인 질의 하나의 인자 수 (오래된 SQLite의 인자 상한 999 아래)
+SOLVE_CHUNK = 128  # 작업자 하나가 한 번에 해석하는 보드 수
+FETCH_BATCH = 4096  # 스트리밍으로 한 번에 읽는 행 수
+
+_PAIR = struct.Struct('<HH')
+
+# 저장된 보드 (rules는 game_engine.RuleSet, 지표는 저장소의 metric_players 기준)
+StoredBoard = namedtuple('StoredBoard', ['board_hash', 'board_size', 'rules', 'snakes', 'ladders',
+                                         'expected_turns', 'expected_rounds', 'unfairness'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS boards (
+    hash BLOB PRIMARY KEY,
+    board_size INTEGER NOT NULL,
+    rules INTEGER NOT NULL,
+    num_snakes INTEGER NOT NULL,
+    num_ladders INTEGER NOT NULL,
+    expected_turns REAL NOT NULL,
+    expected_rounds REAL NOT NULL,
+    unfairness REAL NOT NULL,
+    snakes BLOB NOT NULL,
+    ladders BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS boards_ladders_length ON boards (num_ladders, expected_rounds, unfairness);
+CREATE INDEX IF NOT EXISTS boards_counts_length ON boards (num_snakes, num_ladders, expected_rounds, unfairness);
+CREATE INDEX IF NOT EXISTS boards_length ON boards (expected_rounds);
+CREATE INDEX IF NOT EXISTS boards_unfairness ON boards (unfairness);
+"""
+_COLUMNS = "hash, board_size, rules, snakes, ladders, expected_turns, expected_rounds, unfairness"
+
+# 질의 조건 이름 -> (열, 비교 연산자)
+_FILTERS = {
+    'num_snakes': ('num_snakes', '='),
+    'num_ladders': ('num_ladders', '='),
+    'board_size': ('board_size', '='),
+    'rules': ('rules', '='),
+    'min_length': ('expected_rounds', '>='),
+    'max_length': ('expected_rounds', '<='),
+    'min_turns': ('expected_turns', '>='),
+    'max_turns': ('expected_turns', '<='),
+    'max_unfairness': ('unfairness', '<='),
+}
+_ORDERS = {'length': 'expected_rounds', 'turns': 'expected_turns', 'unfairness': 'unfairness'}
+
+
+class BoardStoreError(ValueError):
+    """저장소 파일이나 가져온 보드 줄이 잘못되었을 때 발생합니다."""
+
+
+def store_path():
+    """기본 저장소 파일 경로 (LADDER_BOARD_STORE 환경 변수로 변경 가능)"""
+    return os.environ.get("LADDER_BOARD_STORE", DEFAULT_STORE_PATH)
+
+
+def pack_jumps(jumps):
+    """뱀 또는 사다리 dict를 (시작 칸, 끝 칸) 쌍 bytes로 만듭니다. (시작 칸 순)"""
+    return b''.join(_PAIR.pack(start, end) for start, end in sorted(jumps.items()))
+
+
+def unpack_jumps(data):
+    """pack_jumps의 역변환"""
+    return dict(_PAIR.iter_unpack(data))
+
+
+def board_row(snakes, ladders, metric_players=DEFAULT_METRIC_PLAYERS, board_size=BOARD_SIZE, rules=STANDARD_RULES,
+              key=None):
+    """보드 하나를 해석해 boards 테이블의 한 행으로 만듭니다. (작업자 프로세스에서도 호출)
+
+    지표에는 종료 턴 분포만 필요하므로 방문 확률까지 푸는 solve_board 대신 solve_finish를 씁니다.
+    """
+    solution = solve_finish(snakes, ladders, board_size, rules)
+    wins = seat_win_probabilities(solution, metric_players)
+    key = key or solution.board_hash
+    return (bytes.fromhex(key), board_size, rules.flags, len(snakes), len(ladders), solution.expected_turns,
+            expected_rounds(solution, metric_players), float(wins.max() - wins.min()),
+            pack_jumps(snakes), pack_jumps(ladders))
+
+
+def _solve_chunk(entries, metric_players):
+    """작업자: (snakes, ladders, board_size, rules, 해시) 목록을 해석한 행 목록"""
+    return [board_row(snakes, ladders, metric_players, board_size, rules, key)
+            for snakes, ladders, board_size, rules, key in entries]
+
+
+def _where(filters):
+    """질의 조건 dict를 (WHERE 절, 인자 목록)으로 바꿉니다."""
+    clauses, params = [], []
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name not in _FILTERS:
+            raise TypeError(f"알 수 없는 질의 조건입니다: {name}")
+        column, operator = _FILTERS[name]
+        clauses.append(f"{column} {operator} ?")
+        params.append(value.flags if isinstance(value, RuleSet) else value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _stored_board(row):
+    key, board_size, flags, snakes, ladders, turns, rounds, unfairness = row
+    return StoredBoard(key.hex(), board_size, RuleSet.from_flags(flags), unpack_jumps(snakes), unpack_jumps(ladders),
+                       turns, rounds, unfairness)
+
+
+class BoardStore:
+    """정규화된 보드 해시를 키로 하는 SQLite 보드 저장소"""
+    def __init__(self, path=None, metric_players=DEFAULT_METRIC_PLAYERS):
+        self.path = path or store_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        try:
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(_SCHEMA)
+        except sqlite3.DatabaseError as e:
+            raise BoardStoreError(f"보드 저장소를 열 수 없습니다: {e}") from None
+        # 기준 플레이어 수는 처음 만들 때 정하고, 이후에는 파일에 기록된 값을 씁니다
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO meta VALUES ('metric_players', ?)", (str(metric_players),))
+        self.metric_players = int(self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'metric_players'").fetchone()[0])
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM boards").fetchone()[0]
+
+    def __contains__(self, key):
+        row = self.connection.execute("SELECT 1 FROM boards WHERE hash = ?", (bytes.fromhex(key),)).fetchone()
+        return row is not None
+
+    # --- 넣기 ---
+    def add_board(self, snakes, ladders, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+        """보드 하나를 저장하고 (해시, 새로 넣었는지)를 반환합니다."""
+        key = board_hash(snakes, ladders, board_size, rules)
+        if key in self:
+            return key, False
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO boards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    board_row(snakes, ladders, self.metric_players, board_size, rules, key))
+        return key, True
+
+    def add_boards(self, boards, board_size=BOARD_SIZE, rules=STANDARD_RULES, workers=1, on_progress=None):
+        """(snakes, ladders) 스트림을 INSERT_BATCH개씩 저장하고 새로 넣은 보드 수를 반환합니다."""
+        return self._ingest(((snakes, ladders, board_size, rules, None) for snakes, ladders in boards),
+                            workers, on_progress)
+
+    def _ingest(self, entries, workers=1, on_progress=None):
+        """(snakes, ladders, board_size, rules, 계산된 지표 또는 None) 스트림을 중복 없이 저장합니다.
+
+        묶음마다 해시를 먼저 구해 묶음 안과 저장소에 이미 있는 보드를 버린 뒤 나머지만 해석합니다.
+        """
+        executor = None
+        if workers > 1:
+            from parallel_simulation import pool_context
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=pool_context())
+        added = seen = 0
+        try:
+            entries = iter(entries)
+            while batch := list(islice(entries, INSERT_BATCH)):
+                seen += len(batch)
+                fresh = {}
+                for snakes, ladders, board_size, rules, metrics in batch:
+                    key = board_hash(snakes, ladders, board_size, rules)
+                    fresh.setdefault(key, (snakes, ladders, board_size, rules, metrics))
+                keys = [bytes.fromhex(key) for key in fresh]
+                for start in range(0, len(keys), LOOKUP_BATCH):
+                    lookup = keys[start:start + LOOKUP_BATCH]
+                    existing = self.connection.execute(
+                        f"SELECT hash FROM boards WHERE hash IN ({', '.join('?' * len(lookup))})", lookup).fetchall()
+                    for (key,) in existing:
+                        del fresh[key.hex()]
+
+                rows, unsolved = [], []
+                for key, (snakes, ladders, board_size, rules, metrics) in fresh.items():
+                    if metrics is None:
+                        unsolved.append((snakes, ladders, board_size, rules, key))
+                    else:
+                        rows.append((bytes.fromhex(key), board_size, rules.flags, len(snakes), len(ladders), *metrics,
+                                     pack_jumps(snakes), pack_jumps(ladders)))
+                chunks = [unsolved[start:start + SOLVE_CHUNK] for start in range(0, len(unsolved), SOLVE_CHUNK)]
+                if executor is None:
+                    solved = (_solve_chunk(chunk, self.metric_players) for chunk in chunks)
+                else:
+                    solved = executor.map(_solve_chunk, chunks, [self.metric_players] * len(chunks))
+                for chunk_rows in solved:
+                    rows.extend(chunk_rows)
+
+                with self.connection:
+                    self.connection.executemany("INSERT OR IGNORE INTO boards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                                rows)
+                added += len(rows)
+                if on_progress is not None:
+                    on_progress(seen, added)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        if added:
+            self.connection.execute("PRAGMA optimize")  # 통계가 낡은 색인만 다시 분석합니다
+        return added
+
+    def analyze(self):
+        """색인 통계를 전부 다시 모아 질의 계획이 복합 색인을 고르게 합니다. (대량으로 넣은 뒤 한 번)"""
+        self.connection.execute("ANALYZE")
+
+    # --- 질의 ---
+    def get(self, key):
+        """해시로 보드 하나를 찾습니다. (없으면 None)"""
+        row = self.connection.execute(f"SELECT {_COLUMNS} FROM boards WHERE hash = ?", (bytes.fromhex(key),)).fetchone()
+        return _stored_board(row) if row else None
+
+    def count(self, **filters):
+        """조건에 맞는 보드 수 (조건 이름은 _FILTERS 참고)"""
+        where, params = _where(filters)
+        return self.connection.execute(f"SELECT count(*) FROM boards{where}", params).fetchone()[0]
+
+    def query(self, order_by='unfairness', limit=100, offset=0, **filters):
+        """조건에 맞는 보드를 order_by('length', 'turns', 'unfairness') 순으로 limit개 반환합니다.
+
+        예: query(num_ladders=10, min_length=20, max_length=25)
+        색인 안에서 순서를 정해 rowid만 고른 뒤 그 행들만 읽습니다. (None이면 색인 순서)
+        """
+        where, params = _where(filters)
+        order = f" ORDER BY {_ORDERS[order_by]}" if order_by else ""
+        rows = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM boards WHERE rowid IN "
+            f"(SELECT rowid FROM boards{where}{order} LIMIT ? OFFSET ?){order}", params + [limit, offset]).fetchall()
+        return [_stored_board(row) for row in rows]
+
+    def choose(self, rng=random, **filters):
+        """조건에 맞는 보드 중 하나를 무작위로 고릅니다. (없으면 None)"""
+        matches = self.count(**filters)
+        if not matches:
+            return None
+        boards = self.query(order_by=None, limit=1, offset=rng.randrange(matches), **filters)
+        return boards[0] if boards else None
+
+    def iter_boards(self, **filters):
+        """조건에 맞는 보드를 FETCH_BATCH개씩 읽어 하나씩 내놓습니다. (전체를 메모리에 올리지 않음)"""
+        where, params = _where(filters)
+        cursor = self.connection.execute(f"SELECT {_COLUMNS} FROM boards{where}", params)
+        while rows := cursor.fetchmany(FETCH_BATCH):
+            for row in rows:
+                yield _stored_board(row)
+
+    # --- 내보내기/가져오기 ---
+    def export_jsonl(self, file, **filters):
+        """조건에 맞는 보드를 한 줄에 하나씩 JSON으로 씁니다. 쓴 보드 수를 반환합니다."""
+        written = 0
+        for board in self.iter_boards(**filters):
+            file.write(json.dumps({
+                'hash': board.board_hash, 'board_size': board.board_size, 'rules': list(board.rules.names),
+                'snakes': sorted(board.snakes.items()), 'ladders': sorted(board.ladders.items()),
+                'metrics': {'players': self.metric_players, 'expected_turns': board.expected_turns,
+                            'expected_rounds': board.expected_rounds, 'unfairness': board.unfairness},
+            }, separators=(',', ':')) + "\n")
+            written += 1
+        return written
+
+    def import_jsonl(self, lines, workers=1, on_progress=None):
+        """export_jsonl 형식의 줄들을 가져오고 새로 넣은 보드 수를 반환합니다.
+
+        기준 플레이어 수가 같은 지표는 그대로 쓰고, 다르거나 없으면 다시 계산합니다.
+        """
+        def entries():
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                    snakes = {int(start): int(end) for start, end in item['snakes']}
+                    ladders = {int(start): int(end) for start, end in item['ladders']}
+                    rules = RuleSet.from_names(item.get('rules', ()))
+                    metrics = item.get('metrics')
+                    if metrics and metrics.get('players') == self.metric_players:
+                        metrics = (metrics['expected_turns'], metrics['expected_rounds'], metrics['unfairness'])
+                    else:
+                        metrics = None
+                except (ValueError, KeyError, TypeError) as e:
+                    raise BoardStoreError(f"{number}번째 줄을 읽을 수 없습니다: {e}") from None
+                yield snakes, ladders, item.get('board_size', BOARD_SIZE), rules, metrics
+
+        return self._ingest(entries(), workers, on_progress)
+
+
+def _add_filter_arguments(parser):
+    parser.add_argument('--snakes', type=int, dest='num_snakes')
+    parser.add_argument('--ladders', type=int, dest='num_ladders')
+    parser.add_argument('--min-length', type=float, help="최소 기대 라운드 수")
+    parser.add_argument('--max-length', type=float, help="최대 기대 라운드 수")
+    parser.add_argument('--max-unfairness', type=float)
+
+
+def _filters(args):
+    return {name: getattr(args, name) for name in ('num_snakes', 'num_ladders', 'min_length', 'max_length',
+                                                   'max_unfairness')}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뱀 사다리 보드 저장소")
+    parser.add_argument('--store', default=None, help="저장소 파일 (기본: LADDER_BOARD_STORE 또는 ~/.local/share)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate_parser = commands.add_parser('generate', help="무작위 보드를 만들어 저장")
+    generate_parser.add_argument('--count', type=int, default=10000)
+    generate_parser.add_argument('--snakes', type=int, default=10)
+    generate_parser.add_argument('--ladders', type=int, default=10)
+    generate_parser.add_argument('--seed', type=int, default=0)
+    generate_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    query_parser = commands.add_parser('query', help="조건에 맞는 보드 출력")
+    _add_filter_arguments(query_parser)
+    query_parser.add_argument('--order', choices=('length', 'turns', 'unfairness'), default='unfairness')
+    query_parser.add_argument('--limit', type=int, default=10)
+    export_parser = commands.add_parser('export', help="보드를 JSON Lines로 내보내기 (-는 표준 출력)")
+    export_parser.add_argument('path')
+    _add_filter_arguments(export_parser)
+    import_parser = commands.add_parser('import', help="JSON Lines 보드 가져오기 (-는 표준 입력)")
+    import_parser.add_argument('path')
+    import_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    def report(seen, added):
+        print(f"\r{seen:,}개 처리, {added:,}개 추가", end="", file=sys.stderr)
+
+    with BoardStore(args.store) as store:
+        start = time.perf_counter()
+        if args.command == 'generate':
+            rng = random.Random(f"{args.seed}:store")
+            boards = (generate_board(args.snakes, args.ladders, rng) for _ in range(args.count))
+            added = store.add_boards(boards, workers=args.workers, on_progress=report)
+            store.analyze()
+            print(f"\n{added:,}개 추가 (전체 {len(store):,}개, {time.perf_counter() - start:.1f}초)")
+        elif args.command == 'query':
+            filters = _filters(args)
+            boards = store.query(order_by=args.order, limit=args.limit, **filters)
+            elapsed = (time.perf_counter() - start) * 1000
+            for board in boards:
+                print(f"{board.board_hash[:16]}  뱀 {len(board.snakes):2d}  사다리 {len(board.ladders):2d}  "
+                      f"기대 {board.expected_rounds:5.1f}라운드  승률 차이 {board.unfairness:.3f}  "
+                      f"{board.rules.describe()}")
+            print(f"{store.count(**filters):,}개 중 {len(boards)}개 ({elapsed:.1f} ms, "
+                  f"{store.metric_players}인 기준)")
+        elif args.command == 'export':
+            file = sys.stdout if args.path == '-' else open(args.path, 'w', encoding='utf-8')
+            try:
+                written = store.export_jsonl(file, **_filters(args))
+            finally:
+                if file is not sys.stdout:
+                    file.close()
+            print(f"{written:,}개 내보냄", file=sys.stderr)
+        else:
+            file = sys.stdin if args.path == '-' else open(args.path, encoding='utf-8')
+            try:
+                added = store.import_jsonl(file, workers=args.workers, on_progress=report)
+                store.analyze()
+            except BoardStoreError as e:
+                print(f"\n{e}", file=sys.stderr)
+                return 1
+            finally:
+                if file is not sys.stdin:
+                    file.close()
+            print(f"\n{added:,}개 추가 (전체 {len(store):,}개)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
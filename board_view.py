@@ -0,0 +1,483 @@
+"""유지형(retained-mode) 보드 캔버스 렌더러
+
+캔버스 아이템은 한 번만 만들고, 이후에는 coords/itemconfig/scale 로 제자리에서 갱신합니다.
+레이어(grid, numbers, ladders, snakes, players)는 각각 따로 무효화됩니다.
+플레이어가 CLUSTER_MIN_PLAYERS명 이상이면 말을 칸별로 모아 더미(위쪽 몇 개 + 인원수)로 그리고,
+구성원이 바뀐 칸의 더미만 다시 그립니다.
+background_image=True이면 칸과 번호 200개 아이템 대신 board_image의 캐시된 배경을
+이미지 아이템 하나로 보여 줍니다.
+"""
+import tkinter as tk
+from collections import OrderedDict
+
+from board_layout import (CELL_COLORS, CLUSTER_MIN_PLAYERS, CLUSTER_STACK, GRID_OUTLINE, LADDER_COLOR, SNAKE_COLOR,
+                          arrow_size, cluster_offset, line_width, number_font_size, player_color, player_radius,
+                          player_spread)
+from game_engine import GRID_DIM
+
+LAYERS = ('grid', 'numbers', 'heatmap', 'ladders', 'snakes', 'players')
+BACKGROUND_CACHE_SIZE = 4  # 셀 크기별 배경 PhotoImage 캐시 항목 수
+HEATMAP_LEVELS = 16  # 히트맵 색 단계 (단계가 바뀐 칸만 다시 칠함)
+HEATMAP_COLORS = [f"#FF{255 - level * 12:02X}{255 - level * 16:02X}" for level in range(HEATMAP_LEVELS)]
+
+
+class BoardView:
+    """보드와 플레이어 말을 캔버스에 유지하며 바뀐 부분만 갱신합니다."""
+    def __init__(self, canvas, layout, background_image=False):
+        self.canvas = canvas
+        self.layout = layout  # 칸 -> 좌표 배치표 (캔버스 <Configure>에서 갱신)
+        self.background_image = background_image
+        self.background_item = None
+        self.background_photos = OrderedDict()  # 셀 크기 -> PhotoImage
+        self.background_cell_size = None  # 지금 보이는 배경을 정확히 그린 셀 크기 (미리보기 중에는 이전 크기)
+        self.preview_photo = None  # 미리보기용으로 늘린 배경 (캐시하지 않음)
+
+        # 마지막으로 그린 배치 (measure()에서 배치표와 비교)
+        self.cell_size = None
+        self.offset = (0, 0)
+
+        # 한 번 만든 캔버스 아이템 ID
+        self.cell_items = []
+        self.number_items = []
+        self.ladder_items = []
+        self.snake_items = []
+        self.player_items = []  # 플레이어별 (기본 도형 ID, 이미지 ID)
+        self.heatmap_items = []  # 칸 번호 -> 히트맵 사각형 ID (0번은 None)
+        self.cluster_items = {}  # 칸 번호 -> ([(기본 도형 ID, 이미지 ID)] * CLUSTER_STACK, 인원수 글자 ID)
+        self.float_items = None  # 더미 모드에서 이동 애니메이션 중인 말 하나 (기본 도형 ID, 이미지 ID)
+
+        # 그릴 내용
+        self.snakes = {}
+        self.ladders = {}
+        self.positions = []
+        self.images = []
+        self.heatmap = None  # 칸별 값 목록 (None이면 히트맵 숨김)
+
+        # 마지막으로 그린 플레이어 상태 (바뀐 말만 갱신하기 위해)
+        self.drawn_positions = []
+        self.drawn_images = []
+        self.drawn_heat_levels = []
+
+        # 더미 모드: 칸별 말 목록(도착 순서)과 마지막으로 그린 더미 모양
+        self.occupants = {}  # 칸 번호 -> 플레이어 번호 목록
+        self.binned_positions = []  # 플레이어별 현재 넣어 둔 칸
+        self.drawn_clusters = {}  # 칸 번호 -> (위쪽 말들, 그 이미지들, 인원수)
+        self.float_player = None
+
+        self.dirty = set(LAYERS)
+
+    # --- 상태 변경 ---
+    def invalidate(self, *layers):
+        """주어진 레이어를 다음 render()에서 다시 그리도록 표시합니다. (인자가 없으면 전체)"""
+        self.dirty.update(layers or LAYERS)
+
+    def set_board(self, snakes, ladders):
+        """뱀과 사다리를 바꿉니다."""
+        if snakes != self.snakes:
+            self.snakes = dict(snakes)
+            self.dirty.add('snakes')
+        if ladders != self.ladders:
+            self.ladders = dict(ladders)
+            self.dirty.add('ladders')
+
+    def set_players(self, positions, images=None):
+        """플레이어 위치(와 스프라이트 PhotoImage 목록)를 바꿉니다."""
+        self.positions = list(positions)
+        if images is not None:
+            self.images = list(images)
+        self.dirty.add('players')
+
+    def set_heatmap(self, values):
+        """칸별 값(인덱스 = 칸 번호)을 히트맵으로 표시합니다. None이면 숨깁니다."""
+        if values is None and self.heatmap is None:
+            return
+        self.heatmap = list(values) if values is not None else None
+        self.dirty.add('heatmap')
+
+    # --- 배치 계산 ---
+    def measure(self):
+        """배치표의 셀 크기와 오프셋을 가져오고, 마지막으로 그린 배치와 다르면 True를 반환합니다."""
+        cell_size, offset = self.layout.cell_size, self.layout.offset
+        changed = cell_size != self.cell_size or offset != self.offset
+        self.cell_size = cell_size
+        self.offset = offset
+        return changed
+
+    def square_center(self, square):
+        """칸 번호의 중심 좌표"""
+        return self.layout.center(square)
+
+    def line_style(self):
+        """셀 크기에 비례하는 뱀/사다리 선 두께와 화살표 모양"""
+        size = arrow_size(self.cell_size)
+        return line_width(self.cell_size), (size, size + 4, size // 2)
+
+    def font(self):
+        return ('Helvetica', number_font_size(self.cell_size))
+
+    # --- 렌더링 ---
+    def render(self, preview=False):
+        """무효화된 레이어만 갱신합니다.
+
+        preview=True(창 크기를 끄는 중)이면 배경을 새로 그리지 않고 마지막 배경을 늘려서 보여 줍니다.
+        크기가 멈춘 뒤 preview=False로 한 번 더 부르면 정확한 배경으로 바꿉니다.
+        """
+        old_cell_size, old_offset = self.cell_size, self.offset
+        geometry_changed = self.measure()
+
+        if self.background_image:
+            if (geometry_changed or self.background_item is None
+                    or (not preview and self.background_cell_size != self.cell_size)):
+                self._update_background(preview)
+            if geometry_changed and old_cell_size is not None:
+                self._relayout_static(old_cell_size, old_offset)  # 뱀/사다리 선만 움직입니다
+            self.dirty.discard('grid')
+            self.dirty.discard('numbers')
+        elif not self.cell_items:
+            self._create_grid()
+            self.dirty.discard('grid')
+            self.dirty.discard('numbers')
+        elif geometry_changed:
+            self._relayout_static(old_cell_size, old_offset)
+
+        if 'grid' in self.dirty or 'numbers' in self.dirty:
+            self._update_grid()
+        if 'heatmap' in self.dirty:
+            self._update_heatmap()
+        if 'ladders' in self.dirty:
+            self.ladder_items = self._rebuild_lines('ladder', self.ladders, LADDER_COLOR)
+        if 'snakes' in self.dirty:
+            self.snake_items = self._rebuild_lines('snake', self.snakes, SNAKE_COLOR)
+        if geometry_changed or 'players' in self.dirty:
+            self._update_players(geometry_changed)
+        self.dirty.clear()
+
+    def _create_grid(self):
+        """칸 사각형과 번호를 한 번만 생성합니다."""
+        cell_size = self.cell_size
+        offset_x, offset_y = self.offset
+        font = self.font()
+        for i in range(GRID_DIM):
+            for j in range(GRID_DIM):
+                x1 = offset_x + j * cell_size
+                y1 = offset_y + i * cell_size
+                self.cell_items.append(self.canvas.create_rectangle(
+                    x1, y1, x1 + cell_size, y1 + cell_size, fill=CELL_COLORS[(i + j) % 2], outline=GRID_OUTLINE,
+                    tags=("board", "grid")))
+
+                square_num = (GRID_DIM - i - 1) * GRID_DIM
+                if (GRID_DIM - i - 1) % 2 == 0:
+                    square_num += j + 1
+                else:
+                    square_num += GRID_DIM - j
+                self.number_items.append(self.canvas.create_text(
+                    x1 + cell_size / 2, y1 + cell_size / 2, text=str(square_num), font=font, tags=("board", "number")))
+        self.canvas.tag_lower("grid")
+
+    def _update_background(self, preview=False):
+        """현재 셀 크기의 배경 이미지를 아이템 하나로 표시합니다. (셀 크기별 PhotoImage 캐시)
+
+        preview=True이고 캐시에 없는 크기면 마지막으로 그린 배경을 늘린 임시 이미지를 씁니다.
+        (배경을 새로 그리는 데는 한 프레임보다 오래 걸립니다)
+        """
+        from PIL import Image, ImageTk
+
+        from board_image import static_layer
+
+        layout = self.layout
+        photo = self.background_photos.get(self.cell_size)
+        if photo is not None:
+            self.background_photos.move_to_end(self.cell_size)
+            self.background_cell_size = self.cell_size
+        elif preview and self.background_cell_size is not None:
+            base = static_layer(self.background_cell_size, layout.board_size, layout.grid_dim)
+            size = (layout.grid_dim * self.cell_size, layout.rows * self.cell_size)
+            photo = self.preview_photo = ImageTk.PhotoImage(base.resize(size, Image.Resampling.NEAREST))
+        else:
+            photo = ImageTk.PhotoImage(static_layer(self.cell_size, layout.board_size, layout.grid_dim))
+            self.background_photos[self.cell_size] = photo
+            if len(self.background_photos) > BACKGROUND_CACHE_SIZE:
+                self.background_photos.popitem(last=False)
+            self.background_cell_size = self.cell_size
+        if not preview:
+            self.preview_photo = None
+
+        if self.background_item is None:
+            self.background_item = self.canvas.create_image(*self.offset, image=photo, anchor=tk.NW,
+                                                            tags="background")
+            self.canvas.tag_lower("background")
+        else:
+            self.canvas.coords(self.background_item, *self.offset)
+            self.canvas.itemconfig(self.background_item, image=photo)
+
+    def _update_grid(self):
+        """번호 글꼴을 태그 단위로 다시 적용합니다."""
+        self.canvas.itemconfig("number", font=self.font())
+
+    def _relayout_static(self, old_cell_size, old_offset):
+        """고정 아이템 전체를 태그 단위 move/scale 몇 번으로 새 크기에 맞춥니다."""
+        factor = self.cell_size / old_cell_size
+        self.canvas.move("board", -old_offset[0], -old_offset[1])
+        self.canvas.scale("board", 0, 0, factor, factor)
+        self.canvas.move("board", self.offset[0], self.offset[1])
+
+        # 글꼴과 선 두께는 scale로 바뀌지 않으므로 태그 단위로 한 번씩 설정합니다
+        self.canvas.itemconfig("number", font=self.font())
+        width, arrowshape = self.line_style()
+        for tag in ("ladder", "snake"):
+            self.canvas.itemconfig(tag, width=width, arrowshape=arrowshape)
+
+    def _ensure_heatmap_items(self):
+        """칸마다 히트맵 사각형을 한 번만 만듭니다. (칸과 번호 사이에 쌓음)"""
+        if self.heatmap_items:
+            return
+        half = self.cell_size / 2
+        self.heatmap_items = [None]
+        for square in range(1, self.layout.board_size + 1):
+            x, y = self.square_center(square)
+            self.heatmap_items.append(self.canvas.create_rectangle(
+                x - half, y - half, x + half, y + half, outline="", stipple="gray50", state=tk.HIDDEN,
+                tags=("board", "heatmap")))
+        self.drawn_heat_levels = [0] * len(self.heatmap_items)
+        self.canvas.tag_lower("heatmap")
+        self.canvas.tag_lower("grid")
+        self.canvas.tag_lower("background")
+
+    def _update_heatmap(self):
+        """최댓값 대비 비율을 HEATMAP_LEVELS 단계로 나누고, 단계가 바뀐 칸만 다시 칠합니다."""
+        if self.heatmap is None:
+            if self.heatmap_items:
+                self.canvas.itemconfig("heatmap", state=tk.HIDDEN)
+                self.drawn_heat_levels = [0] * len(self.heatmap_items)
+            return
+        self._ensure_heatmap_items()
+        peak = max(self.heatmap[1:len(self.heatmap_items)], default=0) or 1
+        for square in range(1, min(len(self.heatmap), len(self.heatmap_items))):
+            level = min(HEATMAP_LEVELS - 1, int(self.heatmap[square] / peak * HEATMAP_LEVELS))
+            if level == self.drawn_heat_levels[square]:
+                continue
+            if level == 0:
+                self.canvas.itemconfig(self.heatmap_items[square], state=tk.HIDDEN)
+            else:
+                self.canvas.itemconfig(self.heatmap_items[square], fill=HEATMAP_COLORS[level], state=tk.NORMAL)
+            self.drawn_heat_levels[square] = level
+
+    def _rebuild_lines(self, tag, jumps, color):
+        """보드가 바뀌었을 때 뱀 또는 사다리 선을 다시 만듭니다."""
+        self.canvas.delete(tag)
+        width, arrowshape = self.line_style()
+        items = []
+        for start, end in jumps.items():
+            x1, y1 = self.square_center(start)
+            x2, y2 = self.square_center(end)
+            items.append(self.canvas.create_line(x1, y1, x2, y2, fill=color, width=width, arrow=tk.LAST,
+                                                 arrowshape=arrowshape, smooth=True, tags=("board", tag)))
+        # 쌓는 순서 유지: 사다리 < 뱀 < 플레이어
+        self.canvas.tag_raise("snake")
+        self.canvas.tag_raise("player")
+        return items
+
+    @property
+    def clustered(self):
+        """말을 칸별 더미로 그리는지 (플레이어가 많을 때)"""
+        return len(self.positions) >= CLUSTER_MIN_PLAYERS
+
+    def player_position(self, index, square):
+        """index번 플레이어 말이 square에 있을 때의 중심 좌표 (겹치지 않게 가로로 벌림)"""
+        num_players = len(self.positions)
+        offset_dist = player_spread(self.cell_size)
+        x, y = self.square_center(square)  # 100을 넘은 플레이어는 100 위치에 그립니다
+        return x + (index - (num_players - 1) / 2) * offset_dist, y
+
+    def _ensure_player_items(self):
+        """플레이어 수만큼 말 아이템(기본 도형 + 숨겨진 이미지)을 만듭니다."""
+        num_players = len(self.positions)
+        if len(self.player_items) == num_players:
+            return
+        self.canvas.delete("player")
+        self.player_items = []
+        for i in range(num_players):
+            oval = self.canvas.create_oval(0, 0, 0, 0, fill=player_color(i), outline='black', tags="player")
+            image = self.canvas.create_image(0, 0, state=tk.HIDDEN, tags="player")
+            self.player_items.append((oval, image))
+        self.drawn_positions = [None] * num_players
+        self.drawn_images = [None] * num_players
+
+    def _update_players(self, geometry_changed):
+        """위치나 스프라이트가 바뀐 말만 coords/itemconfig로 갱신합니다."""
+        if self.clustered:
+            self._update_clusters(geometry_changed)
+            return
+        if self.cluster_items or self.float_items:
+            self._clear_clusters()
+        self._ensure_player_items()
+        radius = player_radius(self.cell_size)
+        for i, square in enumerate(self.positions):
+            image = self.images[i] if i < len(self.images) else None
+            oval_id, image_id = self.player_items[i]
+
+            if image is not self.drawn_images[i]:
+                if image is not None:
+                    self.canvas.itemconfig(image_id, image=image, state=tk.NORMAL)
+                    self.canvas.itemconfig(oval_id, state=tk.HIDDEN)
+                else:
+                    self.canvas.itemconfig(image_id, state=tk.HIDDEN)
+                    self.canvas.itemconfig(oval_id, state=tk.NORMAL)
+                self.drawn_images[i] = image
+
+            if geometry_changed or square != self.drawn_positions[i]:
+                x, y = self.player_position(i, square)
+                self.canvas.coords(oval_id, x - radius, y - radius, x + radius, y + radius)
+                self.canvas.coords(image_id, x, y)
+                self.drawn_positions[i] = square
+
+    # --- 더미 모드 ---
+    def _clear_clusters(self):
+        """더미 아이템과 칸별 말 목록을 모두 버립니다. (플레이어 수가 바뀌었을 때)"""
+        self.canvas.delete("cluster")
+        self.cluster_items = {}
+        self.float_items = None
+        self.float_player = None
+        self.occupants = {}
+        self.binned_positions = []
+        self.drawn_clusters = {}
+        self.drawn_images = []
+
+    def _update_clusters(self, geometry_changed):
+        """말을 칸별로 다시 나누고, 구성원(또는 위쪽 말의 스프라이트)이 바뀐 칸의 더미만 다시 그립니다."""
+        if self.player_items:
+            self.canvas.delete("player")  # 개별 말 아이템은 더미 모드에서 쓰지 않습니다
+            self.player_items = []
+            self.drawn_positions = []
+            self.drawn_images = []  # 더미 모드에서는 마지막으로 확인한 스프라이트 목록
+        if len(self.binned_positions) != len(self.positions):
+            self._clear_clusters()
+            self.binned_positions = [None] * len(self.positions)
+
+        board_size = self.layout.board_size
+        occupants = self.occupants
+        binned = self.binned_positions  # 플레이어별 마지막으로 나눈 논리 위치
+        changed = set(self.cluster_items) if geometry_changed else set()
+        moved = [index for index, (square, old) in enumerate(zip(self.positions, binned)) if square != old]
+        for index in moved:
+            old = binned[index]
+            square = binned[index] = self.positions[index]
+            old_bin = None if old is None else min(max(old, 1), board_size)
+            new_bin = min(max(square, 1), board_size)
+            if new_bin == old_bin:
+                continue
+            if old_bin is not None:
+                occupants[old_bin].remove(index)
+                changed.add(old_bin)
+            occupants.setdefault(new_bin, []).append(index)
+            changed.add(new_bin)
+
+        if self.float_items is not None and self.float_player is not None:
+            for item in self.float_items:
+                self.canvas.itemconfig(item, state=tk.HIDDEN)
+            self.float_player = None
+
+        # 스프라이트가 새로 도착했으면 그 말이 위쪽에 보이는 칸도 다시 그립니다
+        if self.images != self.drawn_images:
+            for square, (top, images, count) in self.drawn_clusters.items():
+                if images != tuple(self.player_image(index) for index in top):
+                    changed.add(square)
+            self.drawn_images = list(self.images)
+        for square in changed:
+            self._draw_cluster(square, force=geometry_changed)
+
+    def player_image(self, index):
+        """index번 플레이어의 스프라이트 PhotoImage (아직 없으면 None)"""
+        return self.images[index] if index < len(self.images) else None
+
+    def _create_cluster_items(self, square):
+        """칸에 처음 말이 들어올 때 더미 아이템(말 CLUSTER_STACK개 + 인원수 글자)을 만듭니다."""
+        tokens = []
+        for _ in range(CLUSTER_STACK):
+            oval = self.canvas.create_oval(0, 0, 0, 0, outline='black', state=tk.HIDDEN, tags=("player", "cluster"))
+            image = self.canvas.create_image(0, 0, state=tk.HIDDEN, tags=("player", "cluster"))
+            tokens.append((oval, image))
+        badge = self.canvas.create_text(0, 0, anchor=tk.NE, state=tk.HIDDEN, tags=("player", "cluster"))
+        self.cluster_items[square] = (tokens, badge)
+        return self.cluster_items[square]
+
+    def _draw_cluster(self, square, force=False):
+        """칸 하나의 더미: 가장 늦게 도착한 CLUSTER_STACK개를 쌓고, 둘 이상이면 인원수를 표시합니다."""
+        members = self.occupants.get(square, [])
+        top = tuple(members[-CLUSTER_STACK:])
+        shape = (top, tuple(self.player_image(index) for index in top), len(members))
+        if not force and self.drawn_clusters.get(square) == shape:
+            return
+        self.drawn_clusters[square] = shape
+        if square not in self.cluster_items:
+            if not members:
+                return
+            self._create_cluster_items(square)
+        tokens, badge = self.cluster_items[square]
+
+        x, y = self.square_center(square)
+        radius = player_radius(self.cell_size)
+        for depth, (oval_id, image_id) in enumerate(tokens):
+            if depth >= len(top):
+                self.canvas.itemconfig(oval_id, state=tk.HIDDEN)
+                self.canvas.itemconfig(image_id, state=tk.HIDDEN)
+                continue
+            index = top[depth]
+            dx, dy = cluster_offset(self.cell_size, depth, len(top))
+            image = self.player_image(index)
+            if image is not None:
+                self.canvas.coords(image_id, x + dx, y + dy)
+                self.canvas.itemconfig(image_id, image=image, state=tk.NORMAL)
+                self.canvas.itemconfig(oval_id, state=tk.HIDDEN)
+            else:
+                self.canvas.coords(oval_id, x + dx - radius, y + dy - radius, x + dx + radius, y + dy + radius)
+                self.canvas.itemconfig(oval_id, fill=player_color(index), state=tk.NORMAL)
+                self.canvas.itemconfig(image_id, state=tk.HIDDEN)
+
+        if len(members) > 1:
+            half = self.cell_size / 2
+            self.canvas.coords(badge, x + half - 2, y - half + 1)
+            self.canvas.itemconfig(badge, text=str(len(members)), state=tk.NORMAL,
+                                   font=('Helvetica', number_font_size(self.cell_size), 'bold'))
+        else:
+            self.canvas.itemconfig(badge, state=tk.HIDDEN)
+
+    def _place_float(self, index, x, y):
+        """더미 모드 애니메이션: 움직이는 말 하나를 따로 그립니다. (출발 칸 더미는 render()까지 그대로)"""
+        if self.float_items is None:
+            self.float_items = (self.canvas.create_oval(0, 0, 0, 0, outline='black', tags=("player", "cluster")),
+                                self.canvas.create_image(0, 0, tags=("player", "cluster")))
+        oval_id, image_id = self.float_items
+        if index != self.float_player:
+            image = self.player_image(index)
+            if image is not None:
+                self.canvas.itemconfig(image_id, image=image, state=tk.NORMAL)
+                self.canvas.itemconfig(oval_id, state=tk.HIDDEN)
+            else:
+                self.canvas.itemconfig(oval_id, fill=player_color(index), state=tk.NORMAL)
+                self.canvas.itemconfig(image_id, state=tk.HIDDEN)
+            self.canvas.tag_raise(oval_id)
+            self.canvas.tag_raise(image_id)
+            self.float_player = index
+        radius = player_radius(self.cell_size)
+        self.canvas.coords(oval_id, x - radius, y - radius, x + radius, y + radius)
+        self.canvas.coords(image_id, x, y)
+
+    def place_player_between(self, index, from_square, to_square, t):
+        """애니메이션용: 말을 두 칸 사이 진행도 t(0~1) 위치에 놓습니다."""
+        if self.cell_size is None:
+            return
+        if self.clustered:
+            (x1, y1), (x2, y2) = self.square_center(from_square), self.square_center(to_square)
+            self._place_float(index, x1 + (x2 - x1) * t, y1 + (y2 - y1) * t)
+            return
+        if index >= len(self.player_items):
+            return
+        x1, y1 = self.player_position(index, from_square)
+        x2, y2 = self.player_position(index, to_square)
+        x, y = x1 + (x2 - x1) * t, y1 + (y2 - y1) * t
+        radius = player_radius(self.cell_size)
+        oval_id, image_id = self.player_items[index]
+        self.canvas.coords(oval_id, x - radius, y - radius, x + radius, y + radius)
+        self.canvas.coords(image_id, x, y)
+        self.drawn_positions[index] = None  # 다음 render()에서 논리 위치로 다시 맞춥니다
@@ -0,0 +1,435 @@
+"""뱀 사다리 게임 규칙 엔진 (Tk 없이 동작하는 헤드리스 코어)
+
+규칙 변형(하우스 룰)은 보드마다 한 번 이동 표(MoveTable)로 컴파일되며,
+게임 화면, 헤드리스 엔진, 시뮬레이션, 마르코프 해석이 모두 같은 표를 조회합니다.
+"""
+import random
+import struct
+from array import array
+from collections import OrderedDict, namedtuple
+
+# --- 게임 설정 ---
+BOARD_SIZE = 100
+GRID_DIM = 10
+DICE_SIDES = 6
+EXTRA_TURN_ROLL = 6  # 규칙 변형에서 한 번 더 굴리게 하는 주사위 값
+MAX_DICE = 2  # 규칙 변형이 쓰는 주사위 개수 상한 (굴림 최댓값 MAX_DICE * DICE_SIDES)
+MOVE_TABLE_CACHE_SIZE = 256  # (규칙, 보드)별로 컴파일해 둔 이동 표 개수
+
+# 한 번의 이동 결과
+#   jump: 'ladder', 'snake', 'reset'(연속 굴림 제한으로 처음 칸) 또는 None
+#   again: 같은 플레이어가 한 번 더 굴림
+MoveResult = namedtuple('MoveResult', ['player', 'roll', 'start', 'landed', 'final', 'jump', 'won', 'again'],
+                        defaults=(False,))
+
+
+class BoardGenerationError(ValueError):
+    """요청한 개수의 뱀/사다리를 보드에 배치할 수 없을 때 발생합니다."""
+
+
+class _SquarePool:
+    """[low, high] 범위의 칸을 중복 없이 무작위로 하나씩 꺼내는 풀
+
+    희소 피셔-예이츠 셔플이라 범위 전체를 만들지 않고 꺼낼 때마다 O(1)입니다.
+    """
+    def __init__(self, low, high, rng):
+        self.low = low
+        self.remaining = max(0, high - low + 1)
+        self.rng = rng
+        self.swapped = {}
+
+    def draw(self):
+        """남은 칸 중 하나를 꺼냅니다. 비었으면 None"""
+        if self.remaining == 0:
+            return None
+        i = self.rng.randrange(self.remaining)
+        self.remaining -= 1
+        value = self.swapped.get(i, i)
+        self.swapped[i] = self.swapped.pop(self.remaining, self.remaining)
+        return self.low + value
+
+
+def _pick_free(low, high, occupied, rng):
+    """[low, high]에서 비어 있는 칸 하나를 고릅니다. (임의 위치부터 순환 탐색, 없으면 None)"""
+    if low > high:
+        return None
+    width = high - low + 1
+    first = rng.randrange(width)
+    for step in range(width):
+        square = low + (first + step) % width
+        if square not in occupied:
+            return square
+    return None
+
+
+def _place_jumps(count, pool, end_range, occupied, rng, kind):
+    """풀에서 시작 칸을 꺼내 end_range(start)의 빈 칸과 짝지어 count개를 만듭니다."""
+    jumps = {}
+    while len(jumps) < count:
+        start = pool.draw()
+        if start is None:
+            raise BoardGenerationError(f"{kind} {count}개를 배치할 수 없습니다. ({len(jumps)}개에서 빈 칸 부족)")
+        if start in occupied:
+            continue
+        end = _pick_free(*end_range(start), occupied, rng)
+        if end is None:
+            continue
+        jumps[start] = end
+        occupied.add(start)
+        occupied.add(end)
+    return jumps
+
+
+def generate_board(num_snakes, num_ladders, rng=random, board_size=BOARD_SIZE, grid_dim=GRID_DIM, max_jump=None):
+    """뱀과 사다리를 랜덤하게 생성하여 (snakes, ladders) 딕셔너리를 반환합니다.
+
+    시작 칸은 미리 정한 후보 풀에서 중복 없이 꺼내고 끝 칸은 허용 구간에서 빈 칸을 찾으므로
+    보드 크기와 무관하게 개수에 비례하는 시간이 듭니다. 사다리는 최소 한 줄 위로,
+    뱀은 최소 한 줄 아래로 이어지며 점프 길이는 max_jump(기본: 두 줄) 이하입니다.
+    요청한 개수를 채울 수 없으면 BoardGenerationError가 발생합니다.
+    """
+    if max_jump is None:
+        max_jump = 2 * grid_dim
+    if 2 * (num_snakes + num_ladders) > board_size - 2:
+        raise BoardGenerationError(f"보드 칸 수({board_size})에 비해 뱀/사다리가 너무 많습니다.")
+
+    occupied = {1, board_size}
+
+    # 사다리: 시작 칸보다 높은 줄, max_jump 이내
+    def ladder_ends(start):
+        return max(start + 1, (start // grid_dim + 1) * grid_dim), min(start + max_jump, board_size - 1)
+
+    # 뱀: 시작 칸보다 낮은 줄, max_jump 이내
+    def snake_ends(start):
+        return max(2, start - max_jump), min(start - 1, (start // grid_dim) * grid_dim - 1)
+
+    ladders = _place_jumps(num_ladders, _SquarePool(2, board_size - grid_dim, rng),
+                           ladder_ends, occupied, rng, "사다리")
+    snakes = _place_jumps(num_snakes, _SquarePool(grid_dim + 1, board_size - 1, rng),
+                          snake_ends, occupied, rng, "뱀")
+    return snakes, ladders
+
+
+def resolve_move(position, roll, snakes, ladders, board_size=BOARD_SIZE):
+    """주사위 결과를 적용하여 (도착 칸, 최종 칸, 점프 종류)를 반환합니다.
+
+    점프 종류는 'ladder', 'snake' 또는 None 입니다.
+    board_size 이상에 도착하면 그대로 승리 위치가 됩니다.
+    """
+    landed = position + roll
+    if landed >= board_size:
+        return landed, landed, None
+    if landed in ladders:
+        return landed, ladders[landed], 'ladder'
+    if landed in snakes:
+        return landed, snakes[landed], 'snake'
+    return landed, landed, None
+
+
+def jump_typecode(board_size=BOARD_SIZE):
+    """칸 번호를 담을 array 타입 코드 (보통 2바이트 'H')"""
+    return 'H' if board_size + DICE_SIDES < 2 ** 16 else 'I'
+
+
+def build_jump_table(snakes, ladders, board_size=BOARD_SIZE, max_roll=DICE_SIDES):
+    """도착 칸 -> 뱀/사다리 적용 후 최종 칸을 담은 평평한 배열
+
+    board_size를 넘어 도착하는 경우까지 담기 위해 길이는 board_size + max_roll + 1 이며,
+    뱀/사다리가 없는 칸은 자기 자신을 가리킵니다.
+    """
+    table = array(jump_typecode(board_size), range(board_size + max_roll + 1))
+    for start, end in ladders.items():
+        table[start] = end
+    for start, end in snakes.items():
+        table[start] = end
+    return table
+
+
+def resolve_jump(position, roll, jumps):
+    """resolve_move와 같은 결과를 build_jump_table 배열 조회 한 번으로 구합니다."""
+    landed = position + roll
+    final = jumps[landed]
+    if final > landed:
+        return landed, final, 'ladder'
+    if final < landed:
+        return landed, final, 'snake'
+    return landed, final, None
+
+
+# --- 규칙 변형 ---
+# 하우스 룰 하나 (RuleSet은 켠 변형들의 값을 합쳐 만듭니다)
+#   flag: 기록 파일에 저장하는 비트
+#   dice: 굴리는 주사위 개수 (여러 변형이면 가장 큰 값)
+#   exact_finish: 마지막 칸에 정확히 도착해야 하며, 넘친 만큼 되돌아감
+#   extra_turn: EXTRA_TURN_ROLL이 나오면 한 번 더 굴림
+#   streak_limit: 한 번 더 굴리기가 이만큼 이어지면 처음 칸으로 (0이면 제한 없음)
+RuleVariant = namedtuple('RuleVariant', ['name', 'label', 'flag', 'dice', 'exact_finish', 'extra_turn',
+                                         'streak_limit'])
+
+RULE_VARIANTS = {variant.name: variant for variant in (
+    RuleVariant('exact_finish', "정확히 도착 (넘치면 되돌아감)", 0x01, 1, True, False, 0),
+    RuleVariant('extra_turn', f"{EXTRA_TURN_ROLL}이 나오면 한 번 더", 0x02, 1, False, True, 0),
+    RuleVariant('three_sixes', f"{EXTRA_TURN_ROLL}이 세 번 연속이면 처음으로", 0x04, 1, False, True, 3),
+    RuleVariant('two_dice', "주사위 두 개 (2d6)", 0x08, 2, False, False, 0),
+)}
+
+
+class RuleSet(namedtuple('RuleSet', ['names', 'dice', 'exact_finish', 'extra_turn', 'streak_limit'])):
+    """켠 규칙 변형의 묶음 (불변, 해시 가능)"""
+    __slots__ = ()
+
+    @classmethod
+    def from_names(cls, names=()):
+        """변형 이름 목록으로 규칙 묶음을 만듭니다. 모르는 이름이면 ValueError"""
+        unknown = [name for name in names if name not in RULE_VARIANTS]
+        if unknown:
+            raise ValueError(f"알 수 없는 규칙 변형입니다: {', '.join(unknown)}")
+        variants = [variant for name, variant in RULE_VARIANTS.items() if name in names]
+        limits = [variant.streak_limit for variant in variants if variant.streak_limit]
+        return cls(tuple(variant.name for variant in variants),
+                   max([variant.dice for variant in variants], default=1),
+                   any(variant.exact_finish for variant in variants),
+                   any(variant.extra_turn for variant in variants),
+                   min(limits, default=0))
+
+    @classmethod
+    def from_flags(cls, flags):
+        """기록 파일의 비트 값으로 규칙 묶음을 만듭니다."""
+        unknown = flags & ~sum(variant.flag for variant in RULE_VARIANTS.values())
+        if unknown:
+            raise ValueError(f"알 수 없는 규칙 비트입니다: {unknown:#x}")
+        return cls.from_names([name for name, variant in RULE_VARIANTS.items() if flags & variant.flag])
+
+    @property
+    def flags(self):
+        return sum(RULE_VARIANTS[name].flag for name in self.names)
+
+    @property
+    def min_roll(self):
+        return self.dice
+
+    @property
+    def max_roll(self):
+        return self.dice * DICE_SIDES
+
+    def roll(self, rng):
+        """주사위를 굴립니다. (주사위 하나면 randint 한 번)"""
+        roll = rng.randint(1, DICE_SIDES)
+        if self.dice == 1:
+            return roll
+        for _ in range(self.dice - 1):
+            roll += rng.randint(1, DICE_SIDES)
+        return roll
+
+    def roll_probabilities(self):
+        """주사위 값별 확률 목록 (인덱스 = 주사위 값)"""
+        probabilities = [1.0] + [0.0] * self.max_roll  # 주사위 0개의 분포에서 하나씩 더해 갑니다
+        for _ in range(self.dice):
+            combined = [0.0] * (self.max_roll + 1)
+            for total, probability in enumerate(probabilities):
+                if probability:
+                    for face in range(1, DICE_SIDES + 1):
+                        if total + face <= self.max_roll:
+                            combined[total + face] += probability / DICE_SIDES
+            probabilities = combined
+        return probabilities
+
+    def compile(self, snakes, ladders, board_size=BOARD_SIZE):
+        """이 규칙과 보드의 이동 표 (같은 규칙과 보드는 캐시에서 가져오므로 읽기 전용으로 쓸 것)"""
+        key = (self, board_size, tuple(sorted(snakes.items())), tuple(sorted(ladders.items())))
+        table = _move_tables.get(key)
+        if table is not None:
+            _move_tables.move_to_end(key)
+            return table
+        table = _move_tables[key] = MoveTable(self, snakes, ladders, board_size)
+        if len(_move_tables) > MOVE_TABLE_CACHE_SIZE:
+            _move_tables.popitem(last=False)
+        return table
+
+    def describe(self):
+        return ", ".join(RULE_VARIANTS[name].label for name in self.names) or "기본 규칙"
+
+
+STANDARD_RULES = RuleSet.from_names()
+_move_tables = OrderedDict()
+
+
+class MoveTable:
+    """(칸, 주사위 값) -> 도착 칸 / 최종 칸을 미리 계산한 평평한 표 (인덱스 = 칸 * stride + 주사위 값)
+
+    넘침 되돌아가기와 뱀/사다리는 표에 들어가 있고, 이동마다 남는 판단은
+    again 표(주사위 값 -> 한 번 더 굴림) 조회와 연속 굴림 제한 비교뿐입니다.
+    """
+    __slots__ = ('rules', 'board_size', 'stride', 'landed', 'final', 'again', 'streak_limit')
+
+    def __init__(self, rules, snakes, ladders, board_size=BOARD_SIZE):
+        self.rules = rules
+        self.board_size = board_size
+        self.stride = stride = rules.max_roll + 1
+        jumps = build_jump_table(snakes, ladders, board_size, rules.max_roll)
+        # 끝난 말(board_size 칸)의 줄까지 포함합니다
+        squares = [position + roll for position in range(board_size + 1) for roll in range(stride)]
+        if rules.exact_finish:
+            squares = [2 * board_size - square if square > board_size else square for square in squares]
+        self.landed = array(jumps.typecode, squares)
+        self.final = array(jumps.typecode, map(jumps.__getitem__, squares))
+        self.again = bytes(rules.extra_turn and roll == EXTRA_TURN_ROLL for roll in range(stride))
+        self.streak_limit = rules.streak_limit
+
+    def move(self, player, position, roll, streak=0):
+        """이동 하나를 적용해 (MoveResult, 새 연속 굴림 수)를 반환합니다."""
+        index = position * self.stride + roll
+        landed = self.landed[index]
+        final = self.final[index]
+        jump = 'ladder' if final > landed else 'snake' if final < landed else None
+        again = False
+        if self.again[roll]:
+            streak += 1
+            if streak == self.streak_limit:
+                landed, final, jump, streak = position, 1, 'reset', 0
+            else:
+                again = True
+        else:
+            streak = 0
+        won = final >= self.board_size
+        if won:
+            again, streak = False, 0
+        return MoveResult(player, roll, position, landed, final, jump, won, again), streak
+
+
+class GameState:
+    """한 판의 상태를 작게 담는 구조 (슬롯 객체 하나 + 말 위치 array)
+
+    게임 종료 여부는 flags의 비트로, 승자는 종료 시점의 current_player로 나타냅니다.
+    streak은 현재 플레이어가 한 번 더 굴리기를 이어 온 횟수입니다.
+    to_bytes()/from_bytes()로 8 + 2 x 플레이어 수 바이트에 저장할 수 있습니다.
+    """
+    __slots__ = ('positions', 'current_player', 'turn_count', 'flags', 'streak')
+
+    GAME_OVER = 0x01
+    _HEADER = struct.Struct('<BBBBI')  # 플레이어 수, 현재 플레이어, 플래그, 연속 굴림 수, 턴 수
+
+    def __init__(self, num_players, board_size=BOARD_SIZE):
+        self.positions = array(jump_typecode(board_size), [1]) * num_players
+        self.current_player = 0
+        self.turn_count = 0
+        self.flags = 0
+        self.streak = 0
+
+    @property
+    def game_over(self):
+        return bool(self.flags & self.GAME_OVER)
+
+    @property
+    def winner(self):
+        return self.current_player if self.flags & self.GAME_OVER else None
+
+    def to_bytes(self):
+        header = self._HEADER.pack(len(self.positions), self.current_player, self.flags, self.streak,
+                                   self.turn_count)
+        return header + self.positions.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, board_size=BOARD_SIZE):
+        num_players, current_player, flags, streak, turn_count = cls._HEADER.unpack_from(data)
+        state = cls.__new__(cls)
+        state.positions = array(jump_typecode(board_size))
+        state.positions.frombytes(data[cls._HEADER.size:cls._HEADER.size + num_players * state.positions.itemsize])
+        state.current_player = current_player
+        state.turn_count = turn_count
+        state.flags = flags
+        state.streak = streak
+        return state
+
+
+class GameEngine:
+    """한 판의 게임 상태와 턴 진행을 관리합니다. (UI 없음)
+
+    이동은 규칙 묶음을 컴파일한 MoveTable로 처리하고 상태는 GameState에 담습니다.
+    """
+    __slots__ = ('num_players', 'snakes', 'ladders', 'rng', 'board_size', 'rules', 'table', 'state',
+                 '_single_die', '_stride', '_landed', '_final', '_again')
+
+    def __init__(self, num_players, snakes, ladders, rng=random, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+        self.num_players = num_players
+        self.snakes = snakes
+        self.ladders = ladders
+        self.rng = rng
+        self.board_size = board_size
+        self.rules = rules
+        self.table = table = rules.compile(snakes, ladders, board_size)
+        # 핫 패스에서 속성 조회를 줄이려고 표를 직접 들고 있습니다
+        self._single_die = rules.dice == 1
+        self._stride, self._landed, self._final, self._again = table.stride, table.landed, table.final, table.again
+        self.reset()
+
+    def reset(self):
+        """모든 말을 1번 칸으로 되돌리고 첫 플레이어부터 시작합니다."""
+        self.state = GameState(self.num_players, self.board_size)
+
+    @property
+    def player_positions(self):
+        return self.state.positions
+
+    @property
+    def current_player(self):
+        return self.state.current_player
+
+    @property
+    def game_over(self):
+        return bool(self.state.flags & GameState.GAME_OVER)
+
+    @property
+    def winner(self):
+        return self.state.winner
+
+    @property
+    def turn_count(self):
+        return self.state.turn_count
+
+    def roll_dice(self):
+        """주사위를 굴립니다."""
+        return self.rules.roll(self.rng)
+
+    def play_turn(self, roll=None):
+        """현재 플레이어의 턴을 한 번 진행하고 MoveResult를 반환합니다."""
+        state = self.state
+        if state.flags & GameState.GAME_OVER:
+            raise RuntimeError("이미 종료된 게임입니다.")
+        if roll is None:
+            roll = self.rng.randint(1, DICE_SIDES) if self._single_die else self.rules.roll(self.rng)
+        player = state.current_player
+        positions = state.positions
+        start = positions[player]
+        state.turn_count += 1
+
+        if self._again[roll]:  # 한 번 더 굴리는 값은 연속 굴림 처리가 있는 MoveTable.move로
+            move, state.streak = self.table.move(player, start, roll, state.streak)
+            positions[player] = move.final
+            if move.won:
+                state.flags |= GameState.GAME_OVER
+            elif not move.again:
+                state.current_player = (player + 1) % self.num_players
+            return move
+
+        # MoveTable.move를 풀어 쓴 핫 패스 (함수 호출 한 번을 아낍니다)
+        index = start * self._stride + roll
+        landed = self._landed[index]
+        final = self._final[index]
+        jump = 'ladder' if final > landed else 'snake' if final < landed else None
+        positions[player] = final
+        if state.streak:
+            state.streak = 0
+
+        won = final >= self.board_size
+        if won:
+            state.flags |= GameState.GAME_OVER
+        else:
+            state.current_player = (player + 1) % self.num_players
+        return MoveResult(player, roll, start, landed, final, jump, won)
+
+    def play_to_end(self, max_turns=100000):
+        """게임이 끝날 때까지 진행하고 승자 인덱스를 반환합니다."""
+        while not self.game_over and self.turn_count < max_turns:
+            self.play_turn()
+        return self.winner
@@ -0,0 +1,485 @@
+"""asyncio 기반 다중 테이블 게임 호스트
+
+한 프로세스에서 수천 개의 게임 세션을 동시에 진행합니다. 세션마다 자기 턴 순서,
+시드 난수(replay_log.game_rngs), 타이머를 가지며 컴퓨터 턴은 sleep 없이
+이벤트 루프 타이머(call_later)로 예약됩니다.
+
+원격 플레이어는 로컬 소켓에서 줄 단위 JSON으로 접속합니다.
+  요청  {"id": 1, "op": "create", "players": 2, "computers": 1, "snakes": 10, "ladders": 10, "rules": ["two_dice"]}
+        {"id": 2, "op": "roll", "session": 1, "player": 0}
+        {"id": 3, "op": "state", "session": 1}      {"id": 4, "op": "watch", "session": 1}
+        {"id": 5, "op": "metrics"}                   {"id": 6, "op": "close", "session": 1}
+  응답  {"id": 1, "ok": true, ...} 또는 {"id": 1, "ok": false, "error": "..."}
+  알림  {"event": "move", "session": 1, ...}, {"event": "finished", "session": 1, "winner": 0}
+
+사용법:
+  python game_host.py serve --port 8765
+  python game_host.py bench --sessions 2000 --players 4
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+from game_engine import STANDARD_RULES, GameEngine, RuleSet, generate_board
+from replay_log import GameRecord, game_rngs, new_seed
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_BOT_DELAY = 0.0  # 컴퓨터 턴 사이 대기 시간(초), 구경하는 사람이 없으면 0
+LATENCY_WINDOW = 256  # 백분위 계산에 쓰는 최근 턴 지연 개수
+MIN_PLAYERS = 2  # 설정 화면과 같은 최소 인원
+FINISHED_SESSION_LIMIT = 1024  # 끝난 뒤에도 state/metrics 조회용으로 남겨 두는 세션 수 (오래된 것부터 제거)
+
+
+class GameHostError(ValueError):
+    """잘못된 요청(없는 세션, 차례가 아닌 플레이어 등)"""
+
+
+class SessionMetrics:
+    """세션 하나의 턴 지연과 처리량 (메모리 일정)
+
+    지연은 턴을 처리해야 할 시각(컴퓨터는 타이머 예정 시각, 사람은 요청 도착 시각)부터
+    이동 알림을 모두 보낼 때까지의 시간입니다.
+    """
+    def __init__(self, now):
+        self.started = now
+        self.finished = None
+        self.turns = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.recent = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency):
+        self.turns += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.recent.append(latency)
+
+    def snapshot(self, now):
+        elapsed = (self.finished or now) - self.started
+        recent = sorted(self.recent)
+        return {
+            'turns': self.turns,
+            'elapsed_s': elapsed,
+            'turns_per_sec': self.turns / elapsed if elapsed > 0 else 0.0,
+            'mean_latency_ms': self.total_latency / self.turns * 1000 if self.turns else 0.0,
+            'p95_latency_ms': recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000 if recent else 0.0,
+            'max_latency_ms': self.max_latency * 1000,
+        }
+
+
+def check_players(num_players, num_computer_players):
+    """플레이어 수가 잘못되었으면 GameHostError를 냅니다."""
+    if num_players < MIN_PLAYERS:
+        raise GameHostError(f"플레이어는 {MIN_PLAYERS}명 이상이어야 합니다.")
+    if not 0 <= num_computer_players <= num_players:
+        raise GameHostError("컴퓨터 플레이어 수가 잘못되었습니다.")
+
+
+class GameSession:
+    """호스트 안의 게임 하나 (Tk 없이 GameEngine으로 진행)"""
+    def __init__(self, session_id, loop, num_players, num_computer_players, snakes, ladders, seed,
+                 bot_delay=DEFAULT_BOT_DELAY, turn_timeout=None, rules=STANDARD_RULES):
+        check_players(num_players, num_computer_players)
+        self.session_id = session_id
+        self.loop = loop
+        self.num_players = num_players
+        self.num_computer_players = num_computer_players
+        self.seed = seed
+        self.bot_delay = bot_delay
+        self.turn_timeout = turn_timeout  # 사람이 이 시간(초) 안에 굴리지 않으면 대신 굴림
+        self.engine = GameEngine(num_players, snakes, ladders, game_rngs(seed)[1], rules=rules)
+        self.rolls = bytearray()
+        self.subscribers = []  # 알림 콜백 (event 딕셔너리를 받음)
+        self.metrics = SessionMetrics(loop.time())
+        self.done = loop.create_future()
+        self.timer = None
+        self.turn_due = None
+
+    @property
+    def computer_player_start_index(self):
+        return self.num_players - self.num_computer_players
+
+    def is_computer_player(self, player_index):
+        return player_index >= self.computer_player_start_index
+
+    @property
+    def current_player(self):
+        return self.engine.current_player
+
+    def start(self):
+        self._schedule_turn()
+
+    def _schedule_turn(self):
+        """다음 턴의 타이머를 겁니다. (컴퓨터 턴 또는 사람 턴 시간 제한)"""
+        self._cancel_timer()
+        if self.engine.game_over:
+            return
+        now = self.loop.time()
+        if self.is_computer_player(self.current_player):
+            self.turn_due = now + self.bot_delay
+            self.timer = self.loop.call_at(self.turn_due, self._timer_turn)
+        elif self.turn_timeout is not None:
+            self.turn_due = None
+            self.timer = self.loop.call_at(now + self.turn_timeout, self._timer_turn)
+
+    def _cancel_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def _timer_turn(self):
+        self.timer = None
+        due = self.turn_due if self.turn_due is not None else self.loop.time()
+        self._play(due)
+
+    def roll(self, player):
+        """사람 플레이어의 굴림 요청을 처리하고 MoveResult를 반환합니다."""
+        if self.engine.game_over:
+            raise GameHostError("이미 끝난 게임입니다.")
+        if player != self.current_player or self.is_computer_player(player):
+            raise GameHostError(f"플레이어 {player}의 차례가 아닙니다.")
+        return self._play(self.loop.time())
+
+    def _play(self, due):
+        move = self.engine.play_turn()
+        self.rolls.append(move.roll)
+        self._publish({'event': 'move', 'session': self.session_id, **move._asdict()})
+        if move.won:
+            self.metrics.finished = self.loop.time()
+            self._publish({'event': 'finished', 'session': self.session_id, 'winner': move.player,
+                           'turns': self.engine.turn_count})
+            if not self.done.done():
+                self.done.set_result(move.player)
+        self.metrics.record(self.loop.time() - due)
+        self._schedule_turn()
+        return move
+
+    def _publish(self, event):
+        for callback in self.subscribers:
+            callback(event)
+
+    def close(self):
+        self._cancel_timer()
+        self.subscribers.clear()
+        if not self.done.done():
+            self.done.set_result(None)
+
+    def state(self):
+        engine = self.engine
+        return {
+            'session': self.session_id,
+            'seed': self.seed,
+            'players': self.num_players,
+            'computers': self.num_computer_players,
+            'rules': list(engine.rules.names),
+            'positions': list(engine.player_positions),
+            'current_player': engine.current_player,
+            'game_over': engine.game_over,
+            'winner': engine.winner,
+            'snakes': {str(start): end for start, end in engine.snakes.items()},
+            'ladders': {str(start): end for start, end in engine.ladders.items()},
+        }
+
+    def record(self):
+        """replay_log 형식으로 저장/검증할 수 있는 GameRecord"""
+        engine = self.engine
+        return GameRecord(self.seed, engine.board_size, self.num_players, engine.snakes, engine.ladders,
+                          bytes(self.rolls), engine.rules)
+
+
+class GameHost:
+    """여러 GameSession을 한 이벤트 루프에서 관리합니다.
+
+    끝난 세션은 finished_limit개까지만 남겨 두고 가장 먼저 끝난 것부터 제거합니다.
+    제거하거나 닫은 세션의 턴 수와 지연은 호스트 합계에 남습니다.
+    """
+    def __init__(self, bot_delay=DEFAULT_BOT_DELAY, turn_timeout=None, finished_limit=FINISHED_SESSION_LIMIT):
+        self.bot_delay = bot_delay
+        self.turn_timeout = turn_timeout
+        self.finished_limit = finished_limit
+        self.sessions = {}
+        self.finished_order = deque()  # 끝난 순서대로 세션 ID (제거 후보)
+        self.next_id = 1
+        self.finished_sessions = 0
+        self.started = None
+
+        # 제거한 세션의 지표 합계
+        self.dropped_turns = 0
+        self.dropped_latency = 0.0
+        self.dropped_max_latency = 0.0
+
+    def create_session(self, num_players=2, num_computer_players=1, num_snakes=10, num_ladders=10, seed=None,
+                       rules=STANDARD_RULES):
+        """새 세션을 만들고 시작합니다. (실행 중인 이벤트 루프 안에서 호출)"""
+        check_players(num_players, num_computer_players)
+        loop = asyncio.get_running_loop()
+        if self.started is None:
+            self.started = loop.time()
+        if seed is None:
+            seed = new_seed()
+        snakes, ladders = generate_board(num_snakes, num_ladders, game_rngs(seed)[0])
+        session = GameSession(self.next_id, loop, num_players, num_computer_players, snakes, ladders, seed,
+                              self.bot_delay, self.turn_timeout, rules)
+        self.sessions[session.session_id] = session
+        self.next_id += 1
+        session.done.add_done_callback(lambda _: self._on_session_done(session))
+        session.start()
+        return session
+
+    def _on_session_done(self, session):
+        if session.done.result() is None:
+            return  # 끝나기 전에 닫힌 세션 (승자 없음)
+        self.finished_sessions += 1
+        if self.sessions.get(session.session_id) is not session:
+            return  # 이미 닫힌 세션
+        self.finished_order.append(session.session_id)
+        while len(self.finished_order) > self.finished_limit:
+            old = self.sessions.get(self.finished_order.popleft())
+            if old is not None:
+                self._drop(old)
+
+    def _drop(self, session):
+        """세션을 목록에서 빼고 지표는 호스트 합계에 더합니다."""
+        del self.sessions[session.session_id]
+        session.close()
+        metrics = session.metrics
+        self.dropped_turns += metrics.turns
+        self.dropped_latency += metrics.total_latency
+        self.dropped_max_latency = max(self.dropped_max_latency, metrics.max_latency)
+
+    def get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise GameHostError(f"세션 {session_id}이(가) 없습니다.")
+        return session
+
+    def close_session(self, session_id):
+        self._drop(self.get(session_id))
+
+    def metrics(self):
+        """호스트 전체 처리량과 턴 지연 요약"""
+        now = asyncio.get_running_loop().time() if self.started is not None else 0.0
+        turns = self.dropped_turns
+        total_latency = self.dropped_latency
+        max_latency = self.dropped_max_latency
+        recent = []
+        active = 0
+        for session in self.sessions.values():
+            metrics = session.metrics
+            turns += metrics.turns
+            total_latency += metrics.total_latency
+            max_latency = max(max_latency, metrics.max_latency)
+            recent.extend(metrics.recent)
+            active += not session.engine.game_over
+        recent.sort()
+        elapsed = now - self.started if self.started is not None else 0.0
+        return {
+            'sessions': len(self.sessions),
+            'active_sessions': active,
+            'finished_sessions': self.finished_sessions,
+            'turns': turns,
+            'turns_per_sec': turns / elapsed if elapsed > 0 else 0.0,
+            'mean_latency_ms': total_latency / turns * 1000 if turns else 0.0,
+            'p95_latency_ms': recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000 if recent else 0.0,
+            'max_latency_ms': max_latency * 1000,
+        }
+
+    # --- 소켓 프로토콜 ---
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """줄 단위 JSON 프로토콜 서버를 시작해 asyncio.Server를 반환합니다."""
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def _handle_client(self, reader, writer):
+        watched = []
+
+        def send(message):
+            if not writer.is_closing():
+                writer.write(json.dumps(message, ensure_ascii=False).encode() + b'\n')
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    response = self._dispatch(request, send, watched)
+                    response.update(id=request.get('id'), ok=True)
+                except (GameHostError, ValueError, KeyError, TypeError) as e:
+                    response = {'id': request.get('id') if isinstance(request, dict) else None,
+                                'ok': False, 'error': str(e)}
+                send(response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session in watched:
+                if send in session.subscribers:
+                    session.subscribers.remove(send)
+            writer.close()
+
+    def _dispatch(self, request, send, watched):
+        op = request['op']
+        if op == 'create':
+            session = self.create_session(int(request.get('players', 2)), int(request.get('computers', 1)),
+                                          int(request.get('snakes', 10)), int(request.get('ladders', 10)),
+                                          request.get('seed'), RuleSet.from_names(request.get('rules', ())))
+            self._watch(session, send, watched)
+            return session.state()
+        if op == 'watch':
+            session = self.get(int(request['session']))
+            self._watch(session, send, watched)
+            return session.state()
+        if op == 'roll':
+            move = self.get(int(request['session'])).roll(int(request['player']))
+            return move._asdict()
+        if op == 'state':
+            return self.get(int(request['session'])).state()
+        if op == 'metrics':
+            if 'session' in request:
+                session = self.get(int(request['session']))
+                return session.metrics.snapshot(session.loop.time())
+            return self.metrics()
+        if op == 'close':
+            self.close_session(int(request['session']))
+            return {}
+        raise GameHostError(f"알 수 없는 요청입니다: {op}")
+
+    @staticmethod
+    def _watch(session, send, watched):
+        if send not in session.subscribers:
+            session.subscribers.append(send)
+            watched.append(session)
+
+
+class LoopbackClient:
+    """테스트용 로컬 클라이언트: 요청은 응답을 기다리고, 알림은 events 큐에 쌓입니다."""
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.events = asyncio.Queue()
+        self.pending = {}
+        self.next_id = 1
+        self.reader_task = None
+
+    async def connect(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.reader_task = asyncio.create_task(self._read_loop())
+        return self
+
+    async def _read_loop(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if 'event' in message:
+                self.events.put_nowait(message)
+            else:
+                future = self.pending.pop(message.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("서버 연결이 끊겼습니다."))
+
+    async def request(self, op, **fields):
+        """요청을 보내고 응답을 돌려줍니다. (실패 응답이면 GameHostError)"""
+        request_id = self.next_id
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(json.dumps({'id': request_id, 'op': op, **fields}).encode() + b'\n')
+        await self.writer.drain()
+        response = await future
+        if not response['ok']:
+            raise GameHostError(response['error'])
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        if self.reader_task is not None:
+            await self.reader_task
+
+
+# --- 명령줄 ---
+async def run_bench(num_sessions, num_players, num_snakes, num_ladders, seed):
+    """컴퓨터끼리 num_sessions개의 게임을 동시에 끝까지 진행하고 호스트 지표를 반환합니다."""
+    host = GameHost()
+    start = time.perf_counter()
+    sessions = [host.create_session(num_players, num_players, num_snakes, num_ladders,
+                                    seed=None if seed is None else seed + index)
+                for index in range(num_sessions)]
+    await asyncio.gather(*(session.done for session in sessions))
+    metrics = host.metrics()
+    metrics['wall_s'] = time.perf_counter() - start
+    return metrics
+
+
+async def run_loopback_demo(port):
+    """호스트와 클라이언트를 한 프로세스에서 띄워 사람 대 컴퓨터 게임 하나를 끝까지 진행합니다."""
+    host = GameHost()
+    server = await host.serve(DEFAULT_HOST, port)
+    port = server.sockets[0].getsockname()[1]
+    client = await LoopbackClient().connect(DEFAULT_HOST, port)
+    state = await client.request('create', players=2, computers=1)
+    session_id = state['session']
+    while not state['game_over']:
+        if state['current_player'] == 0:
+            await client.request('roll', session=session_id, player=0)
+        event = await client.events.get()
+        if event['event'] == 'finished':
+            break
+        state = await client.request('state', session=session_id)
+    state = await client.request('state', session=session_id)
+    metrics = await client.request('metrics', session=session_id)
+    await client.close()
+    server.close()
+    await server.wait_closed()
+    return state, metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뱀 사다리 게임 다중 세션 호스트")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help="로컬 소켓 서버 실행")
+    serve_parser.add_argument('--host', default=DEFAULT_HOST)
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--bot-delay', type=float, default=DEFAULT_BOT_DELAY, help="컴퓨터 턴 대기(초)")
+    serve_parser.add_argument('--turn-timeout', type=float, help="사람 턴 시간 제한(초)")
+    bench_parser = commands.add_parser('bench', help="컴퓨터끼리 여러 세션 동시 진행")
+    bench_parser.add_argument('--sessions', type=int, default=2000)
+    bench_parser.add_argument('--players', type=int, default=4)
+    bench_parser.add_argument('--snakes', type=int, default=10)
+    bench_parser.add_argument('--ladders', type=int, default=10)
+    bench_parser.add_argument('--seed', type=int)
+    demo_parser = commands.add_parser('demo', help="로컬 클라이언트로 게임 하나 진행")
+    demo_parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        metrics = asyncio.run(run_bench(args.sessions, args.players, args.snakes, args.ladders, args.seed))
+        print(json.dumps(metrics, indent=2))
+    elif args.command == 'demo':
+        state, metrics = asyncio.run(run_loopback_demo(args.port))
+        print(f"승자: 플레이어 {state['winner']}, 말 위치 {state['positions']}")
+        print(json.dumps(metrics, indent=2))
+    else:
+        async def serve_forever():
+            host = GameHost(args.bot_delay, args.turn_timeout)
+            server = await host.serve(args.host, args.port)
+            print(f"{args.host}:{args.port}에서 대기 중")
+            async with server:
+                await server.serve_forever()
+        asyncio.run(serve_forever())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""흡수 마르코프 체인 기반 보드 정확 해석기
+
+주사위(d6) → 뱀/사다리 점프 → BOARD_SIZE 이상에서 흡수되는 규칙을
+희소 전이 행렬로 만들어 기대 턴 수, 종료 턴 분포, 칸별 방문 확률을 계산합니다.
+규칙 변형은 game_engine.MoveTable에서 한 번 굴림의 전이를 가져오며, 한 번 더 굴리기가 있으면
+한 턴(차례가 넘어갈 때까지의 굴림 전체)의 전이로 합성합니다.
+같은 보드와 규칙은 정규화된 보드 해시로 메모이즈되어 두 번 풀지 않습니다.
+"""
+import hashlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from game_engine import BOARD_SIZE, STANDARD_RULES
+
+# 보드 해석 결과 (모든 배열의 인덱스 i는 칸 번호 i + 1에 해당, 마지막 칸은 흡수 상태)
+#   expected_turns: 1번 칸에서 시작했을 때 기대 턴 수
+#   expected_turns_from: 각 칸에서 시작했을 때 기대 턴 수
+#   finish_distribution: finish_distribution[t] = t번째 턴에 끝날 확률
+#   expected_visits: 1번 칸에서 시작했을 때 각 칸에 머무르는 기대 횟수
+#   visit_probabilities: 1번 칸에서 시작했을 때 각 칸을 한 번이라도 밟을 확률
+BoardSolution = namedtuple('BoardSolution', ['board_hash', 'expected_turns', 'expected_turns_from',
+                                             'finish_distribution', 'expected_visits', 'visit_probabilities'])
+
+SOLUTION_CACHE_SIZE = 4096
+FINISH_TAIL_EPSILON = 1e-12  # 남은 확률 질량이 이보다 작아지면 분포 계산 종료
+MAX_FINISH_TURNS = 100000
+VISIT_SOLVE_CHUNK = 256  # 방문 확률 계산 시 한 번에 푸는 열 개수 (메모리 상한)
+DENSE_MAX_STATES = 512  # 이 이하의 작은 보드는 분포 반복 계산에 밀집 행렬을 씁니다 (호출 오버헤드가 더 작음)
+DENSE_BLOCK_TURNS = 32  # 밀집 행렬 경로에서 한 번에 진행하는 턴 수
+
+_solution_cache = OrderedDict()
+
+
+def canonical_board(snakes, ladders, board_size=BOARD_SIZE):
+    """보드를 순서와 무관한 정규형 튜플로 변환합니다."""
+    return (board_size, tuple(sorted(snakes.items())), tuple(sorted(ladders.items())))
+
+
+def board_hash(snakes, ladders, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+    """정규형 보드(와 기본이 아닌 규칙)의 SHA-256 해시(16진 문자열)를 반환합니다."""
+    size, snake_items, ladder_items = canonical_board(snakes, ladders, board_size)
+    text = f"{size}|S:" + ",".join(f"{s}-{e}" for s, e in snake_items)
+    text += "|L:" + ",".join(f"{s}-{e}" for s, e in ladder_items)
+    if rules.names:
+        text += "|R:" + ",".join(rules.names)
+    return hashlib.sha256(text.encode('ascii')).hexdigest()
+
+
+def _roll_matrix(final, rolls, probabilities, board_size, absorbing):
+    """주어진 주사위 값들로 한 번 굴렸을 때의 전이 행렬 (absorbing=True면 흡수 상태가 자기 자신으로)"""
+    squares = np.arange(1, board_size)  # 흡수 상태를 제외한 칸
+    rows = np.repeat(squares - 1, len(rolls))
+    targets = final[squares[:, None], np.asarray(rolls, dtype=np.intp)].ravel()
+    cols = np.minimum(targets, board_size) - 1
+    data = np.tile(np.asarray([probabilities[roll] for roll in rolls]), squares.size)
+    if absorbing:
+        rows = np.append(rows, board_size - 1)
+        cols = np.append(cols, board_size - 1)
+        data = np.append(data, 1.0)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(board_size, board_size))
+
+
+def build_transition_matrix(snakes, ladders, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+    """한 턴의 전이 확률을 담은 희소 행렬(CSR)을 만듭니다.
+
+    상태 i는 칸 번호 i + 1이며, 마지막 상태(board_size)가 흡수 상태입니다.
+    한 번 더 굴리기가 있으면 A(차례가 넘어가는 굴림)와 B(한 번 더 굴리는 굴림)로 나누어
+    제한이 없으면 T = A + B A + B^2 A + ..., 연속 L번 제한이면 T = A + B(A + B(... (A + C)))로 합성합니다.
+    (C는 L번째 굴림이 처음 칸으로 보내는 전이)
+    """
+    table = rules.compile(snakes, ladders, board_size)
+    final = np.frombuffer(table.final, dtype=table.final.typecode).astype(np.intp).reshape(-1, table.stride)
+    probabilities = rules.roll_probabilities()
+    rolls = [roll for roll in range(table.stride) if probabilities[roll]]
+    again_rolls = [roll for roll in rolls if table.again[roll]]
+    if not again_rolls:
+        return _roll_matrix(final, rolls, probabilities, board_size, absorbing=True)
+
+    single = _roll_matrix(final, [roll for roll in rolls if not table.again[roll]], probabilities, board_size,
+                          absorbing=True)
+    repeat = _roll_matrix(final, again_rolls, probabilities, board_size, absorbing=False)
+    again_probability = sum(probabilities[roll] for roll in again_rolls)
+    if rules.streak_limit:
+        to_start = np.zeros(board_size)
+        to_start[:board_size - 1] = again_probability
+        matrix = single + sparse.csr_matrix((to_start, (np.arange(board_size), np.zeros(board_size, dtype=np.intp))),
+                                            shape=(board_size, board_size))
+        for _ in range(rules.streak_limit - 1):
+            matrix = single + repeat @ matrix
+        return matrix.tocsr()
+
+    # 제한이 없으면 남은 확률이 FINISH_TAIL_EPSILON 아래로 떨어질 때까지 급수를 더합니다
+    matrix, term, remaining = single, single, 1.0
+    while remaining > FINISH_TAIL_EPSILON:
+        term = repeat @ term
+        matrix = matrix + term
+        remaining *= again_probability
+    return matrix.tocsr()
+
+
+def _finish_distribution(transient, absorb, start_index):
+    """종료 턴 분포를 행렬-벡터 곱을 반복해 계산합니다."""
+    transient_t = transient.T.tocsr()
+    if transient_t.shape[0] <= DENSE_MAX_STATES:
+        return _finish_distribution_dense(transient_t.toarray(), absorb, start_index)
+    dist = np.zeros(transient.shape[0])
+    dist[start_index] = 1.0
+    finish = [0.0]
+    remaining = 1.0
+    while remaining > FINISH_TAIL_EPSILON and len(finish) <= MAX_FINISH_TURNS:
+        finish.append(float(dist @ absorb))
+        dist = transient_t @ dist
+        remaining = dist.sum()
+    return np.array(finish)
+
+
+def _finish_distribution_dense(transient_t, absorb, start_index):
+    """작은 보드용: DENSE_BLOCK_TURNS 턴을 행렬 곱 두 번으로 한꺼번에 진행합니다.
+
+    block[k] = Q^k * absorb 를 미리 쌓아 두면 분포 벡터 dist에 대해
+    다음 블록의 종료 확률은 block @ dist, 다음 분포는 (Q^T)^블록 @ dist 입니다.
+    """
+    block = np.empty((DENSE_BLOCK_TURNS, absorb.size))
+    block[0] = absorb
+    transient = transient_t.T
+    for k in range(1, DENSE_BLOCK_TURNS):
+        block[k] = transient @ block[k - 1]
+    step = np.linalg.matrix_power(transient_t, DENSE_BLOCK_TURNS)
+
+    dist = np.zeros(absorb.size)
+    dist[start_index] = 1.0
+    finish = [np.zeros(1)]
+    remaining = 1.0
+    turns = 0
+    while remaining > FINISH_TAIL_EPSILON and turns <= MAX_FINISH_TURNS:
+        finish.append(block @ dist)
+        dist = step @ dist
+        remaining = dist.sum()
+        turns += DENSE_BLOCK_TURNS
+    return np.concatenate(finish)
+
+
+def _visit_probabilities(lu, expected_visits, size):
+    """기본 행렬 N의 대각 성분으로 칸별 방문 확률 N[s, j] / N[j, j]를 계산합니다."""
+    diagonal = np.empty(size)
+    for begin in range(0, size, VISIT_SOLVE_CHUNK):
+        end = min(begin + VISIT_SOLVE_CHUNK, size)
+        rhs = np.zeros((size, end - begin))
+        rhs[np.arange(begin, end), np.arange(end - begin)] = 1.0
+        columns = lu.solve(rhs)
+        diagonal[begin:end] = columns[np.arange(begin, end), np.arange(end - begin)]
+    return expected_visits / diagonal
+
+
+def solve_board(snakes, ladders, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+    """보드를 정확히 풀어 BoardSolution을 반환합니다. (보드와 규칙의 해시로 메모이즈)"""
+    key = board_hash(snakes, ladders, board_size, rules)
+    cached = _solution_cache.get(key)
+    if cached is not None:
+        _solution_cache.move_to_end(key)
+        return cached
+
+    matrix = build_transition_matrix(snakes, ladders, board_size, rules)
+    size = board_size - 1
+    transient = matrix[:size, :size].tocsc()
+    absorb = matrix[:size, size].toarray().ravel()
+
+    # (I - Q) t = 1 과 (I - Q)^T v = e_start 를 같은 LU 분해로 풉니다
+    lu = splu((sparse.identity(size, format='csc') - transient).tocsc())
+    turns_from = lu.solve(np.ones(size))
+    start = np.zeros(size)
+    start[0] = 1.0
+    visits = lu.solve(start, trans='T')
+    visit_probs = _visit_probabilities(lu, visits, size)
+
+    # 흡수 상태(마지막 칸)를 붙여서 칸 번호와 인덱스를 맞춥니다
+    turns_from = np.append(turns_from, 0.0)
+    visits = np.append(visits, 1.0)
+    visit_probs = np.append(np.minimum(visit_probs, 1.0), 1.0)
+    finish = _finish_distribution(transient, absorb, 0)
+
+    for array in (turns_from, visits, visit_probs, finish):
+        array.setflags(write=False)
+    solution = BoardSolution(key, float(turns_from[0]), turns_from, finish, visits, visit_probs)
+
+    _solution_cache[key] = solution
+    if len(_solution_cache) > SOLUTION_CACHE_SIZE:
+        _solution_cache.popitem(last=False)
+    return solution
+
+
+def solve_finish(snakes, ladders, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+    """종료 턴 분포와 기대 턴 수만 계산한 BoardSolution (메모이즈하지 않음)
+
+    LU 분해와 방문 확률 계산을 건너뛰므로 expected_rounds, seat_win_probabilities 같은 지표만
+    필요할 때 solve_board보다 빠릅니다. expected_turns_from, expected_visits, visit_probabilities는 None입니다.
+    """
+    matrix = build_transition_matrix(snakes, ladders, board_size, rules)
+    size = board_size - 1
+    absorb = matrix[:size, size].toarray().ravel()
+    finish = _finish_distribution(matrix[:size, :size], absorb, 0)
+    finish.setflags(write=False)
+    expected_turns = float(np.arange(finish.size) @ finish)
+    return BoardSolution(board_hash(snakes, ladders, board_size, rules), expected_turns, None, finish, None, None)
+
+
+def survival(solution):
+    """survival[t] = t턴이 지나도 아직 끝나지 않았을 확률 P(T > t)"""
+    return np.clip(1.0 - np.cumsum(solution.finish_distribution), 0.0, 1.0)
+
+
+def expected_rounds(solution, num_players):
+    """num_players명이 독립적으로 진행할 때 누군가 끝낼 때까지의 기대 라운드 수
+
+    P(라운드 수 > t) = P(T > t)^num_players 이므로 그 합이 기댓값입니다.
+    """
+    return float(np.sum(survival(solution) ** num_players))
+
+
+def seat_win_probabilities(solution, num_players):
+    """자리(턴 순서)별 승리 확률
+
+    k번 자리가 t라운드에 이기려면 앞 자리들은 t턴까지, 뒷 자리들은 t-1턴까지 끝나지 않아야 합니다.
+    """
+    finish = solution.finish_distribution
+    after = survival(solution)
+    before = np.concatenate(([1.0], after[:-1]))
+    return np.array([np.sum(finish * after ** k * before ** (num_players - 1 - k)) for k in range(num_players)])
+
+
+def solve_boards(boards, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+    """(snakes, ladders) 목록을 한꺼번에 풀어 BoardSolution 리스트를 반환합니다."""
+    return [solve_board(snakes, ladders, board_size, rules) for snakes, ladders in boards]
+
+
+def clear_cache():
+    """메모이즈된 해석 결과를 모두 비웁니다."""
+    _solution_cache.clear()
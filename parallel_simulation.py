@@ -0,0 +1,261 @@
+"""멀티코어 배치 시뮬레이션 (공유 메모리 결과 버퍼)
+
+보드 여러 개(코퍼스)를 보드당 games_per_board 판씩 프로세스 풀에서 시뮬레이션합니다.
+게임별 결과(라운드 수, 굴린 횟수, 승리 자리, 뱀/사다리를 밟은 횟수)는 작업자가
+multiprocessing.shared_memory 배열에 직접 쓰므로 결과를 피클로 돌려받지 않습니다.
+게임은 고정 크기 묶음(chunk)으로 나누고 묶음마다 (seed, 보드 번호, 묶음 번호)로 정해진
+난수를 쓰므로 작업자 수와 관계없이 결과가 같습니다.
+
+사용법:
+  python parallel_simulation.py --boards 64 --games 20000 --workers 8
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from game_engine import STANDARD_RULES, generate_board
+from simulation import simulate_games
+
+# 게임별 결과 배열 (이름, 자료형). 승리 자리가 -1이면 끝나지 않았거나 취소된 게임입니다.
+# rounds는 승자가 굴린 라운드 수, turns는 한 번 더 굴리기를 포함한 전체 굴림 수입니다.
+RESULT_FIELDS = (('rounds', np.int32), ('turns', np.int32), ('winners', np.int16),
+                 ('snake_hits', np.int16), ('ladder_hits', np.int16))
+CHUNK_GAMES = 8192  # 작업자 하나가 한 번에 시뮬레이션하는 게임 수 (취소 반응 시간도 이 단위)
+DEFAULT_MAX_ROUNDS = 10000
+
+
+def pool_context():
+    """스레드가 있는 프로세스(Tk, 스프라이트 로더)에서도 안전한 시작 방식"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def chunk_generator(seed, board_index, chunk_index):
+    """묶음별 결정적 NumPy 난수 생성기"""
+    return np.random.default_rng((seed, board_index, chunk_index))
+
+
+def _run_chunk(arrays, job):
+    """묶음 하나를 시뮬레이션하고 결과를 arrays의 [offset, offset + count) 구간에 씁니다."""
+    snakes, ladders, board_index, chunk_index, offset, count, num_players, seed, max_rounds, rules = job
+    result = simulate_games(snakes, ladders, count, num_players, seed=chunk_generator(seed, board_index, chunk_index),
+                            max_rounds=max_rounds, track_hits=True, rules=rules)
+    window = slice(offset, offset + count)
+    arrays['rounds'][window] = result.rounds
+    arrays['turns'][window] = result.turns
+    arrays['winners'][window] = result.winners
+    arrays['snake_hits'][window] = result.snake_hits
+    arrays['ladder_hits'][window] = result.ladder_hits
+    return count
+
+
+def _simulate_chunk(names, total_games, job):
+    """작업자 진입점: 공유 메모리에 붙어 묶음 하나를 쓰고 바로 떼어 냅니다. 반환값은 처리한 게임 수뿐입니다.
+
+    묶음마다 붙는 비용은 시뮬레이션에 비해 작고, 작업자가 풀이 닫힐 때까지 핸들을 쥐고 있지 않습니다.
+    """
+    segments, arrays = [], None
+    try:
+        for field, _ in RESULT_FIELDS:
+            segments.append(shared_memory.SharedMemory(name=names[field]))
+        arrays = {field: np.ndarray(total_games, dtype, buffer=segment.buf)
+                  for (field, dtype), segment in zip(RESULT_FIELDS, segments)}
+        return _run_chunk(arrays, job)
+    finally:
+        arrays = None  # 버퍼를 보는 배열이 남아 있으면 close()가 실패합니다
+        for segment in segments:
+            segment.close()
+
+
+class ParallelSimulation:
+    """코퍼스 시뮬레이션 한 번 (start로 시작, progress로 진행률, cancel로 중단)
+
+    results는 공유 메모리 위의 NumPy 배열이므로 close() 전에만 유효합니다.
+    보드 i의 게임은 [i * games_per_board, (i + 1) * games_per_board) 구간에 있습니다.
+    """
+    def __init__(self, boards, games_per_board, num_players=2, seed=None, workers=None,
+                 chunk_games=CHUNK_GAMES, max_rounds=DEFAULT_MAX_ROUNDS, on_progress=None, rules=STANDARD_RULES):
+        self.boards = list(boards)
+        self.games_per_board = games_per_board
+        self.num_players = num_players
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_games = chunk_games
+        self.max_rounds = max_rounds
+        self.rules = rules
+        self.on_progress = on_progress  # (완료 게임 수, 전체 게임 수), 풀의 콜백 스레드에서 호출됨
+        self.total_games = len(self.boards) * games_per_board
+
+        self.segments = {}
+        self.results = {}
+        for field, dtype in RESULT_FIELDS:
+            segment = shared_memory.SharedMemory(create=True, size=max(1, self.total_games * np.dtype(dtype).itemsize))
+            self.segments[field] = segment
+            self.results[field] = np.ndarray(self.total_games, dtype, buffer=segment.buf)
+            self.results[field].fill(-1 if field == 'winners' else 0)
+
+        self.completed_games = 0
+        self.cancelled = False
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = []
+
+    def jobs(self):
+        """(snakes, ladders, 보드 번호, 묶음 번호, 결과 시작 위치, 게임 수, ...) 작업 목록"""
+        for board_index, (snakes, ladders) in enumerate(self.boards):
+            base = board_index * self.games_per_board
+            for chunk_index, start in enumerate(range(0, self.games_per_board, self.chunk_games)):
+                count = min(self.chunk_games, self.games_per_board - start)
+                yield (snakes, ladders, board_index, chunk_index, base + start, count,
+                       self.num_players, self.seed, self.max_rounds, self.rules)
+
+    def start(self):
+        """모든 묶음을 풀에 넣고 바로 반환합니다. (workers=1이면 스레드 하나에서 실행)"""
+        if self._executor is not None:
+            raise RuntimeError("이미 시작한 시뮬레이션입니다.")
+        self.started_at = time.perf_counter()
+        jobs = list(self.jobs())
+        if self.workers <= 1 or len(jobs) == 1:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            self._futures = [self._executor.submit(_run_chunk, self.results, job) for job in jobs]
+        else:
+            names = {field: segment.name for field, segment in self.segments.items()}
+            self._executor = ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)), mp_context=pool_context())
+            self._futures = [self._executor.submit(_simulate_chunk, names, self.total_games, job) for job in jobs]
+        for future in self._futures:
+            future.add_done_callback(self._chunk_done)
+        return self
+
+    def _chunk_done(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self.completed_games += future.result()
+            completed = self.completed_games
+            if completed == self.total_games:
+                self.finished_at = time.perf_counter()
+        if self.on_progress is not None:
+            self.on_progress(completed, self.total_games)
+
+    def progress(self):
+        """(완료 게임 수, 전체 게임 수)"""
+        return self.completed_games, self.total_games
+
+    @property
+    def done(self):
+        return all(future.done() for future in self._futures)
+
+    def cancel(self):
+        """아직 시작하지 않은 묶음을 취소합니다. (실행 중인 묶음은 끝까지 진행)"""
+        self.cancelled = True
+        for future in self._futures:
+            future.cancel()
+
+    def wait(self, timeout=None):
+        """모든 묶음이 끝날 때까지 기다립니다. 작업자 예외는 여기서 다시 발생합니다."""
+        _, pending = wait_futures(self._futures, timeout)
+        for future in self._futures:
+            if future.done() and not future.cancelled():
+                future.result()
+        return not pending
+
+    def games_per_second(self):
+        end = self.finished_at or time.perf_counter()
+        return self.completed_games / (end - self.started_at) if self.started_at else 0.0
+
+    def board_results(self, field):
+        """field 배열을 (보드 수, 보드당 게임 수) 모양으로 봅니다. (복사 없음)"""
+        return self.results[field].reshape(len(self.boards), self.games_per_board)
+
+    def board_summaries(self):
+        """보드별 요약 (끝난 게임 기준 평균 라운드, 자리별 승률, 평균 뱀/사다리 밟은 횟수)"""
+        winners = self.board_results('winners')
+        finished = winners >= 0
+        counts = np.maximum(finished.sum(axis=1), 1)
+        rounds = self.board_results('rounds')  # 한 번 더 굴리기가 있으면 굴림 수로는 계산할 수 없음
+
+        def finished_mean(values):
+            return np.where(finished, values, 0).sum(axis=1) / counts
+
+        win_rates = np.stack([(winners == seat).sum(axis=1) / counts for seat in range(self.num_players)], axis=1)
+        mean_rounds = finished_mean(rounds)
+        snake_hits = finished_mean(self.board_results('snake_hits'))
+        ladder_hits = finished_mean(self.board_results('ladder_hits'))
+        return [{'finished': int(finished[index].sum()),
+                 'mean_rounds': float(mean_rounds[index]),
+                 'seat_win_rates': win_rates[index].tolist(),
+                 'mean_snake_hits': float(snake_hits[index]),
+                 'mean_ladder_hits': float(ladder_hits[index])} for index in range(len(self.boards))]
+
+    def close(self):
+        """남은 묶음을 취소하고 풀을 닫은 뒤 공유 메모리를 해제합니다."""
+        if self._executor is not None:
+            self.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.results = {}
+        for segment in self.segments.values():
+            segment.close()
+            segment.unlink()
+        self.segments = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def simulate_corpus(boards, games_per_board, num_players=2, seed=None, workers=None, **options):
+    """코퍼스를 끝까지 시뮬레이션하고 결과 배열의 복사본 dict를 반환합니다."""
+    with ParallelSimulation(boards, games_per_board, num_players, seed, workers, **options) as simulation:
+        simulation.start().wait()
+        return {field: array.copy() for field, array in simulation.results.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="보드 코퍼스 멀티코어 시뮬레이션")
+    parser.add_argument('--boards', type=int, default=64)
+    parser.add_argument('--games', type=int, default=20000, help="보드당 게임 수")
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--snakes', type=int, default=10)
+    parser.add_argument('--ladders', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(f"{args.seed}:corpus")
+    boards = [generate_board(args.snakes, args.ladders, rng) for _ in range(args.boards)]
+
+    def report(completed, total):
+        print(f"\r{completed:,}/{total:,}판", end="", file=sys.stderr)
+
+    with ParallelSimulation(boards, args.games, args.players, args.seed, args.workers,
+                            on_progress=report) as simulation:
+        try:
+            simulation.start().wait()
+        except KeyboardInterrupt:
+            simulation.cancel()
+            print("\n취소했습니다.", file=sys.stderr)
+            return 1
+        print(file=sys.stderr)
+        summaries = simulation.board_summaries()
+        print(f"{simulation.total_games:,}판, 작업자 {args.workers}개: 초당 {simulation.games_per_second():,.0f}판")
+        lengths = [summary['mean_rounds'] for summary in summaries]
+        print(f"보드별 평균 라운드: 최소 {min(lengths):.1f}, 최대 {max(lengths):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""게임 기록(리플레이 로그)과 빠른 재생/검증
+
+게임마다 시드 하나로 보드용/주사위용 난수 생성기를 만들고, 게임을 작은 이진 파일로 기록합니다.
+
+파일 형식 (리틀 엔디언):
+  헤더   magic 'LCRP', 버전(B), 보드 크기(H), 플레이어 수(H), 시드(Q), 뱀 수(H), 사다리 수(H), 규칙 비트(B)
+  보드   (시작 칸 H, 끝 칸 H) x 뱀 수, 그다음 사다리 수
+  주사위 한 바이트에 두 번씩 (앞 굴림이 상위 4비트, 0은 채움값)
+
+헤더와 보드는 게임 시작 시 쓰고, 주사위는 굴릴 때마다 이어 씁니다.
+재생은 REPLAY_CHECKPOINT_TURNS 턴마다 말 위치를 저장해 두고 그 사이는 이동을 다시 적용하므로
+플레이어가 많아도 메모리를 적게 쓰면서 어느 턴이든 바로 불러올 수 있습니다.
+
+사용법:
+  python replay_log.py verify 기록파일...
+  python replay_log.py show 기록파일 [--turn N]
+"""
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from game_engine import BOARD_SIZE, STANDARD_RULES, RuleSet
+
+MAGIC = b'LCRP'
+FORMAT_VERSION = 1
+REPLAY_SUFFIX = '.lcr'
+REPLAY_CHECKPOINT_TURNS = 64  # 재생 시 말 위치 전체를 저장하는 간격
+DEFAULT_REPLAY_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "ladderandchute", "replays")
+
+_HEADER = struct.Struct('<4sBHHQHHB')
+_PAIR = struct.Struct('<HH')
+
+# 디코딩한 게임 기록 (rolls는 주사위 값의 bytes, rules는 game_engine.RuleSet)
+GameRecord = namedtuple('GameRecord', ['seed', 'board_size', 'num_players', 'snakes', 'ladders', 'rolls', 'rules'],
+                        defaults=(STANDARD_RULES,))
+
+
+class ReplayError(ValueError):
+    """기록 파일이 손상되었거나 규칙/시드와 맞지 않을 때 발생합니다."""
+
+
+def new_seed():
+    """새 게임 시드 (64비트)"""
+    return random.randrange(2 ** 64)
+
+
+def game_rngs(seed):
+    """시드에서 (보드용, 주사위용) 난수 생성기를 만듭니다.
+
+    두 흐름을 나누어 두었으므로 보드를 다른 방법(목표 길이 탐색 등)으로 정해도
+    주사위 순서는 시드만으로 다시 만들 수 있습니다.
+    """
+    return random.Random(f"{seed}:board"), random.Random(f"{seed}:dice")
+
+
+def replay_dir():
+    """기록 파일 폴더 (LADDER_REPLAY_DIR 환경 변수로 변경 가능)"""
+    return os.environ.get("LADDER_REPLAY_DIR", DEFAULT_REPLAY_DIR)
+
+
+def replay_path(seed, directory=None):
+    """기본 기록 파일 경로 (시작 시각 + 시드)"""
+    if directory is None:
+        directory = replay_dir()
+    return os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed:016x}{REPLAY_SUFFIX}")
+
+
+def encode_header(seed, snakes, ladders, num_players, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+    """헤더와 보드 부분을 bytes로 만듭니다."""
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, board_size, num_players, seed, len(snakes), len(ladders),
+                          rules.flags)]
+    parts.extend(_PAIR.pack(start, end) for start, end in sorted(snakes.items()))
+    parts.extend(_PAIR.pack(start, end) for start, end in sorted(ladders.items()))
+    return b''.join(parts)
+
+
+def pack_rolls(rolls):
+    """주사위 값 목록을 한 바이트에 두 개씩 묶습니다."""
+    rolls = bytes(rolls)
+    if len(rolls) % 2:
+        rolls += b'\0'
+    return bytes((rolls[i] << 4) | rolls[i + 1] for i in range(0, len(rolls), 2))
+
+
+def unpack_rolls(data):
+    """pack_rolls의 역변환 (채움값 0은 버림)"""
+    rolls = bytearray(len(data) * 2)
+    rolls[0::2] = bytes(byte >> 4 for byte in data)
+    rolls[1::2] = bytes(byte & 0x0F for byte in data)
+    if rolls and rolls[-1] == 0:
+        del rolls[-1]
+    return bytes(rolls)
+
+
+def encode_game(record):
+    """GameRecord 하나를 완결된 기록 파일 내용으로 만듭니다."""
+    return encode_header(record.seed, record.snakes, record.ladders, record.num_players,
+                         record.board_size, record.rules) + pack_rolls(record.rolls)
+
+
+def decode_game(data):
+    """기록 파일 내용을 GameRecord로 읽습니다."""
+    if len(data) < _HEADER.size:
+        raise ReplayError("기록이 너무 짧습니다.")
+    magic, version, board_size, num_players, seed, num_snakes, num_ladders, flags = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError("리플레이 기록 파일이 아닙니다.")
+    if version != FORMAT_VERSION:
+        raise ReplayError(f"지원하지 않는 기록 버전입니다: {version}")
+    try:
+        rules = RuleSet.from_flags(flags)
+    except ValueError as e:
+        raise ReplayError(str(e)) from None
+
+    offset = _HEADER.size
+    board_end = offset + _PAIR.size * (num_snakes + num_ladders)
+    if len(data) < board_end:
+        raise ReplayError("보드 정보가 잘렸습니다.")
+    pairs = list(_PAIR.iter_unpack(data[offset:board_end]))
+    snakes = dict(pairs[:num_snakes])
+    ladders = dict(pairs[num_snakes:])
+    return GameRecord(seed, board_size, num_players, snakes, ladders, unpack_rolls(data[board_end:]), rules)
+
+
+def read_game(path):
+    with open(path, 'rb') as f:
+        return decode_game(f.read())
+
+
+class ReplayWriter:
+    """게임 진행 중에 주사위를 이어 쓰는 기록기 (with 문 지원)
+
+    주사위 두 개가 모일 때마다 한 바이트를 쓰고, close()에서 남은 하나를 채움값과 함께 씁니다.
+    """
+    def __init__(self, path, seed, snakes, ladders, num_players, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'wb')
+        self.file.write(encode_header(seed, snakes, ladders, num_players, board_size, rules))
+        self.pending = None  # 아직 바이트를 채우지 못한 앞 굴림
+        self.roll_count = 0
+
+    def record(self, roll):
+        if not 1 <= roll <= 15:
+            raise ValueError(f"기록할 수 없는 주사위 값입니다: {roll}")
+        self.roll_count += 1
+        if self.pending is None:
+            self.pending = roll
+            return
+        self.file.write(bytes(((self.pending << 4) | roll,)))
+        self.pending = None
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if self.file is None:
+            return
+        if self.pending is not None:
+            self.file.write(bytes((self.pending << 4,)))
+            self.pending = None
+        self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Replay:
+    """기록을 재생해 모든 턴의 상태를 미리 계산해 둔 객체
+
+    턴 t의 상태는 t번 주사위를 굴린 뒤의 상태입니다. (t=0은 시작 상태)
+    rounds는 지금까지 진행한 라운드 수입니다. (한 번 더 굴리기는 같은 라운드)
+    """
+    def __init__(self, record):
+        self.record = record
+        rules = record.rules
+        num_players = record.num_players
+        positions = [1] * num_players
+        self.checkpoints = [tuple(positions)]  # checkpoints[k] = k * REPLAY_CHECKPOINT_TURNS턴 뒤 말 위치
+        self.moves = [None]
+        self.winner = None
+        table = rules.compile(record.snakes, record.ladders, record.board_size)
+        player = 0
+        streak = 0
+        passes = 0  # 차례가 넘어간 횟수
+        for turn, roll in enumerate(record.rolls, 1):
+            if self.winner is not None:
+                raise ReplayError(f"{turn}번째 굴림: 게임이 끝난 뒤에도 기록이 이어집니다.")
+            if not rules.min_roll <= roll <= rules.max_roll:
+                raise ReplayError(f"{turn}번째 굴림: 잘못된 주사위 값 {roll}")
+            move, streak = table.move(player, positions[player], roll, streak)
+            positions[player] = move.final
+            self.moves.append(move)
+            if turn % REPLAY_CHECKPOINT_TURNS == 0:
+                self.checkpoints.append(tuple(positions))
+            if move.won:
+                self.winner = player
+            elif not move.again:
+                player = (player + 1) % num_players
+                passes += 1
+        self.final_player = player
+        self.rounds = passes // num_players + 1
+
+    @property
+    def num_turns(self):
+        return len(self.moves) - 1
+
+    @property
+    def finished(self):
+        return self.winner is not None
+
+    def positions_at(self, turn):
+        """turn번 굴린 뒤 말 위치 튜플 (가장 가까운 이전 체크포인트에서 이동을 다시 적용)"""
+        base = turn // REPLAY_CHECKPOINT_TURNS
+        positions = self.checkpoints[base]
+        start = base * REPLAY_CHECKPOINT_TURNS + 1
+        if start > turn:
+            return positions
+        positions = list(positions)
+        for move in self.moves[start:turn + 1]:
+            positions[move.player] = move.final
+        return tuple(positions)
+
+    def move_at(self, turn):
+        """turn번째 굴림의 MoveResult (turn=0이면 None)"""
+        return self.moves[turn]
+
+    def current_player_at(self, turn):
+        """turn번 굴린 뒤 차례인 플레이어 (게임이 끝났으면 승자)"""
+        if turn == self.num_turns:
+            return self.final_player
+        return self.moves[turn + 1].player
+
+
+def verify_game(record, check_dice=True):
+    """기록을 재생해 규칙 위반이 없는지, 주사위가 시드와 맞는지 확인하고 Replay를 반환합니다."""
+    replay = Replay(record)
+    if check_dice:
+        _, dice_rng = game_rngs(record.seed)
+        for turn, roll in enumerate(record.rolls, 1):
+            if roll != record.rules.roll(dice_rng):
+                raise ReplayError(f"{turn}번째 굴림이 시드 {record.seed}의 주사위와 다릅니다.")
+    return replay
+
+
+def verify_files(paths, check_dice=True):
+    """여러 기록 파일을 검증하여 (통과 수, [(경로, 오류)]) 를 반환합니다."""
+    passed = 0
+    failures = []
+    for path in paths:
+        try:
+            verify_game(read_game(path), check_dice)
+            passed += 1
+        except (OSError, ReplayError) as e:
+            failures.append((path, e))
+    return passed, failures
+
+
+def _expand_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(REPLAY_SUFFIX))
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뱀 사다리 게임 기록 재생/검증")
+    commands = parser.add_subparsers(dest='command', required=True)
+    verify_parser = commands.add_parser('verify', help="기록 파일(또는 폴더) 검증")
+    verify_parser.add_argument('paths', nargs='+')
+    verify_parser.add_argument('--no-dice-check', action='store_true', help="주사위와 시드 대조 생략")
+    show_parser = commands.add_parser('show', help="기록의 특정 턴 상태 출력")
+    show_parser.add_argument('path')
+    show_parser.add_argument('--turn', type=int, help="출력할 턴 (기본: 마지막)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'verify':
+        paths = list(_expand_paths(args.paths))
+        start = time.perf_counter()
+        passed, failures = verify_files(paths, not args.no_dice_check)
+        elapsed = time.perf_counter() - start
+        for path, error in failures:
+            print(f"실패 {path}: {error}")
+        rate = len(paths) / elapsed if elapsed > 0 else float('inf')
+        print(f"{passed}/{len(paths)}개 통과 ({elapsed * 1000:.1f} ms, 초당 {rate:,.0f}개)")
+        return 1 if failures else 0
+
+    replay = Replay(read_game(args.path))
+    turn = replay.num_turns if args.turn is None else max(0, min(args.turn, replay.num_turns))
+    record = replay.record
+    print(f"시드 {record.seed}, 플레이어 {record.num_players}명, 뱀 {len(record.snakes)}개, "
+          f"사다리 {len(record.ladders)}개, 총 {replay.num_turns}턴 ({record.rules.describe()})")
+    move = replay.move_at(turn)
+    if move is not None:
+        print(f"{turn}턴: 플레이어 {move.player + 1}이(가) {move.roll}을(를) 굴려 {move.final}에 도착")
+    print("말 위치:", ", ".join(f"P{i + 1}={square}" for i, square in enumerate(replay.positions_at(turn))))
+    if replay.finished and turn == replay.num_turns:
+        print(f"승자: 플레이어 {replay.winner + 1}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""NumPy 기반 배치 몬테카를로 시뮬레이터
+
+수천~수백만 판의 게임을 배열 연산으로 동시에 진행하여
+보드별 게임 길이 분포와 자리(순서)별 승률을 추정합니다.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from game_engine import BOARD_SIZE, DICE_SIDES, STANDARD_RULES, build_jump_table
+
+# 배치 시뮬레이션 결과
+#   rounds: 승자가 주사위를 굴린 횟수 (게임 길이, 라운드 단위)
+#   turns: 게임 전체에서 굴린 주사위 횟수 (한 번 더 굴리기 포함)
+#   winners: 승리한 자리 인덱스 (max_rounds 안에 끝나지 않으면 -1)
+#   landed_counts / final_counts: track_squares=True일 때 칸별로 주사위 도착 / 점프 후 머문 횟수
+#   snake_hits / ladder_hits: track_hits=True일 때 게임별로 뱀 / 사다리를 밟은 횟수 (모든 플레이어 합)
+SimulationResult = namedtuple('SimulationResult', ['rounds', 'turns', 'winners', 'num_players',
+                                                   'landed_counts', 'final_counts', 'snake_hits', 'ladder_hits'],
+                              defaults=(None, None, None, None))
+
+
+def build_jump_array(snakes, ladders, board_size=BOARD_SIZE):
+    """game_engine.build_jump_table과 같은 점프 표를 NumPy 배열(int32)로 만듭니다."""
+    table = build_jump_table(snakes, ladders, board_size)
+    return np.frombuffer(table, dtype=table.typecode).astype(np.int32)
+
+
+def move_table_arrays(table):
+    """MoveTable의 (도착 칸, 최종 칸, 한 번 더 굴림) 표를 NumPy 배열로 바꿉니다."""
+    landed = np.frombuffer(table.landed, dtype=table.landed.typecode).astype(np.int32)
+    final = np.frombuffer(table.final, dtype=table.final.typecode).astype(np.int32)
+    return landed, final, np.frombuffer(table.again, dtype=np.uint8).astype(bool)
+
+
+def roll_dice(rng, rules, size):
+    """규칙의 주사위 개수만큼 굴린 합 (주사위 하나면 integers 한 번)"""
+    rolls = rng.integers(1, DICE_SIDES + 1, size=size, dtype=np.int32)
+    for _ in range(rules.dice - 1):
+        rolls += rng.integers(1, DICE_SIDES + 1, size=size, dtype=np.int32)
+    return rolls
+
+
+def simulate_games(snakes, ladders, num_games, num_players=2, seed=None, max_rounds=10000, board_size=BOARD_SIZE,
+                   track_squares=False, track_hits=False, rules=STANDARD_RULES):
+    """num_games 판을 동시에 진행하고 SimulationResult를 반환합니다.
+
+    track_squares=True이면 칸별 도착/머문 횟수도 집계합니다. (라운드마다 bincount 두 번이 추가됨)
+    track_hits=True이면 게임별 뱀/사다리를 밟은 횟수도 집계합니다.
+    이동은 rules를 컴파일한 MoveTable 조회 한 번이며, 한 번 더 굴리기가 있는 규칙이면
+    자리마다 더 굴릴 게임이 남지 않을 때까지 같은 자리를 반복합니다.
+    """
+    rng = np.random.default_rng(seed)
+    table = rules.compile(snakes, ladders, board_size)
+    landed_table, final_table, again_table = move_table_arrays(table)
+    stride = table.stride
+    extra_turns = rules.extra_turn
+    streak_limit = rules.streak_limit
+
+    rounds = np.zeros(num_games, dtype=np.int32)
+    turns = np.zeros(num_games, dtype=np.int32)
+    winners = np.full(num_games, -1, dtype=np.int16)
+    num_squares = board_size + rules.max_roll + 1
+    landed_counts = np.zeros(num_squares, dtype=np.int64) if track_squares else None
+    final_counts = np.zeros(num_squares, dtype=np.int64) if track_squares else None
+    snake_hits = np.zeros(num_games, dtype=np.int16) if track_hits else None
+    ladder_hits = np.zeros(num_games, dtype=np.int16) if track_hits else None
+
+    # 진행 중인 게임만 보관합니다 (자리별 행이 연속 메모리가 되도록 [자리, 게임] 순서)
+    # 라운드 중 끝난 게임은 alive 마스크로 제외하고, 압축은 라운드가 끝날 때 한 번만 합니다
+    # 한 번 더 굴린 횟수 (active와 같은 순서, 한 번 더 굴리기가 있는 규칙에서만)
+    active = np.arange(num_games)
+    positions = np.ones((num_players, num_games), dtype=np.int32)
+    bonus = np.zeros(num_games, dtype=np.int32) if extra_turns else None
+    for round_index in range(1, max_rounds + 1):
+        if active.size == 0:
+            break
+        alive = np.ones(active.size, dtype=bool)
+        for seat in range(num_players):
+            rolling = alive  # 이 자리가 이번에 굴리는 게임
+            streak = 0
+            while True:
+                rolls = roll_dice(rng, rules, active.size)
+                index = positions[seat] * stride + rolls
+                landed = landed_table[index]
+                row = final_table[index]
+                hit_mask = rolling
+                if extra_turns:
+                    again = again_table[rolls] & rolling
+                    streak = np.where(again, streak + 1, 0)
+                    if streak_limit:
+                        reset = streak >= streak_limit
+                        landed[reset] = positions[seat][reset]
+                        row[reset] = 1
+                        again &= ~reset
+                        hit_mask = rolling & ~reset  # 처음 칸으로 보낸 이동은 도착/뱀으로 세지 않음 (BoardStats와 같음)
+                finished = (row >= board_size) & rolling
+                if track_squares:
+                    landed_counts += np.bincount(landed[hit_mask], minlength=num_squares)
+                    final_counts += np.bincount(row[hit_mask], minlength=num_squares)
+                if track_hits:
+                    # active는 중복이 없으므로 팬시 인덱싱 += 로 충분합니다
+                    snake_hits[active[(row < landed) & hit_mask]] += 1
+                    ladder_hits[active[(row > landed) & hit_mask]] += 1
+                if extra_turns:
+                    np.copyto(positions[seat], np.minimum(row, board_size), where=rolling)
+                else:
+                    np.minimum(row, board_size, out=positions[seat])
+
+                if finished.any():
+                    done = active[finished]
+                    winners[done] = seat
+                    rounds[done] = round_index
+                    turns[done] = (round_index - 1) * num_players + seat + 1
+                    if extra_turns:
+                        turns[done] += bonus[finished]
+                    alive &= ~finished
+                if not extra_turns:
+                    break
+                rolling = again & alive
+                if not rolling.any():
+                    break
+                bonus += rolling
+        if not alive.all():
+            active = active[alive]
+            positions = positions[:, alive]
+            if extra_turns:
+                bonus = bonus[alive]
+
+    return SimulationResult(rounds, turns, winners, num_players, landed_counts, final_counts,
+                            snake_hits, ladder_hits)
+
+
+def summarize(result):
+    """시뮬레이션 결과에서 게임 길이 분포와 자리별 승률을 계산합니다."""
+    finished = result.winners >= 0
+    rounds = result.rounds[finished]
+    num_finished = int(finished.sum())
+    win_counts = np.bincount(result.winners[finished], minlength=result.num_players)
+    return {
+        'games': int(result.winners.size),
+        'finished': num_finished,
+        'mean_rounds': float(rounds.mean()) if num_finished else float('nan'),
+        'std_rounds': float(rounds.std()) if num_finished else float('nan'),
+        'round_distribution': np.bincount(rounds) / max(num_finished, 1),
+        'win_rates': win_counts / max(num_finished, 1),
+    }
+
+
+def estimate_board(snakes, ladders, num_games=100000, num_players=2, seed=None, board_size=BOARD_SIZE):
+    """한 보드의 게임 길이/승률 분포를 추정하여 요약 딕셔너리를 반환합니다."""
+    return summarize(simulate_games(snakes, ladders, num_games, num_players, seed, board_size=board_size))
@@ -1,33 +1,68 @@
 
 import tkinter as tk
-from tkinter import messagebox
-import random
-import time
-import requests
-import io
-from PIL import Image, ImageTk
-
-# --- 게임 설정 ---
-BOARD_SIZE = 100
-GRID_DIM = 10
+from tkinter import filedialog, messagebox
+import math
+import os
+import queue
+import threading
+
+from animation import FRAME_MS, AnimationScheduler, PathAnimation
+from board_layout import BoardLayout, sprite_size
+from board_stats import BoardStats
+from board_view import BoardView
+from game_engine import BOARD_SIZE, GRID_DIM, RULE_VARIANTS, STANDARD_RULES, RuleSet, generate_board
+from replay_log import (REPLAY_SUFFIX, Replay, ReplayError, ReplayWriter, game_rngs, new_seed, read_game, replay_dir,
+                        replay_path)
+from sprite_cache import SpriteCache
+from sprite_loader import HEAVY_MODULES, PhotoImageCache, SpriteLoader, warm_up
+from tracing import traced, tracer
 
 # --- GUI 설정 ---
 CELL_SIZE = 60  # 50에서 60으로 증가
 CANVAS_WIDTH = CANVAS_HEIGHT = GRID_DIM * CELL_SIZE
-PLAYER_COLORS = ['#FF6347', '#4682B4', '#32CD32', '#FFD700']
+UI_QUEUE_POLL_MS = 50  # 작업 스레드 결과를 UI 스레드에서 확인하는 주기
+MOVE_STEP_MS = 80  # 말이 한 칸 이동하는 데 걸리는 시간 (0이면 애니메이션 없음)
+COMPUTER_TURN_DELAY_MS = 1000  # 컴퓨터 턴 시작 전 대기 시간
+FAST_FORWARD_FRAME_MS = 50  # 빨리 감기 중 화면을 갱신하는 최소 간격 (이보다 빠르면 프레임을 솎아 냄)
+BOARD_BACKGROUND_IMAGE = True  # 칸/번호를 캐시된 배경 이미지 하나로 그림 (False면 캔버스 아이템 200개)
+
+# --- 창 크기 조절 ---
+# 연속된 <Configure>는 크기만 기록하고 프레임마다 한 번만 배치를 계산해 미리보기로 그립니다.
+# 크기가 RESIZE_SETTLE_MS 동안 멈추면 배경과 스프라이트를 새 셀 크기로 한 번 다시 만듭니다.
+WINDOW_ASPECT = (5, 6)  # 창 너비:높이 (아래 컨트롤 UI 몫 포함, 창 관리자가 유지)
+MIN_WINDOW_HEIGHT = 400
+RESIZE_FRAME_MS = FRAME_MS
+RESIZE_SETTLE_MS = 200
 
 # --- 기본 게임 설정 (초기 설정 화면의 기본값) ---
 DEFAULT_NUM_SNAKES = 10
 DEFAULT_NUM_LADDERS = 10
 DEFAULT_NUM_PLAYERS = 2
 DEFAULT_NUM_COMPUTER_PLAYERS = 1
+MAX_PLAYERS = 500  # 관전/교실 모드 (CLUSTER_MIN_PLAYERS명 이상이면 말을 칸별 더미로 그림)
+MAX_NAMED_PLAYERS = 4  # 이름을 입력받는 사람 플레이어 수 (나머지는 기본 이름)
+SPRITE_POOL_SIZE = 16  # 불러오는 포켓몬 수 (플레이어가 더 많으면 돌아가며 같이 씀)
+WIN_LABEL_TOP = 4  # 플레이어가 이보다 많으면 승리 확률 상위 이만큼만 표시
+DEFAULT_TARGET_LENGTH = 0  # 목표 기대 게임 길이(라운드), 0이면 무작위 보드
+TARGET_LENGTH_TOLERANCE = 2.0
+SKIP_TO_RESULT = 0  # 진행 속도: 컴퓨터 턴을 그리지 않고 결과까지 바로 진행
+SPEED_CHOICES = {"×1 (보통)": 1, "×4": 4, "×16": 16, "×64": 64, "결과로 건너뛰기": SKIP_TO_RESULT}
+DEFAULT_SPEED = 1
+BOARD_SEARCH_CANDIDATES = 4096
+STORE_RESCORE_CANDIDATES = 64  # 저장소 길이 지표와 인원수가 다를 때 다시 계산해 보는 보드 수 (보드당 약 2ms)
+
+# --- 시작 속도 ---
+# 설정 화면을 띄운 뒤 사용자가 입력하는 동안 무거운 모듈을 미리 가져옵니다 (LADDER_WARM_UP=0이면 끔)
+WARM_UP_ENABLED = os.environ.get("LADDER_WARM_UP", "1") != "0"
+WARM_UP_MODULES = HEAVY_MODULES + ("board_search", "board_store", "win_probability")
 
 class SetupPanel:
     """메인 윈도우에 합쳐져서 표시되는 게임 설정 패널"""
-    def __init__(self, parent, on_submit, on_cancel):
+    def __init__(self, parent, on_submit, on_cancel, on_replay=None):
         self.parent = parent
         self.on_submit = on_submit
         self.on_cancel = on_cancel
+        self.on_replay = on_replay
         
         # 설정 다이얼로그 크기를 게임 화면과 동일하게 설정
         parent.geometry(f"{CANVAS_WIDTH + 40}x{int((CANVAS_WIDTH + 40) * 1.2)}")
@@ -44,23 +79,29 @@ class SetupPanel:
 
         tk.Label(player_frame, text="총 플레이어 수:").grid(row=0, column=0, sticky="w", pady=5)
         self.total_players_var = tk.IntVar(value=DEFAULT_NUM_PLAYERS)
-        total_players_spinbox = tk.Spinbox(player_frame, from_=2, to=4, textvariable=self.total_players_var,
+        total_players_spinbox = tk.Spinbox(player_frame, from_=2, to=MAX_PLAYERS, textvariable=self.total_players_var,
                                            width=10, command=self.validate_players)
         total_players_spinbox.grid(row=0, column=1, pady=5, padx=(10, 0))
 
         tk.Label(player_frame, text="컴퓨터 플레이어 수:").grid(row=1, column=0, sticky="w", pady=5)
         self.computer_players_var = tk.IntVar(value=DEFAULT_NUM_COMPUTER_PLAYERS)
-        self.computer_players_spinbox = tk.Spinbox(player_frame, from_=0, to=3,
+        self.computer_players_spinbox = tk.Spinbox(player_frame, from_=0, to=MAX_PLAYERS,
                                                    textvariable=self.computer_players_var,
                                                    width=10, command=self.validate_players)
         self.computer_players_spinbox.grid(row=1, column=1, pady=5, padx=(10, 0))
 
+        tk.Label(player_frame, text="컴퓨터 진행 속도:").grid(row=2, column=0, sticky="w", pady=5)
+        speed_labels = list(SPEED_CHOICES)
+        self.speed_var = tk.StringVar(value=next(label for label, speed in SPEED_CHOICES.items()
+                                                 if speed == DEFAULT_SPEED))
+        tk.OptionMenu(player_frame, self.speed_var, *speed_labels).grid(row=2, column=1, pady=5, padx=(10, 0), sticky="w")
+
         # 플레이어 이름 설정
         names_frame = tk.LabelFrame(self.frame, text="플레이어 이름 설정", padx=10, pady=10)
         names_frame.pack(padx=10, pady=10, fill="x")
         
         self.player_name_entries = []
-        for i in range(4):  # 최대 4명
+        for i in range(MAX_NAMED_PLAYERS):  # 나머지 사람 플레이어는 기본 이름
             tk.Label(names_frame, text=f"플레이어 {i+1}:").grid(row=i, column=0, sticky="w", pady=3)
             entry = tk.Entry(names_frame, width=20)
             entry.insert(0, f"플레이어 {i+1}")
@@ -81,6 +122,25 @@ class SetupPanel:
         self.snakes_var = tk.IntVar(value=DEFAULT_NUM_SNAKES)
         tk.Spinbox(elements_frame, from_=5, to=20, textvariable=self.snakes_var, width=10).grid(row=1, column=1, pady=5, padx=(10, 0))
 
+        tk.Label(elements_frame, text="목표 게임 길이 (0=무작위):").grid(row=2, column=0, sticky="w", pady=5)
+        self.target_length_var = tk.IntVar(value=DEFAULT_TARGET_LENGTH)
+        tk.Spinbox(elements_frame, from_=0, to=60, textvariable=self.target_length_var, width=10).grid(row=2, column=1, pady=5, padx=(10, 0))
+
+        # 보드 저장소에서 뱀/사다리 수, 규칙, 목표 길이에 맞는 보드를 골라 시작 (없으면 새로 만듦)
+        self.use_store_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(elements_frame, text="저장소에서 보드 고르기", variable=self.use_store_var).grid(
+            row=3, column=0, columnspan=2, sticky="w")
+
+        # 규칙 변형 (game_engine.RULE_VARIANTS에 있는 만큼 체크박스)
+        rules_frame = tk.LabelFrame(self.frame, text="규칙 변형", padx=10, pady=10)
+        rules_frame.pack(padx=10, pady=10, fill="x")
+
+        self.rule_vars = {}
+        for index, variant in enumerate(RULE_VARIANTS.values()):
+            self.rule_vars[variant.name] = tk.BooleanVar(value=False)
+            tk.Checkbutton(rules_frame, text=variant.label, variable=self.rule_vars[variant.name]).grid(
+                row=index // 2, column=index % 2, sticky="w", padx=(0, 10))
+
         # 경고 레이블
         self.warning_label = tk.Label(self.frame, text="", fg="red")
         self.warning_label.pack(pady=(0, 5))
@@ -90,6 +150,8 @@ class SetupPanel:
         button_frame.pack(pady=10)
 
         tk.Button(button_frame, text="시작", command=self.ok_clicked, width=12).pack(side=tk.LEFT, padx=5)
+        if callable(on_replay):
+            tk.Button(button_frame, text="기록 재생", command=self.on_replay, width=12).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="취소", command=self.cancel_clicked, width=12).pack(side=tk.LEFT, padx=5)
 
         # 초기 검증
@@ -105,8 +167,8 @@ class SetupPanel:
         total = self.total_players_var.get()
         computer = self.computer_players_var.get()
 
-        if computer >= total:
-            self.warning_label.config(text="컴퓨터 플레이어 수는 총 플레이어 수보다 작아야 합니다.")
+        if computer > total:
+            self.warning_label.config(text="컴퓨터 플레이어 수는 총 플레이어 수보다 많을 수 없습니다.")
             valid = False
         else:
             self.warning_label.config(text="")
@@ -133,7 +195,7 @@ class SetupPanel:
         human_players = total_players - computer_players
         
         player_names = []
-        for i in range(human_players):
+        for i in range(min(human_players, MAX_NAMED_PLAYERS)):
             name = self.player_name_entries[i].get().strip()
             if not name:
                 name = f"플레이어 {i+1}"
@@ -144,6 +206,10 @@ class SetupPanel:
             'computer_players': self.computer_players_var.get(),
             'ladders': self.ladders_var.get(),
             'snakes': self.snakes_var.get(),
+            'target_length': self.target_length_var.get(),
+            'use_store': self.use_store_var.get(),
+            'speed': SPEED_CHOICES[self.speed_var.get()],
+            'rules': RuleSet.from_names([name for name, var in self.rule_vars.items() if var.get()]),
             'player_names': player_names
         }
         # 패널은 콜백에서 제거
@@ -162,33 +228,75 @@ class SnakeAndLadderGame:
         self.root.resizable(True, True)  # 창 크기 조절 가능하도록 변경
 
         self.player_images = [] # 포켓몬 이미지를 저장할 리스트
+        self.player_image_data = [] # 원본 PIL 이미지 (아직 도착하지 않은 자리는 None)
+        self.sprite_cache = SpriteCache.from_environment()  # 포켓몬 API/이미지 디스크 캐시
+        self.sprite_loader = SpriteLoader(self.sprite_cache)
+        self.photo_cache = PhotoImageCache()  # (스프라이트, 크기)별 리사이즈 결과
+
+        # 작업 스레드 -> UI 스레드 콜백 전달용 큐
+        self.ui_queue = queue.Queue()
+        self.root.after(UI_QUEUE_POLL_MS, self.process_ui_queue)
         
         # 게임 설정 변수 (초기값은 기본값 사용)
         self.num_players = DEFAULT_NUM_PLAYERS
         self.num_computer_players = DEFAULT_NUM_COMPUTER_PLAYERS
         self.num_snakes = DEFAULT_NUM_SNAKES
         self.num_ladders = DEFAULT_NUM_LADDERS
+        self.target_length = DEFAULT_TARGET_LENGTH
+        self.use_store = False  # 보드 저장소에서 보드를 고를지
+        self.board_store = None  # 처음 쓸 때 여는 board_store.BoardStore
+        self.speed = DEFAULT_SPEED  # 컴퓨터 진행 속도 배율 (SKIP_TO_RESULT면 결과로 건너뜀)
+        self.rules = STANDARD_RULES  # 규칙 변형 묶음 (보드가 정해지면 move_table로 컴파일)
+        self.move_table = None
+        self.roll_streak = 0  # 현재 플레이어가 한 번 더 굴리기를 이어 온 횟수
+        self.board_search_token = None  # 진행 중인 보드 탐색 식별용
         self.player_names = []  # 플레이어 이름 목록
 
+        # 게임별 시드와 기록 (보드/주사위 난수는 시드에서 만듦)
+        self.game_seed = None
+        self.board_rng = None
+        self.dice_rng = None
+        self.replay_writer = None  # 진행 중인 게임의 기록기
+        self.replay = None  # 기록 재생 모드에서 불러온 Replay
+        self.replay_scale = None
+
+        # 보드별 누적 통계 (같은 보드로 다시 하면 이어서 집계)
+        self.board_stats = {}
+        self.stats = None
+        self.turn_passes = 0  # 차례가 넘어간 횟수 (라운드 수 계산용)
+        self.heatmap_var = tk.BooleanVar(value=False)
+        self.win_tables = {}  # 보드와 규칙별 승리 확률 표 (종료 턴 분포는 보드마다 한 번만 계산)
+        self.win_table = None
+
         # 게임 UI 위젯 (초기에는 없음)
         self.canvas = None
+        self.board_view = None  # 캔버스 아이템을 유지하며 갱신하는 렌더러
+        self.layout = None  # 칸 -> 좌표 배치표 (그리기/애니메이션/클릭 판정 공용)
         self.canvas_frame = None
         self.control_frame = None
         self.dice_label = None
         self.roll_button = None
+        self.status_frame = None
         self.status_label = None
+        self.win_label = None
 
         # 설정 패널 핸들
         self.setup_panel = None
         
-        # 종횡비 고정을 위한 변수
-        self.aspect_ratio_locked = False
-        self.target_aspect_ratio = 1.0  # 1:1 (정사각형)
-        self.resize_after_id = None
-        self.canvas_resize_after_id = None  # 캔버스 리사이즈 지연용
+        # 창 크기 조절 (프레임마다 한 번 반영, 멈추면 한 번 마무리)
+        self.pending_canvas_size = None
+        self.resize_frame_after_id = None
+        self.resize_settle_after_id = None
+
+        # 이동 애니메이션
+        self.animator = AnimationScheduler(self.root)
+        self.move_step_ms = MOVE_STEP_MS
+        self.computer_turn_after_id = None
 
         # 초기 설정 화면 표시
         self.show_setup_dialog()
+        if WARM_UP_ENABLED:
+            self.root.after_idle(warm_up, WARM_UP_MODULES)
 
     def show_setup_dialog(self):
         """초기 설정 패널을 메인 윈도우에 표시"""
@@ -200,7 +308,8 @@ class SnakeAndLadderGame:
             self.setup_panel = None
 
         # 새 설정 패널 표시
-        self.setup_panel = SetupPanel(self.root, on_submit=self.on_setup_submit, on_cancel=self.on_setup_cancel)
+        self.setup_panel = SetupPanel(self.root, on_submit=self.on_setup_submit, on_cancel=self.on_setup_cancel,
+                                      on_replay=self.on_setup_replay)
 
     def on_setup_submit(self, result):
         """설정 패널에서 '시작' 클릭 시 처리"""
@@ -208,7 +317,12 @@ class SnakeAndLadderGame:
         self.num_computer_players = result['computer_players']
         self.num_snakes = result['snakes']
         self.num_ladders = result['ladders']
+        self.target_length = result.get('target_length', DEFAULT_TARGET_LENGTH)
+        self.use_store = result.get('use_store', False)
         self.player_names = result.get('player_names', [])
+        self.speed = result.get('speed', DEFAULT_SPEED)
+        self.rules = result.get('rules', STANDARD_RULES)
+        self.move_step_ms = MOVE_STEP_MS // self.speed if self.speed else 0
 
         # 설정 패널 제거 후 게임 UI 생성 및 시작
         if self.setup_panel:
@@ -218,8 +332,26 @@ class SnakeAndLadderGame:
         self.build_game_ui()
         self.start_new_game()
 
+    def on_setup_replay(self):
+        """설정 패널에서 '기록 재생' 클릭 시 기록 파일을 골라 재생 화면을 엽니다."""
+        path = filedialog.askopenfilename(title="게임 기록 열기", initialdir=replay_dir(),
+                                          filetypes=[("게임 기록", f"*{REPLAY_SUFFIX}"), ("모든 파일", "*")])
+        if not path:
+            return
+        try:
+            replay = Replay(read_game(path))
+        except (OSError, ReplayError) as e:
+            messagebox.showerror("기록 재생", f"기록을 열 수 없습니다: {e}")
+            return
+
+        if self.setup_panel:
+            self.setup_panel.destroy()
+            self.setup_panel = None
+        self.show_replay(replay)
+
     def on_setup_cancel(self):
         """설정 패널에서 '취소' 클릭 시 앱 종료"""
+        self.sprite_loader.shutdown()
         self.root.destroy()
 
     def build_game_ui(self):
@@ -231,13 +363,16 @@ class SnakeAndLadderGame:
         # 캔버스
         self.canvas = tk.Canvas(self.canvas_frame, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg='white')
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.layout = BoardLayout(CANVAS_WIDTH, CANVAS_HEIGHT)
+        self.board_view = BoardView(self.canvas, self.layout, background_image=BOARD_BACKGROUND_IMAGE)
         
         # 윈도우 리사이징 이벤트 바인딩
         self.canvas.bind('<Configure>', self.on_canvas_resize)
         
-        # 윈도우 리사이징 시 종횡비 유지
-        self.aspect_ratio_locked = True
-        self.root.bind('<Configure>', self.on_window_resize)
+        # 종횡비는 창 관리자에게 맡깁니다 (geometry()로 고치면 <Configure>가 다시 발생해 되먹임이 생김)
+        width, height = WINDOW_ASPECT
+        self.root.aspect(width, height, width, height)
+        self.root.minsize(MIN_WINDOW_HEIGHT * width // height, MIN_WINDOW_HEIGHT)
 
         # 컨트롤 프레임
         self.control_frame = tk.Frame(self.root)
@@ -249,66 +384,63 @@ class SnakeAndLadderGame:
         self.roll_button = tk.Button(self.control_frame, text="주사위 굴리기", font=('Helvetica', 14), command=self.play_turn)
         self.roll_button.pack(side=tk.LEFT, padx=10)
 
-        self.status_label = tk.Label(self.root, text="", font=('Helvetica', 14), fg='blue')
-        self.status_label.pack(pady=10)
+        tk.Checkbutton(self.control_frame, text="히트맵", variable=self.heatmap_var,
+                       command=self.draw_players).pack(side=tk.LEFT, padx=10)
 
-    def on_window_resize(self, event):
-        """윈도우 리사이징 시 종횡비를 유지합니다"""
-        if not self.aspect_ratio_locked or event.widget != self.root:
-            return
-        
-        # 리사이징 중복 호출 방지
-        if self.resize_after_id:
-            self.root.after_cancel(self.resize_after_id)
-        
-        # 짧은 지연 후 종횡비 조정 (연속적인 리사이징 이벤트 처리)
-        self.resize_after_id = self.root.after(10, self.adjust_aspect_ratio)
+        tk.Button(self.control_frame, text="보드 저장", command=self.save_board_to_store).pack(side=tk.LEFT, padx=10)
 
-    def adjust_aspect_ratio(self):
-        """윈도우의 종횡비를 조정합니다"""
-        self.resize_after_id = None
-        
-        # 현재 윈도우 크기 가져오기
-        current_width = self.root.winfo_width()
-        current_height = self.root.winfo_height()
-        
-        # 목표 종횡비에 맞춰 크기 조정
-        # 캔버스는 정사각형이어야 하지만, 컨트롤 UI를 위한 추가 높이 필요
-        # 전체 윈도우의 종횡비를 대략 1:1.15 정도로 유지 (컨트롤 패널 고려)
-        
-        # 너비를 기준으로 적절한 높이 계산 (1:1.2 비율)
-        target_height = int(current_width * 1.2)
-        
-        # 높이가 너무 작으면 최소값 적용
-        if target_height < 400:
-            target_height = 400
-            current_width = int(target_height / 1.2)
-        
-        # 크기가 현재와 많이 다르면 조정
-        if abs(current_height - target_height) > 5:
-            self.root.geometry(f"{current_width}x{target_height}")
+        # 상태 표시줄 (턴 안내 옆에 플레이어별 승리 확률)
+        self.status_frame = tk.Frame(self.root)
+        self.status_frame.pack(pady=10)
+        self.status_label = tk.Label(self.status_frame, text="", font=('Helvetica', 14), fg='blue')
+        self.status_label.pack(side=tk.LEFT)
+        self.win_label = tk.Label(self.status_frame, text="", font=('Helvetica', 12), fg='gray25')
+        self.win_label.pack(side=tk.LEFT, padx=10)
 
     def on_canvas_resize(self, event):
-        """캔버스 리사이징 이벤트 핸들러 - 드래그 종료 후 보드를 다시 그립니다"""
-        if not hasattr(self, 'game_over') or self.game_over or not hasattr(self, 'snakes'):
+        """캔버스 <Configure>: 크기만 기록하고 다음 프레임에 한 번 반영합니다. (연속 이벤트는 합쳐짐)"""
+        self.pending_canvas_size = (event.width, event.height)
+        if self.resize_frame_after_id is None:
+            self.resize_frame_after_id = self.root.after(RESIZE_FRAME_MS, self.apply_canvas_resize)
+
+    @traced()
+    def apply_canvas_resize(self):
+        """프레임마다 한 번: 배치표를 다시 계산하고 보드를 미리보기로 옮겨 그립니다."""
+        self.resize_frame_after_id = None
+        if self.board_view is None or not self.layout.resize(*self.pending_canvas_size):
             return
-        
-        # 기존 예약된 리사이즈 취소
-        if self.canvas_resize_after_id:
-            self.root.after_cancel(self.canvas_resize_after_id)
-        
-        # 300ms 후에 보드 다시 그리기 (드래그가 멈춘 후)
-        self.canvas_resize_after_id = self.root.after(300, self.redraw_board_after_resize)
-    
-    def redraw_board_after_resize(self):
-        """리사이즈 완료 후 보드를 다시 그립니다"""
-        self.canvas_resize_after_id = None
-        if hasattr(self, 'snakes') and not self.game_over:
-            self.draw_board()
+        self.board_view.render(preview=True)
+
+        # 크기가 멈출 때까지 마무리를 미룹니다
+        if self.resize_settle_after_id:
+            self.root.after_cancel(self.resize_settle_after_id)
+        self.resize_settle_after_id = self.root.after(RESIZE_SETTLE_MS, self.finish_canvas_resize)
+
+    @traced()
+    def finish_canvas_resize(self):
+        """크기가 멈춘 뒤 한 번: 배경과 스프라이트를 새 셀 크기로 다시 만들어 그립니다."""
+        self.resize_settle_after_id = None
+        if self.board_view is not None and hasattr(self, 'player_positions'):
+            self.draw_players()
 
     def destroy_game_ui(self):
         """기존 게임 UI 위젯 제거"""
-        widgets = [self.canvas_frame, self.control_frame, self.status_label]
+        self.board_search_token = None  # 진행 중인 보드 탐색 결과는 버립니다
+        self.close_replay_writer()
+        self.replay = None
+        self.replay_scale = None
+        # 진행 중인 애니메이션과 예약된 컴퓨터 턴 취소
+        self.animator.cancel_all()
+        if self.computer_turn_after_id:
+            self.root.after_cancel(self.computer_turn_after_id)
+            self.computer_turn_after_id = None
+        for after_id in (self.resize_frame_after_id, self.resize_settle_after_id):
+            if after_id:
+                self.root.after_cancel(after_id)
+        self.resize_frame_after_id = None
+        self.resize_settle_after_id = None
+
+        widgets = [self.canvas_frame, self.control_frame, self.status_frame]
         for w in widgets:
             try:
                 if w is not None:
@@ -316,10 +448,14 @@ class SnakeAndLadderGame:
             except Exception:
                 pass
         self.canvas = None
+        self.board_view = None
+        self.layout = None
         self.control_frame = None
         self.dice_label = None
         self.roll_button = None
+        self.status_frame = None
         self.status_label = None
+        self.win_label = None
 
     @property
     def computer_player_start_index(self):
@@ -345,6 +481,7 @@ class SnakeAndLadderGame:
         """주사위 굴리기 버튼을 초기 상태로 재설정"""
         self.roll_button.config(state=tk.NORMAL, text="주사위 굴리기", command=self.play_turn)
 
+    @traced()
     def start_new_game(self):
         """새 게임을 시작하고 모든 변수를 초기화합니다."""
         self.snakes = {}
@@ -352,289 +489,527 @@ class SnakeAndLadderGame:
         self.player_positions = [1] * self.num_players
         self.current_player = 0
         self.game_over = False
+        self.roll_streak = 0
+        self.turn_passes = 0
+        self.stats = None  # 보드가 정해지면 begin_play에서 연결
+        self.win_table = None
+        self.game_seed = new_seed()
+        self.board_rng, self.dice_rng = game_rngs(self.game_seed)
         
         self.load_player_sprites() # 포켓몬 이미지 로드
+        if self.use_store and self.load_board_from_store():
+            self.begin_play()
+            return
+        if self.target_length:
+            # 목표 길이에 맞는 보드를 찾는 동안에는 빈 보드를 보여 줍니다
+            self.draw_board()
+            self.roll_button.config(state=tk.DISABLED)
+            self.status_label.config(text="목표 길이에 맞는 보드를 찾는 중...")
+            self.search_board_in_background()
+            return
         self.setup_board_elements()
+        self.begin_play()
+
+    def begin_play(self):
+        """보드가 준비되면 그리고 첫 턴을 시작합니다."""
+        self.move_table = self.rules.compile(self.snakes, self.ladders)
+        self.stats = self.stats_for_board()
+        self.win_table = self.win_table_for_board()
         self.draw_board()
         self.update_status()
         self.reset_roll_button()
+        self.open_replay_writer()
+        if self.is_computer_player(self.current_player):  # 모두 컴퓨터인 게임
+            self.roll_button.config(state=tk.DISABLED)
+            self.after_move()
+
+    def stats_for_board(self):
+        """현재 보드와 플레이어 수의 누적 통계 (처음이면 새로 만듦)"""
+        key = (tuple(sorted(self.snakes.items())), tuple(sorted(self.ladders.items())), self.num_players, self.rules)
+        stats = self.board_stats.get(key)
+        if stats is None:
+            stats = self.board_stats[key] = BoardStats(self.snakes, self.ladders, self.num_players)
+        return stats
+
+    def win_table_for_board(self):
+        """현재 보드와 규칙의 승리 확률 표 (처음이면 계산, NumPy/SciPy가 없으면 None)"""
+        key = (tuple(sorted(self.snakes.items())), tuple(sorted(self.ladders.items())), self.rules)
+        table = self.win_tables.get(key)
+        if table is None:
+            try:
+                from win_probability import WinProbabilityTable  # NumPy/SciPy는 게임 화면에서만 가져옵니다
+            except ImportError:
+                return None
+            table = self.win_tables[key] = WinProbabilityTable(self.snakes, self.ladders, rules=self.rules)
+        return table
+
+    def update_win_probabilities(self):
+        """현재 말 위치와 차례로 플레이어별 승리 확률 표시를 갱신합니다. (같은 상태는 캐시에서 바로)"""
+        if self.win_table is None or self.game_over or max(self.player_positions) >= BOARD_SIZE:
+            self.win_label.config(text="")
+            return
+        chances = self.win_table.probabilities(self.player_positions, self.current_player)
+        if len(chances) <= WIN_LABEL_TOP:
+            self.win_label.config(text="  ".join(f"{self.get_player_name(player)} {chance:.0%}"
+                                                 for player, chance in enumerate(chances)))
+            return
+        leaders = sorted(range(len(chances)), key=chances.__getitem__, reverse=True)[:WIN_LABEL_TOP]
+        self.win_label.config(text="상위: " + "  ".join(f"{self.get_player_name(player)} {chances[player]:.1%}"
+                                                       for player in leaders))
+
+    def record_stats(self, move):
+        """이동 하나를 통계에 더하고, 게임이 끝났으면 결과도 더합니다."""
+        if self.stats is not None:
+            self.stats.record_move(move)
+            if move.won:
+                self.stats.record_game(move.player, self.turn_passes // self.num_players + 1)
+        if not move.won and not move.again:
+            self.turn_passes += 1
+
+    def open_replay_writer(self):
+        """보드가 정해지면 기록 파일을 열고 헤더를 씁니다. (실패해도 게임은 계속)"""
+        self.close_replay_writer()
+        try:
+            self.replay_writer = ReplayWriter(replay_path(self.game_seed), self.game_seed,
+                                              self.snakes, self.ladders, self.num_players, rules=self.rules)
+        except OSError as e:
+            print(f"게임 기록 파일을 열 수 없습니다: {e}. 기록 없이 진행합니다.")
+
+    def close_replay_writer(self):
+        if self.replay_writer is not None:
+            self.replay_writer.close()
+            self.replay_writer = None
+
+    def search_board_in_background(self):
+        """여러 후보 보드 중 목표 기대 길이에 맞는 보드를 백그라운드에서 찾습니다."""
+        self.board_search_token = token = object()
+        args = (self.target_length, self.num_snakes, self.num_ladders, self.num_players)
+        rules = self.rules
+        seed = self.board_rng.randrange(2 ** 32)  # 게임 시드로 탐색도 재현 가능
+
+        def work():
+            try:
+                from board_search import search_boards  # NumPy/SciPy는 목표 길이를 쓸 때만 가져옵니다
+                candidate = search_boards(*args, tolerance=TARGET_LENGTH_TOLERANCE, candidates=BOARD_SEARCH_CANDIDATES,
+                                          seed=seed, rules=rules)
+            except Exception as e:
+                print(f"보드 탐색 실패: {e}. 무작위 보드로 대체합니다.")
+                candidate = None
+            self.ui_queue.put(lambda: self.on_board_found(token, candidate))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def on_board_found(self, token, candidate):
+        """보드 탐색이 끝나면 (UI 스레드에서) 게임을 시작합니다."""
+        if token is not self.board_search_token or self.canvas is None:
+            return  # 그 사이 새 게임이 시작되었거나 화면이 바뀜
+        self.board_search_token = None
+        if candidate is None:
+            self.setup_board_elements()
+        else:
+            self.snakes, self.ladders = candidate.snakes, candidate.ladders
+            print(f"보드 탐색 완료: 기대 길이 {candidate.expected_rounds:.1f}라운드, "
+                  f"자리별 승률 차이 {candidate.unfairness:.3f} (seed {candidate.seed})")
+        self.begin_play()
+
+    def open_board_store(self):
+        """보드 저장소를 처음 쓸 때 엽니다. (열 수 없으면 None)"""
+        if self.board_store is None:
+            try:
+                from board_store import BoardStore  # 마르코프 해석기(NumPy/SciPy)는 저장소를 쓸 때만 가져옵니다
+                self.board_store = BoardStore()
+            except Exception as e:
+                print(f"보드 저장소를 열 수 없습니다: {e}")
+        return self.board_store
+
+    def load_board_from_store(self):
+        """설정(뱀/사다리 수, 규칙, 목표 길이)에 맞는 저장된 보드를 게임 시드로 하나 고릅니다. (찾으면 True)"""
+        store = self.open_board_store()
+        if store is None:
+            return False
+        filters = {'num_snakes': self.num_snakes, 'num_ladders': self.num_ladders, 'rules': self.rules,
+                   'board_size': BOARD_SIZE}
+        min_length = self.target_length - TARGET_LENGTH_TOLERANCE
+        max_length = self.target_length + TARGET_LENGTH_TOLERANCE
+        rounds = None
+        try:
+            if not self.target_length:
+                board = store.choose(self.board_rng, **filters)
+            elif self.num_players == store.metric_players:
+                board = store.choose(self.board_rng, min_length=min_length, max_length=max_length, **filters)
+            else:
+                board, rounds = self.choose_store_board_for_players(store, filters, min_length, max_length)
+        except Exception as e:
+            print(f"보드 저장소 검색 실패: {e}")
+            board = None
+        if board is None:
+            print("저장소에 설정에 맞는 보드가 없어 새로 만듭니다.")
+            return False
+        self.snakes, self.ladders = board.snakes, board.ladders
+        length = (f"{rounds:.1f}라운드 ({self.num_players}인 기준)" if rounds is not None
+                  else f"{board.expected_rounds:.1f}라운드 ({store.metric_players}인 기준)")
+        print(f"저장소 보드 {board.board_hash[:12]}: 기대 길이 {length}, 자리별 승률 차이 {board.unfairness:.3f}")
+        return True
+
+    def choose_store_board_for_players(self, store, filters, min_length, max_length):
+        """저장된 길이 지표가 다른 인원수 기준일 때: 후보 몇 개의 기대 라운드를 이 인원수로 다시 계산해 고릅니다.
+
+        인원이 많을수록 누군가 먼저 끝나므로 기대 라운드는 줄어듭니다. 그래서 저장된 지표로
+        한쪽 경계만은 미리 걸러 낼 수 있습니다. (board, 기대 라운드) 또는 (None, None)을 반환합니다.
+        """
+        from markov_solver import expected_rounds, solve_board
+
+        if self.num_players > store.metric_players:
+            filters = dict(filters, min_length=min_length)
+        else:
+            filters = dict(filters, max_length=max_length)
+        matches = store.count(**filters)
+        if not matches:
+            return None, None
+        offset = self.board_rng.randrange(max(1, matches - STORE_RESCORE_CANDIDATES + 1))
+        fits = []
+        for board in store.query(order_by=None, limit=STORE_RESCORE_CANDIDATES, offset=offset, **filters):
+            solution = solve_board(board.snakes, board.ladders, board.board_size, board.rules)
+            rounds = expected_rounds(solution, self.num_players)
+            if min_length <= rounds <= max_length:
+                fits.append((board, rounds))
+        return self.board_rng.choice(fits) if fits else (None, None)
+
+    def save_board_to_store(self):
+        """지금 보드를 저장소에 넣습니다. (같은 보드가 이미 있으면 그대로 둠)"""
+        if not self.snakes and not self.ladders:
+            return  # 목표 길이 보드를 아직 찾는 중
+        store = self.open_board_store()
+        try:
+            key, added = store.add_board(self.snakes, self.ladders, rules=self.rules) if store else (None, False)
+        except Exception as e:
+            print(f"보드 저장 실패: {e}")
+            key = None
+        if key is None:
+            self.status_label.config(text="보드 저장소를 쓸 수 없습니다.")
+        elif added:
+            self.status_label.config(text=f"보드를 저장했습니다. ({key[:12]})")
+        else:
+            self.status_label.config(text=f"이미 저장된 보드입니다. ({key[:12]})")
 
     def setup_board_elements(self):
         """뱀과 사다리를 랜덤하게 생성합니다."""
-        occupied_squares = {1, BOARD_SIZE}
-        self.snakes.clear()
-        self.ladders.clear()
-
-        # 사다리 생성
-        attempts = 0
-        while len(self.ladders) < self.num_ladders and attempts < 1000:
-            start = random.randint(2, BOARD_SIZE - GRID_DIM)
-            
-            end_min = start + 1 # 최소한 한 칸은 위로
-            end_max = min(start + 20, BOARD_SIZE - 1)
-
-            if end_min >= end_max:
-                attempts += 1
-                continue
-
-            end = random.randint(end_min, end_max)
-
-            if start not in occupied_squares and end not in occupied_squares and start // GRID_DIM < end // GRID_DIM:
-                self.ladders[start] = end
-                occupied_squares.add(start)
-                occupied_squares.add(end)
-            attempts += 1
-
-        # 뱀 생성
-        attempts = 0
-        while len(self.snakes) < self.num_snakes and attempts < 1000:
-            start = random.randint(GRID_DIM + 1, BOARD_SIZE - 1)
-
-            end_max = start - 1 # 최소한 한 칸은 아래로
-            end_min = max(2, start - 20)
-            
-            if end_min >= end_max:
-                attempts += 1
-                continue
-
-            end = random.randint(end_min, end_max)
-
-            if start not in occupied_squares and end not in occupied_squares and start // GRID_DIM > end // GRID_DIM:
-                self.snakes[start] = end
-                occupied_squares.add(start)
-                occupied_squares.add(end)
-            attempts += 1
+        self.snakes, self.ladders = generate_board(self.num_snakes, self.num_ladders, self.board_rng)
 
     def get_current_cell_size(self):
-        """현재 캔버스 크기에 맞는 셀 크기를 계산합니다"""
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        # 가로와 세로 중 작은 값을 기준으로 셀 크기 결정
-        size = min(canvas_width, canvas_height)
-        return max(size // GRID_DIM, 20)  # 최소 셀 크기는 20px
+        """현재 캔버스 크기에 맞는 셀 크기 (배치표에서 가져옴)"""
+        return self.layout.cell_size
 
     def get_board_offset(self):
-        """보드가 캔버스 중앙에 오도록 오프셋을 계산합니다"""
-        cell_size = self.get_current_cell_size()
-        board_size = GRID_DIM * cell_size
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        offset_x = max(0, (canvas_width - board_size) // 2)
-        offset_y = max(0, (canvas_height - board_size) // 2)
-        return offset_x, offset_y
+        """보드가 캔버스 중앙에 오도록 하는 오프셋 (배치표에서 가져옴)"""
+        return self.layout.offset
 
     def get_coords(self, square):
         """칸 번호를 Canvas 좌표로 변환합니다."""
-        cell_size = self.get_current_cell_size()
-        offset_x, offset_y = self.get_board_offset()
-        
-        square -= 1
-        row = square // GRID_DIM
-        col = square % GRID_DIM
-        
-        if row % 2 != 0:  # 홀수 줄 (1, 3, 5...)은 오른쪽에서 왼쪽으로
-            col = GRID_DIM - 1 - col
-            
-        # 보드는 아래에서 위로 (row 0이 맨 아래)
-        x = offset_x + col * cell_size
-        y = offset_y + (GRID_DIM - row - 1) * cell_size
-        return x + cell_size / 2, y + cell_size / 2
+        return self.layout.center(square)
 
+    @traced()
     def draw_board(self):
-        """보드, 칸 번호, 뱀과 사다리를 그립니다."""
-        self.canvas.delete("all")
-        cell_size = self.get_current_cell_size()
-        offset_x, offset_y = self.get_board_offset()
-        
-        # 폰트 크기를 셀 크기에 비례하게 조정
-        font_size = max(8, int(cell_size / 6))
-        
-        for i in range(GRID_DIM):
-            for j in range(GRID_DIM):
-                x1 = offset_x + j * cell_size
-                y1 = offset_y + i * cell_size
-                x2, y2 = x1 + cell_size, y1 + cell_size
-                fill_color = "#F0E68C" if (i + j) % 2 == 0 else "#FFFACD"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline="black")
-                
-                square_num = (GRID_DIM - i - 1) * GRID_DIM
-                if (GRID_DIM - i - 1) % 2 == 0:
-                    square_num += j + 1
-                else:
-                    square_num += GRID_DIM - j
-                
-                self.canvas.create_text(x1 + cell_size/2, y1 + cell_size/2, text=str(square_num), font=('Helvetica', font_size))
-
-        # 화살표 크기를 셀 크기에 비례하게 조정
-        line_width = max(2, int(cell_size / 10))
-        arrow_size = max(8, int(cell_size / 3))
-        arrowshape = (arrow_size, arrow_size + 4, arrow_size // 2)
-        
-        # 사다리 그리기 (파란색, 더 굵고 화살표 크게)
-        for start, end in self.ladders.items():
-            x1, y1 = self.get_coords(start)
-            x2, y2 = self.get_coords(end)
-            self.canvas.create_line(x1, y1, x2, y2, fill='#0066CC', width=line_width, arrow=tk.LAST, 
-                                  arrowshape=arrowshape, smooth=True)
-
-        # 뱀 그리기 (빨간색, 더 굵고 화살표 크게)
-        for start, end in self.snakes.items():
-            x1, y1 = self.get_coords(start)
-            x2, y2 = self.get_coords(end)
-            self.canvas.create_line(x1, y1, x2, y2, fill='#CC0000', width=line_width, arrow=tk.LAST, 
-                                  arrowshape=arrowshape, smooth=True)
-            
+        """보드, 칸 번호, 뱀과 사다리를 그립니다. (바뀐 레이어만 갱신)"""
+        self.board_view.set_board(self.snakes, self.ladders)
         self.draw_players()
 
+    @traced()
     def load_player_sprites(self):
-        """PokeAPI에서 플레이어 수만큼 랜덤 포켓몬 이미지를 불러옵니다."""
-        self.player_image_data = []  # 원본 PIL 이미지 저장
-        self.player_images = []  # 렌더링용 PhotoImage 저장
-        self.status_label.config(text="포켓몬을 불러오는 중...")
-        self.root.update_idletasks()
-        
+        """PokeAPI에서 플레이어 수만큼 랜덤 포켓몬 이미지를 백그라운드로 불러옵니다.
+
+        도착하기 전까지는 기본 도형으로 그리고, 도착하는 대로 스프라이트로 바꿉니다.
+        """
+        self.photo_cache.clear()  # 이전 게임의 스프라이트는 다시 쓰지 않습니다
+        pool_size = min(self.num_players, SPRITE_POOL_SIZE)  # i번 플레이어는 i % pool_size번 포켓몬
+        self.player_image_data = [None] * pool_size  # 원본 PIL 이미지 저장
+        self.player_images = [None] * self.num_players  # 렌더링용 PhotoImage 저장
+        self.sprites_pending = pool_size
+        self.sprite_loader.load(pool_size, self.on_sprite_loaded, self.on_sprite_failed, dispatch=self.ui_queue.put)
+
+    def process_ui_queue(self):
+        """작업 스레드가 넘긴 콜백을 UI 스레드에서 실행합니다."""
         try:
-            # 전체 포켓몬 수 확인
-            response = requests.get("https://pokeapi.co/api/v2/pokemon-species/?limit=1", timeout=5)
-            response.raise_for_status()
-            count = response.json()['count']
-
-            for i in range(self.num_players):
-                random_id = random.randint(1, count)
-                poke_response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{random_id}", timeout=5)
-                poke_response.raise_for_status()
-                sprite_url = poke_response.json()['sprites']['front_default']
-                
-                if not sprite_url:
-                    raise ValueError("Sprite URL not found")
-
-                # 이미지 다운로드 (원본 저장)
-                img_data = requests.get(sprite_url, timeout=5).content
-                img = Image.open(io.BytesIO(img_data))
-                self.player_image_data.append(img)
-            
-            # 현재 셀 크기에 맞게 리사이즈
-            self.resize_player_images()
-            
-            print(f"성공적으로 {self.num_players}마리의 포켓몬을 불러왔습니다.")
-
-        except Exception as e:
-            print(f"포켓몬 이미지 로딩 실패: {e}. 기본 말로 대체합니다.")
-            self.player_image_data = []
-            self.player_images = [] # 실패 시 이미지 리스트 초기화
-
+            while True:
+                callback = self.ui_queue.get_nowait()
+                callback()
+        except queue.Empty:
+            pass
+        self.root.after(UI_QUEUE_POLL_MS, self.process_ui_queue)
+
+    def on_sprite_loaded(self, index, image):
+        """스프라이트 하나가 도착했을 때 해당 플레이어 말을 바꿉니다."""
+        if index >= len(self.player_image_data):
+            return
+        self.player_image_data[index] = image
+        self.sprites_pending -= 1
+        if self.sprites_pending == 0:
+            print(f"성공적으로 {len(self.player_image_data)}마리의 포켓몬을 불러왔습니다.")
+        if self.canvas is not None:
+            self.draw_players()
+
+    def on_sprite_failed(self, index, error):
+        """스프라이트 로딩 실패 시 해당 플레이어는 기본 말로 남겨 둡니다."""
+        self.sprites_pending -= 1
+        print(f"포켓몬 이미지 로딩 실패: {error}. 기본 말로 대체합니다.")
+
+    @traced()
     def resize_player_images(self):
         """플레이어 이미지를 현재 셀 크기에 맞게 리사이즈합니다"""
         if not self.player_image_data:
             return
         
         cell_size = self.get_current_cell_size()
-        sprite_size = max(20, int(cell_size * 0.6))  # 셀 크기의 60%
+        size = sprite_size(cell_size)  # 셀 크기의 60%
         
-        self.player_images = []
-        for img in self.player_image_data:
-            resized = img.resize((sprite_size, sprite_size), Image.Resampling.LANCZOS)
-            self.player_images.append(ImageTk.PhotoImage(resized))
+        # 같은 크기는 캐시에서 바로 가져오므로 셀 크기가 바뀔 때만 리샘플링합니다
+        pool = [self.photo_cache.get(img, size) if img is not None else None for img in self.player_image_data]
+        self.player_images = (pool * -(-self.num_players // len(pool)))[:self.num_players]
 
+    @traced()
     def draw_players(self):
         """플레이어 말을 그립니다. (포켓몬 또는 기본 도형)"""
-        self.canvas.delete("player")
-        cell_size = self.get_current_cell_size()
-        offset_dist = max(6, int(cell_size / 8))
-        player_radius = max(5, int(cell_size / 10))
-        
-        # 이미지가 있으면 리사이즈
+        # 이미지가 있으면 리사이즈 (같은 크기는 캐시에서 가져옴)
         if self.player_image_data:
             self.resize_player_images()
-        
-        for i, pos in enumerate(self.player_positions):
-            # 100을 넘은 플레이어는 100 위치에 그립니다
-            draw_pos = min(pos, BOARD_SIZE)
-            x, y = self.get_coords(draw_pos)
-            offset = (i - (self.num_players - 1) / 2) * offset_dist
-
-            if self.player_images and len(self.player_images) == self.num_players:
-                self.canvas.create_image(x + offset, y, image=self.player_images[i], tags="player")
-            else:
-                self.canvas.create_oval(x - player_radius + offset, y - player_radius, 
-                                        x + player_radius + offset, y + player_radius, 
-                                        fill=PLAYER_COLORS[i], outline='black', tags="player")
+        self.board_view.set_players(self.player_positions, self.player_images)
+        self.update_heatmap()
+        self.board_view.render()
+
+    def update_heatmap(self):
+        """히트맵을 켰으면 이 보드의 칸별 머문 비율을 표시합니다."""
+        if self.heatmap_var.get() and self.stats is not None:
+            self.board_view.set_heatmap(self.stats.landing_frequency())
+        else:
+            self.board_view.set_heatmap(None)
 
     def play_turn(self):
         """'주사위 굴리기' 버튼 클릭 시 호출되는 함수."""
-        if self.game_over or self.is_computer_player(self.current_player):
+        if (self.game_over or self.is_computer_player(self.current_player) or self.animator.busy
+                or self.computer_turn_after_id):
             return
 
+        self.roll_button.config(state=tk.DISABLED)  # 이동 애니메이션이 끝날 때까지 비활성화
         self.roll_and_move()
 
-        if not self.game_over and self.is_computer_player(self.current_player):
-            self.roll_button.config(state=tk.DISABLED)
-            self.root.after(1000, self.computer_turn) # 1초 후 컴퓨터 턴 실행
-
     def computer_turn(self):
         """컴퓨터의 턴을 자동으로 진행합니다."""
+        self.computer_turn_after_id = None
         if self.game_over:
             return
 
         self.roll_and_move()
 
-        # 다음 턴도 컴퓨터라면 자동으로 이어서 진행
-        if not self.game_over and self.is_computer_player(self.current_player):
-            self.root.after(1000, self.computer_turn)
+    def after_move(self):
+        """이동이 끝난 뒤 다음 턴을 준비합니다."""
+        if self.game_over:
+            return
+
+        # 다음 턴도 컴퓨터라면 자동으로 이어서 진행 (빨리 감기면 이어지는 컴퓨터 턴을 한 번에 처리)
+        if self.is_computer_player(self.current_player):
+            if self.speed == 1:
+                self.computer_turn_after_id = self.root.after(COMPUTER_TURN_DELAY_MS, self.computer_turn)
+            else:
+                self.computer_turn_after_id = self.root.after_idle(self.fast_forward_computer_turns)
         else:
             # 사람 차례가 되면 버튼을 다시 활성화
             self.roll_button.config(state=tk.NORMAL)
 
+    @traced()
     def roll_and_move(self):
-        """주사위를 굴리고 말을 이동시킵니다."""
-        roll = random.randint(1, 6)
-        player_name = self.get_player_name(self.current_player)
-        
-        self.dice_label.config(text=f"주사위: {roll}")
-        
-        old_pos = self.player_positions[self.current_player]
-        new_pos = old_pos + roll
-
-        # 100 이상이면 그대로 이동 (승리 조건)
-        self.player_positions[self.current_player] = new_pos
-        self.draw_players()
-        self.root.update_idletasks()
-        time.sleep(0.5) # 이동 애니메이션을 위한 짧은 딜레이
-
+        """주사위를 굴리고 말을 한 칸씩 이동시킵니다. (이동이 끝나면 finish_move 호출)"""
+        move = self.resolve_roll(self.current_player, self.next_roll())
+        player = move.player
+        
+        self.dice_label.config(text=f"주사위: {move.roll}")
+
+        def on_frame(from_square, to_square, t):
+            self.board_view.place_player_between(player, from_square, to_square, t)
+
+        self.animator.start(PathAnimation(move.start, self.move_path(move), self.move_step_ms, on_frame,
+                                          lambda: self.finish_move(move)))
+
+    def next_roll(self):
+        """게임 시드의 주사위를 굴리고 기록합니다."""
+        roll = self.rules.roll(self.dice_rng)
+        if self.replay_writer is not None:
+            self.replay_writer.record(roll)
+        return roll
+
+    def resolve_roll(self, player, roll):
+        """규칙 변형을 컴파일한 이동 표로 굴림 하나의 MoveResult를 구합니다."""
+        move, self.roll_streak = self.move_table.move(player, self.player_positions[player], roll, self.roll_streak)
+        return move
+
+    @staticmethod
+    def move_path(move):
+        """말이 한 칸씩 지나가는 경로 (넘치면 끝 칸까지 갔다가 되돌아옴) + 뱀/사다리 점프"""
+        if move.jump == 'reset':
+            return [1]
+        overshoot = move.start + move.roll
+        path = list(range(move.start + 1, min(overshoot, BOARD_SIZE) + 1))
+        if overshoot > BOARD_SIZE and move.landed < BOARD_SIZE:
+            path.extend(range(BOARD_SIZE - 1, move.landed - 1, -1))
+        if move.jump:
+            path.append(move.final)
+        return path
+
+    def describe_move(self, move):
+        """상태 표시줄에 보여 줄 이동 설명"""
         # 뱀 또는 사다리 확인 (100 이하일 때만)
         landed_on = ""
-        if new_pos >= BOARD_SIZE:
-            final_pos = new_pos  # 100 이상이면 승리
-        elif new_pos in self.ladders:
-            final_pos = self.ladders[new_pos]
-            landed_on = f"사다리 발견! {new_pos} -> {final_pos}"
-        elif new_pos in self.snakes:
-            final_pos = self.snakes[new_pos]
-            landed_on = f"뱀 발견! {new_pos} -> {final_pos}"
-        else:
-            final_pos = new_pos
-
-        self.player_positions[self.current_player] = final_pos
-        self.status_label.config(text=f"{player_name}이(가) {roll}을(를) 굴려 {final_pos}에 도착. {landed_on}")
+        if move.jump == 'ladder':
+            landed_on = f"사다리 발견! {move.landed} -> {move.final}"
+        elif move.jump == 'snake':
+            landed_on = f"뱀 발견! {move.landed} -> {move.final}"
+        elif move.jump == 'reset':
+            landed_on = "연속 굴림 제한으로 처음 칸으로!"
+        if move.again:
+            landed_on += " 한 번 더!"
+        return f"{self.get_player_name(move.player)}이(가) {move.roll}을(를) 굴려 {move.final}에 도착. {landed_on}"
+
+    @traced()
+    def finish_move(self, move):
+        """이동 애니메이션이 끝난 뒤 결과를 반영합니다."""
+        self.player_positions[move.player] = move.final
+        self.record_stats(move)
+        self.status_label.config(text=self.describe_move(move))
         
         self.draw_players()
 
-        if final_pos >= BOARD_SIZE:
+        if move.won:
             self.game_over = True
-            messagebox.showinfo("게임 종료", f"{player_name}의 승리!")
-            self.roll_button.config(text="새 게임 시작", command=self.show_setup_dialog)
+            self.end_game(move.player)
         else:
-            self.current_player = (self.current_player + 1) % self.num_players
+            if not move.again:
+                self.current_player = (self.current_player + 1) % self.num_players
             self.update_status()
+            self.after_move()
+
+    def end_game(self, winner):
+        """승자를 알리고 새 게임 버튼을 보여 줍니다."""
+        self.close_replay_writer()
+        self.update_win_probabilities()
+        messagebox.showinfo("게임 종료", f"{self.get_player_name(winner)}의 승리!")
+        self.roll_button.config(state=tk.NORMAL, text="새 게임 시작", command=self.show_setup_dialog)
+
+    # --- 빨리 감기 ---
+    @traced()
+    def fast_forward_computer_turns(self):
+        """이어지는 컴퓨터 턴을 한 번에 계산하고, 솎아 낸 프레임만 그립니다. (모든 굴림은 기록됨)"""
+        self.computer_turn_after_id = None
+        if self.game_over:
+            return
+
+        # 시작 위치 한 벌과 이동 목록만 보관하고, 재생하면서 이동을 다시 적용합니다
+        # (프레임마다 말 위치를 복사하지 않으므로 플레이어 수와 관계없이 이동 수에만 비례)
+        positions = list(self.player_positions)
+        moves = []
+        while not self.game_over and self.is_computer_player(self.current_player):
+            moves.append(self.apply_computer_move())
+        frame_ms, group = (0, len(moves)) if self.speed == SKIP_TO_RESULT else self.fast_forward_pacing()
+        self.show_fast_forward_frames(positions, moves, 0, group, frame_ms)
+
+    def apply_computer_move(self):
+        """애니메이션 없이 현재 컴퓨터 플레이어의 턴 하나를 상태에 반영합니다."""
+        player = self.current_player
+        move = self.resolve_roll(player, self.next_roll())
+        self.player_positions[player] = move.final
+        if move.won:
+            self.game_over = True
+        elif not move.again:
+            self.current_player = (player + 1) % self.num_players
+        self.record_stats(move)
+        return move
+
+    def fast_forward_pacing(self):
+        """(프레임 간격 ms, 프레임 하나에 담을 이동 수)
+
+        배속에 맞춘 이동 간격이 FAST_FORWARD_FRAME_MS보다 짧으면 여러 이동을 한 프레임에 묶습니다.
+        """
+        move_ms = COMPUTER_TURN_DELAY_MS / self.speed
+        group = max(1, math.ceil(FAST_FORWARD_FRAME_MS / move_ms))
+        return int(group * move_ms), group
+
+    def show_fast_forward_frames(self, positions, moves, index, group, frame_ms):
+        """moves[index:]에서 group개씩 positions에 적용해 한 프레임씩 그리고, 마지막 프레임 뒤에 다음 턴을 준비합니다."""
+        end = min(index + group, len(moves))
+        for move in moves[index:end]:
+            positions[move.player] = move.final
+        move = moves[end - 1]
+        self.dice_label.config(text=f"주사위: {move.roll}")
+        if end < len(moves):
+            self.board_view.set_players(positions)
+            self.board_view.render()
+            self.computer_turn_after_id = self.root.after(frame_ms, self.show_fast_forward_frames, positions, moves,
+                                                          end, group, frame_ms)
+            return
+
+        self.computer_turn_after_id = None
+        self.status_label.config(text=self.describe_move(move))
+        self.draw_players()
+        if move.won:
+            self.end_game(move.player)
+        else:
+            self.update_status()
+            self.after_move()
+
+    def show_replay(self, replay):
+        """기록 재생 화면: 슬라이더로 고른 턴의 상태를 애니메이션 없이 바로 보여 줍니다."""
+        record = replay.record
+        self.num_players = record.num_players
+        self.num_computer_players = 0
+        self.player_names = []
+        self.build_game_ui()
+
+        self.replay = replay
+        self.stats = None
+        self.rules = record.rules
+        self.game_seed = record.seed
+        self.snakes, self.ladders = record.snakes, record.ladders
+        self.win_table = self.win_table_for_board()
+        self.player_positions = list(replay.positions_at(0))
+        self.current_player = 0
+        self.game_over = False
+        self.load_player_sprites()
+        self.draw_board()
+
+        self.roll_button.config(text="설정으로", command=self.show_setup_dialog)
+        self.replay_scale = tk.Scale(self.control_frame, from_=0, to=replay.num_turns, orient=tk.HORIZONTAL,
+                                     length=300, label="턴", command=lambda value: self.show_replay_turn(int(value)))
+        self.replay_scale.pack(side=tk.LEFT, padx=10)
+        self.show_replay_turn(0)
+
+    def show_replay_turn(self, turn):
+        """재생 중인 기록의 turn번째 굴림 직후 상태로 바꿉니다."""
+        if self.replay is None:
+            return
+        replay = self.replay
+        self.player_positions = list(replay.positions_at(turn))
+        self.current_player = replay.current_player_at(turn)
+        self.draw_players()
+
+        move = replay.move_at(turn)
+        self.dice_label.config(text=f"주사위: {move.roll if move else '-'}")
+        if move is None:
+            self.status_label.config(text=f"기록 재생 (시드 {self.game_seed}, 총 {replay.num_turns}턴)")
+        elif move.won:
+            self.status_label.config(text=f"{turn}턴: {self.get_player_name(move.player)}의 승리!")
+        else:
+            self.status_label.config(text=f"{turn}턴: {self.get_player_name(move.player)}이(가) "
+                                          f"{move.roll}을(를) 굴려 {move.final}에 도착")
+        self.update_win_probabilities()
 
     def update_status(self):
         """현재 턴 상태를 업데이트합니다."""
         if not self.game_over:
             player_name = self.get_player_name(self.current_player)
             self.status_label.config(text=f"{player_name}의 턴입니다.")
+        self.update_win_probabilities()
 
 if __name__ == "__main__":
     main_root = tk.Tk()
     game = SnakeAndLadderGame(main_root)
     main_root.mainloop()
+    if tracer.enabled:
+        print(tracer.format_summary())
@@ -0,0 +1,146 @@
+"""포켓몬 스프라이트용 디스크 캐시
+
+PokeAPI 응답(전체 포켓몬 수, 포켓몬 JSON)과 스프라이트 PNG를
+내용 해시(SHA-256) 이름의 파일로 저장하고, 전체 크기 상한을 넘으면
+가장 오래 사용하지 않은 항목부터 지웁니다(LRU).
+오프라인 모드에서는 네트워크를 쓰지 않고 캐시에 있는 것만 돌려줍니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+# --- 캐시 설정 ---
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ladderandchute", "sprites")
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50MB
+INDEX_FILE_NAME = "index.json"
+
+
+class OfflineCacheMiss(LookupError):
+    """오프라인 모드에서 캐시에 없는 항목을 요청했을 때 발생합니다."""
+
+
+class SpriteCache:
+    """URL 키 -> 내용 해시 파일로 저장하는 LRU 디스크 캐시"""
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.index_path = os.path.join(cache_dir, INDEX_FILE_NAME)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # 인덱스: 키 -> {"sha": 내용 해시, "size": 바이트 수, "atime": 마지막 사용 시각}
+        self.index = self._load_index()
+        self.dirty = False
+        self.lock = threading.RLock()  # 여러 다운로드 스레드에서 함께 사용
+
+    @classmethod
+    def from_environment(cls):
+        """환경 변수(LADDER_SPRITE_CACHE, LADDER_SPRITE_OFFLINE)로 캐시를 만듭니다."""
+        cache_dir = os.environ.get("LADDER_SPRITE_CACHE", DEFAULT_CACHE_DIR)
+        offline = os.environ.get("LADDER_SPRITE_OFFLINE", "") not in ("", "0")
+        return cls(cache_dir, offline=offline)
+
+    def _load_index(self):
+        """디스크의 인덱스를 읽습니다. (손상되었거나 없으면 빈 인덱스)"""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # 파일이 사라진 항목은 버립니다
+        return {key: entry for key, entry in index.items() if os.path.exists(self._object_path(entry["sha"]))}
+
+    def _object_path(self, sha):
+        return os.path.join(self.objects_dir, sha[:2], sha)
+
+    def flush(self):
+        """변경된 인덱스를 디스크에 저장합니다. (임시 파일 후 교체)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+
+    def total_bytes(self):
+        """캐시에 저장된 내용의 총 크기 (같은 내용은 한 번만 계산)"""
+        with self.lock:
+            sizes = {entry["sha"]: entry["size"] for entry in self.index.values()}
+            return sum(sizes.values())
+
+    def keys(self, prefix=""):
+        """prefix로 시작하는 캐시 키 목록"""
+        with self.lock:
+            return [key for key in self.index if key.startswith(prefix)]
+
+    def get(self, key):
+        """캐시된 바이트를 반환합니다. 없으면 None"""
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return None
+            try:
+                with open(self._object_path(entry["sha"]), "rb") as f:
+                    data = f.read()
+            except OSError:
+                del self.index[key]
+                self.dirty = True
+                return None
+            entry["atime"] = time.time()
+            self.dirty = True
+            return data
+
+    def put(self, key, data):
+        """바이트를 내용 해시 이름으로 저장하고 필요하면 오래된 항목을 지웁니다."""
+        with self.lock:
+            sha = hashlib.sha256(data).hexdigest()
+            path = self._object_path(sha)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            self.index[key] = {"sha": sha, "size": len(data), "atime": time.time()}
+            self.dirty = True
+            self.evict()
+
+    def evict(self):
+        """총 크기가 상한 이하가 될 때까지 가장 오래 사용하지 않은 항목을 지웁니다."""
+        with self.lock:
+            total = self.total_bytes()
+            if total <= self.max_bytes:
+                return
+            for key in sorted(self.index, key=lambda k: self.index[k]["atime"]):
+                if total <= self.max_bytes:
+                    break
+                entry = self.index.pop(key)
+                self.dirty = True
+                # 같은 내용을 가리키는 다른 키가 없을 때만 파일을 지웁니다
+                if any(other["sha"] == entry["sha"] for other in self.index.values()):
+                    continue
+                total -= entry["size"]
+                try:
+                    os.remove(self._object_path(entry["sha"]))
+                except OSError:
+                    pass
+
+    def fetch(self, key, download):
+        """캐시에 있으면 바로 반환하고, 없으면 download()로 받아 저장합니다."""
+        data = self.get(key)
+        if data is not None:
+            return data
+        if self.offline:
+            raise OfflineCacheMiss(key)
+        data = download()
+        self.put(key, data)
+        return data
+
+    def fetch_json(self, key, download):
+        """fetch와 같지만 JSON으로 해석한 값을 반환합니다."""
+        return json.loads(self.fetch(key, download))
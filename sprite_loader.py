@@ -0,0 +1,203 @@
+"""포켓몬 스프라이트 동시 로더
+
+전체 포켓몬 수, 포켓몬 JSON, 스프라이트 PNG를 작업 스레드 풀에서 동시에 받고,
+하나의 requests.Session(연결 풀)을 함께 써서 TLS 연결을 재사용합니다.
+완료된 스프라이트는 dispatch 함수를 통해 UI 스레드로 전달됩니다.
+
+requests와 Pillow는 가져오는 데 오래 걸리므로 모듈 로드 시점이 아니라 처음 쓸 때 가져옵니다.
+설정 화면을 띄운 뒤 warm_up()으로 백그라운드에서 미리 가져올 수 있습니다.
+"""
+import importlib
+import io
+import os
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from sprite_cache import OfflineCacheMiss
+from tracing import span
+
+# --- PokeAPI 설정 ---
+POKEAPI_BASE_URL = os.environ.get("LADDER_POKEAPI_URL", "https://pokeapi.co/api/v2/")
+REQUEST_TIMEOUT = 5
+MAX_WORKERS = 4
+PHOTO_CACHE_SIZE = 64  # 크기별 PhotoImage 캐시 최대 항목 수
+HEAVY_MODULES = ("requests", "PIL.Image", "PIL.ImageTk")  # 지연 로딩 대상
+
+
+def warm_up(modules=HEAVY_MODULES):
+    """무거운 모듈을 백그라운드 스레드에서 미리 가져옵니다. (시작한 스레드를 반환)"""
+    def work():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"미리 가져오기 실패: {e}")
+
+    thread = threading.Thread(target=work, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+class SpriteLoader:
+    """스레드 풀과 공유 HTTP 세션으로 플레이어 스프라이트를 동시에 불러옵니다."""
+    def __init__(self, cache, base_url=POKEAPI_BASE_URL, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT):
+        self.cache = cache
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._session = None  # 첫 요청 때 만듭니다 (requests 지연 로딩)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sprite")
+
+        self.generation = 0  # 새 요청이 시작되면 이전 요청의 결과는 버립니다
+        self.lock = threading.Lock()
+
+    @property
+    def session(self):
+        """모든 요청이 같은 연결 풀을 사용하도록 공유하는 requests 세션"""
+        with self.lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    @property
+    def species_url(self):
+        return f"{self.base_url}pokemon-species/?limit=1"
+
+    @property
+    def pokemon_url(self):
+        return f"{self.base_url}pokemon/"
+
+    def download(self, url):
+        """URL의 내용을 공유 세션으로 내려받습니다."""
+        with span("http_get", url=url):
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        return response.content
+
+    def fetch_species_count(self):
+        """전체 포켓몬 수 (캐시에 있으면 네트워크 요청 없음)"""
+        url = self.species_url
+        return self.cache.fetch_json(url, lambda: self.download(url))['count']
+
+    def cached_pokemon_ids(self):
+        """캐시에 JSON이 저장된 포켓몬 ID 목록"""
+        prefix = self.pokemon_url
+        return [int(key[len(prefix):]) for key in self.cache.keys(prefix)]
+
+    def fetch_sprite(self, pokemon_id):
+        """포켓몬 하나의 스프라이트를 받아 디코딩된 PIL 이미지로 반환합니다."""
+        poke_url = f"{self.pokemon_url}{pokemon_id}"
+        poke_json = self.cache.fetch_json(poke_url, lambda: self.download(poke_url))
+        sprite_url = poke_json['sprites']['front_default']
+        if not sprite_url:
+            raise ValueError("Sprite URL not found")
+
+        img_data = self.cache.fetch(sprite_url, lambda: self.download(sprite_url))
+        from PIL import Image
+        img = Image.open(io.BytesIO(img_data))
+        img.load()  # 디코딩까지 작업 스레드에서 끝냅니다
+        return img
+
+    def _load_one(self, pokemon_id, count_future, rng):
+        """작업 스레드: pokemon_id(None이면 랜덤 포켓몬)의 스프라이트를 받습니다."""
+        if pokemon_id is None:
+            if self.cache.offline:
+                cached_ids = self.cached_pokemon_ids()
+                if not cached_ids:
+                    raise OfflineCacheMiss("캐시된 포켓몬이 없습니다")
+                pokemon_id = rng.choice(cached_ids)
+            else:
+                pokemon_id = rng.randint(1, count_future.result())
+        return self.fetch_sprite(pokemon_id)
+
+    def load(self, num_players, on_sprite, on_error, dispatch, rng=random):
+        """num_players개의 스프라이트를 동시에 요청하고 바로 반환합니다.
+
+        완료될 때마다 dispatch(callback)로 UI 스레드에 on_sprite(index, image) 또는
+        on_error(index, exception)을 전달합니다.
+        캐시에 있는 포켓몬을 먼저 고르고 모자라는 자리만 네트워크에서 새로 고르므로,
+        캐시가 충분하면 재시작이나 새 게임에서 네트워크 요청이 없습니다.
+        """
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+
+        cached_ids = self.cached_pokemon_ids()
+        picks = rng.sample(cached_ids, min(num_players, len(cached_ids)))
+        picks += [None] * (num_players - len(picks))
+        needs_count = picks[-1] is None and not self.cache.offline if picks else False
+        count_future = self.executor.submit(self.fetch_species_count) if needs_count else None
+
+        def deliver(index, future):
+            if generation != self.generation:
+                return  # 이미 새 게임이 시작됨
+            self.cache.flush()
+            error = future.exception()
+            if error is None:
+                image = future.result()
+                dispatch(lambda: on_sprite(index, image) if generation == self.generation else None)
+            else:
+                dispatch(lambda: on_error(index, error) if generation == self.generation else None)
+
+        futures = []
+        for index, pokemon_id in enumerate(picks):
+            future = self.executor.submit(self._load_one, pokemon_id, count_future, rng)
+            future.add_done_callback(lambda f, index=index: deliver(index, f))
+            futures.append(future)
+        return futures
+
+    def cancel(self):
+        """진행 중인 요청의 결과를 모두 무시합니다."""
+        with self.lock:
+            self.generation += 1
+
+    def shutdown(self):
+        """대기 중인 작업을 취소하고 스레드 풀과 세션을 닫습니다."""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._session is not None:
+            self._session.close()
+
+
+class PhotoImageCache:
+    """(원본 스프라이트, 목표 크기) -> 리사이즈된 PhotoImage 를 보관하는 LRU 캐시
+
+    셀 크기가 바뀌지 않으면 이동할 때마다 다시 리샘플링하지 않습니다.
+    PhotoImage는 Tk 객체이므로 UI 스레드에서만 사용해야 합니다.
+    """
+    def __init__(self, max_entries=PHOTO_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image, size):
+        """image를 size x size로 리사이즈한 PhotoImage를 반환합니다."""
+        # PIL 이미지는 해시할 수 없으므로 id를 키로 쓰고, 원본을 값에 함께 보관해 id 재사용을 막습니다
+        key = (id(image), size)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        from PIL import Image, ImageTk
+        resized = image.resize((size, size), Image.Resampling.LANCZOS)
+        photo = ImageTk.PhotoImage(resized)
+        self.entries[key] = (image, photo)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return photo
+
+    def clear(self):
+        self.entries.clear()
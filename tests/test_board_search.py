@@ -0,0 +1,27 @@
+"""목표 길이 보드 탐색: 점수 계산"""
+import random
+import unittest
+
+from board_search import score_board, search_boards
+from game_engine import generate_board
+from markov_solver import expected_rounds, solve_board
+
+
+class ScoreBoardTest(unittest.TestCase):
+    def setUp(self):
+        self.snakes, self.ladders = generate_board(10, 10, random.Random(1))
+        self.rounds = expected_rounds(solve_board(self.snakes, self.ladders), 2)
+
+    def test_zero_tolerance_means_exact_length(self):
+        score, rounds, unfairness = score_board(self.snakes, self.ladders, self.rounds + 3, 2, tolerance=0)
+        self.assertAlmostEqual(score, 1.0 + 3, places=6)
+        score, _, unfairness = score_board(self.snakes, self.ladders, rounds, 2, tolerance=0)
+        self.assertEqual(score, unfairness)
+
+    def test_search_with_zero_tolerance(self):
+        candidate = search_boards(20, 10, 10, tolerance=0, candidates=64, seed=1, workers=1)
+        self.assertAlmostEqual(candidate.score, 1.0 + abs(candidate.expected_rounds - 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
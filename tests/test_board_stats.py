@@ -0,0 +1,49 @@
+"""보드 통계: 연속 굴림 제한으로 처음 칸에 보낸 이동은 도착으로 세지 않음, 긴 게임도 평균/분산에는 실제 길이로"""
+import random
+import unittest
+
+import numpy as np
+
+from board_stats import MAX_TRACKED_ROUNDS, BoardStats
+from game_engine import GameEngine, RuleSet, generate_board
+from replay_log import GameRecord, Replay
+from simulation import SimulationResult
+
+GAMES = 50
+
+
+class ResetMoveTest(unittest.TestCase):
+    def test_reset_moves_are_not_landings(self):
+        rules = RuleSet.from_names(['three_sixes'])
+        snakes, ladders = generate_board(10, 10, random.Random(1))
+        stats = BoardStats(snakes, ladders, 2)
+        moves = resets = 0
+        for seed in range(GAMES):
+            engine = GameEngine(2, snakes, ladders, random.Random(seed), rules=rules)
+            rolls = bytearray()
+            while not engine.game_over:
+                rolls.append(engine.play_turn().roll)
+            replay = Replay(GameRecord(seed, engine.board_size, 2, snakes, ladders, bytes(rolls), rules))
+            stats.record_replay(replay)
+            moves += replay.num_turns
+            resets += sum(move.jump == 'reset' for move in replay.moves[1:])
+        self.assertGreater(resets, 0)
+        self.assertEqual(stats.moves, moves - resets)
+        self.assertEqual(sum(stats.landed_counts), stats.moves)
+        self.assertEqual(sum(stats.final_counts), stats.moves)
+        self.assertEqual(stats.games, GAMES)
+
+
+class LongGameTest(unittest.TestCase):
+    def test_overflow_lengths_keep_true_mean(self):
+        rounds = np.array([10, 20, MAX_TRACKED_ROUNDS + 100, MAX_TRACKED_ROUNDS * 3], dtype=np.int32)
+        result = SimulationResult(rounds, rounds * 2, np.zeros(len(rounds), dtype=np.int16), 2)
+        stats = BoardStats({}, {}, 2)
+        stats.record_simulation(result)
+        self.assertAlmostEqual(stats.mean_rounds, rounds.mean())
+        self.assertAlmostEqual(stats.std_rounds, rounds.std())
+        self.assertEqual(stats.length_histogram[MAX_TRACKED_ROUNDS], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""보드 저장소: 중복 제거와 인원수에 맞는 목표 길이 보드 고르기"""
+import random
+import sqlite3
+import unittest
+
+from board_store import BoardStore
+from game_engine import STANDARD_RULES, generate_board
+from markov_solver import expected_rounds, solve_board
+from snake_and_ladder_game import TARGET_LENGTH_TOLERANCE, SnakeAndLadderGame
+
+NUM_BOARDS = 200
+OLD_SQLITE_VARIABLE_LIMIT = 999
+
+
+def boards(count, seed=0):
+    rng = random.Random(seed)
+    return [generate_board(10, 10, rng) for _ in range(count)]
+
+
+class BoardStoreTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.store = BoardStore(":memory:")
+        cls.added = cls.store.add_boards(boards(NUM_BOARDS))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.store.close()
+
+    def test_duplicates_are_skipped(self):
+        self.assertEqual(self.added, NUM_BOARDS)
+        self.assertEqual(self.store.add_boards(boards(NUM_BOARDS)), 0)
+        self.assertEqual(len(self.store), NUM_BOARDS)
+
+    def test_lookup_fits_old_variable_limit(self):
+        with BoardStore(":memory:") as store:
+            store.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, OLD_SQLITE_VARIABLE_LIMIT)
+            many = boards(OLD_SQLITE_VARIABLE_LIMIT + 1, seed=1)
+            self.assertEqual(store.add_boards(many), len(many))
+            self.assertEqual(store.add_boards(many), 0)
+
+    def game(self, num_players, target_length):
+        game = SnakeAndLadderGame.__new__(SnakeAndLadderGame)
+        game.board_store = self.store
+        game.board_rng = random.Random(1)
+        game.num_players = num_players
+        game.num_snakes = game.num_ladders = 10
+        game.rules = STANDARD_RULES
+        game.target_length = target_length
+        return game
+
+    def assert_length_fits(self, game):
+        rounds = expected_rounds(solve_board(game.snakes, game.ladders), game.num_players)
+        self.assertLessEqual(abs(rounds - game.target_length), TARGET_LENGTH_TOLERANCE + 1e-9)
+
+    def test_target_length_for_metric_players(self):
+        game = self.game(self.store.metric_players, 20)
+        self.assertTrue(game.load_board_from_store())
+        self.assert_length_fits(game)
+
+    def test_target_length_is_recomputed_for_other_player_counts(self):
+        lengths = sorted(expected_rounds(solve_board(*board), 4) for board in boards(NUM_BOARDS))
+        game = self.game(4, round(lengths[len(lengths) // 2]))
+        self.assertTrue(game.load_board_from_store())
+        self.assert_length_fits(game)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""빨리 감기: 이동을 한 번에 계산한 뒤 솎아 낸 프레임을 차례로 그림"""
+import math
+import random
+import unittest
+
+from game_engine import STANDARD_RULES, generate_board
+from snake_and_ladder_game import COMPUTER_TURN_DELAY_MS, FAST_FORWARD_FRAME_MS, SnakeAndLadderGame
+
+NUM_PLAYERS = 500
+SPEED = 64
+
+
+class FakeRoot:
+    """after로 예약한 콜백을 run()에서 차례로 실행합니다."""
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback, *args):
+        self.pending.append((callback, args))
+        return len(self.pending)
+
+    def run(self):
+        while self.pending:
+            callback, args = self.pending.pop(0)
+            callback(*args)
+
+
+class FakeLabel:
+    def config(self, **options):
+        pass
+
+
+class FakeView:
+    def __init__(self):
+        self.frames = []
+
+    def set_players(self, positions, images=None):
+        self.frames.append(list(positions))
+
+    def render(self):
+        pass
+
+
+class FastForwardTest(unittest.TestCase):
+    def test_frames_follow_moves_without_copying_per_move(self):
+        snakes, ladders = generate_board(10, 10, random.Random(1))
+        game = SnakeAndLadderGame.__new__(SnakeAndLadderGame)
+        game.root = FakeRoot()
+        game.board_view = FakeView()
+        game.dice_label = game.status_label = FakeLabel()
+        game.num_players = game.num_computer_players = NUM_PLAYERS
+        game.player_positions = [1] * NUM_PLAYERS
+        game.current_player = 0
+        game.game_over = False
+        game.speed = SPEED
+        game.rules = STANDARD_RULES
+        game.dice_rng = random.Random(1)
+        game.replay_writer = None
+        game.move_table = STANDARD_RULES.compile(snakes, ladders)
+        game.roll_streak = 0
+        game.stats = None
+        game.turn_passes = 0
+        finished = []
+        game.draw_players = lambda: game.board_view.set_players(game.player_positions)
+        game.end_game = finished.append
+        game.update_status = game.after_move = lambda: None
+
+        game.fast_forward_computer_turns()
+        game.root.run()
+
+        self.assertTrue(game.game_over)
+        self.assertEqual(len(finished), 1)
+        moves = game.turn_passes + 1
+        group = max(1, math.ceil(FAST_FORWARD_FRAME_MS / (COMPUTER_TURN_DELAY_MS / SPEED)))
+        self.assertEqual(len(game.board_view.frames), math.ceil(moves / group))
+        self.assertEqual(game.board_view.frames[-1], game.player_positions)
+        self.assertNotEqual(game.board_view.frames[0], game.board_view.frames[-1])
+        self.assertTrue(all(len(frame) == NUM_PLAYERS for frame in game.board_view.frames))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""게임 호스트: 잘못된 인원수 거절과 끝난 세션 정리"""
+import asyncio
+import unittest
+
+from game_host import DEFAULT_HOST, GameHost, GameHostError, LoopbackClient
+
+
+class CreateSessionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_rejects_too_few_players(self):
+        host = GameHost()
+        for players in (0, -1, 1):
+            with self.assertRaises(GameHostError):
+                host.create_session(players, 0)
+        self.assertEqual(host.sessions, {})
+
+    async def test_socket_create_with_no_players_fails(self):
+        host = GameHost()
+        server = await host.serve(DEFAULT_HOST, 0)
+        client = await LoopbackClient().connect(DEFAULT_HOST, server.sockets[0].getsockname()[1])
+        try:
+            with self.assertRaises(GameHostError):
+                await client.request('create', players=0, computers=0)
+            state = await client.request('create', players=2, computers=2)
+            self.assertEqual(state['players'], 2)
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+
+class FinishedSessionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_finished_sessions_are_evicted(self):
+        host = GameHost(finished_limit=3)
+        sessions = [host.create_session(2, 2, seed=seed) for seed in range(10)]
+        await asyncio.gather(*(session.done for session in sessions))
+        await asyncio.sleep(0)  # 완료 콜백 실행
+        self.assertEqual(len(host.sessions), 3)
+        self.assertEqual(host.finished_sessions, 10)
+        self.assertEqual(host.metrics()['turns'], sum(session.metrics.turns for session in sessions))
+
+    async def test_closing_a_live_session_is_not_a_finish(self):
+        host = GameHost(bot_delay=60)
+        session = host.create_session(2, 2, seed=1)
+        host.close_session(session.session_id)
+        await asyncio.sleep(0)
+        self.assertIsNone(session.done.result())
+        self.assertEqual(host.finished_sessions, 0)
+
+    async def test_closed_session_keeps_turns(self):
+        host = GameHost()
+        session = host.create_session(2, 2, seed=1)
+        await session.done
+        host.close_session(session.session_id)
+        await asyncio.sleep(0)
+        self.assertEqual(host.sessions, {})
+        self.assertEqual(host.metrics()['turns'], session.metrics.turns)
+
+
+if __name__ == "__main__":
+    unittest.main()
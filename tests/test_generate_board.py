@@ -0,0 +1,48 @@
+"""보드 생성: 요청한 개수, 칸 겹침 없음, 줄/점프 길이 제약, 배치할 수 없을 때의 BoardGenerationError"""
+import random
+import unittest
+
+from game_engine import BOARD_SIZE, GRID_DIM, BoardGenerationError, generate_board
+
+SEEDS = 200
+
+
+class GenerateBoardTest(unittest.TestCase):
+    def check_board(self, snakes, ladders, num_snakes, num_ladders, board_size, grid_dim, max_jump):
+        self.assertEqual(len(snakes), num_snakes)
+        self.assertEqual(len(ladders), num_ladders)
+        squares = [*snakes, *snakes.values(), *ladders, *ladders.values()]
+        self.assertEqual(len(set(squares)), len(squares))
+        self.assertTrue(all(1 < square < board_size for square in squares))
+        for start, end in ladders.items():
+            self.assertGreater(end // grid_dim, start // grid_dim)
+            self.assertLessEqual(end - start, max_jump)
+        for start, end in snakes.items():
+            self.assertLess(end // grid_dim, start // grid_dim)
+            self.assertLessEqual(start - end, max_jump)
+
+    def test_default_board(self):
+        for seed in range(SEEDS):
+            snakes, ladders = generate_board(10, 10, random.Random(seed))
+            self.check_board(snakes, ladders, 10, 10, BOARD_SIZE, GRID_DIM, 2 * GRID_DIM)
+
+    def test_large_board_and_max_jump(self):
+        for seed in range(SEEDS):
+            snakes, ladders = generate_board(60, 40, random.Random(seed), board_size=900, grid_dim=30, max_jump=45)
+            self.check_board(snakes, ladders, 60, 40, 900, 30, 45)
+
+    def test_same_seed_same_board(self):
+        self.assertEqual(generate_board(10, 10, random.Random(7)), generate_board(10, 10, random.Random(7)))
+
+    def test_too_many_for_board(self):
+        with self.assertRaises(BoardGenerationError):
+            generate_board(25, 25, random.Random(0))
+
+    def test_no_room_for_jump_ends(self):
+        # 20칸 보드의 첫 줄에서 시작하는 사다리 9개: 10번 칸도 시작 칸이 되어야 하지만 그 위에 끝 칸이 없음
+        with self.assertRaises(BoardGenerationError):
+            generate_board(0, 9, random.Random(0), board_size=20, grid_dim=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""마르코프 해석기: 규칙 변형마다 기대 라운드 수와 자리별 승률이 시뮬레이션과 맞는지 확인합니다."""
+import random
+import unittest
+
+import numpy as np
+
+from game_engine import RULE_VARIANTS, RuleSet, generate_board
+from markov_solver import expected_rounds, seat_win_probabilities, solve_board
+from simulation import simulate_games
+
+GAMES = 20000
+PLAYERS = 2
+ROUNDS_TOLERANCE = 0.5  # 표준 오차의 약 7배 이상
+WIN_RATE_TOLERANCE = 0.02  # 표준 오차의 약 5배
+
+
+class SolverMatchesSimulationTest(unittest.TestCase):
+    def test_each_rule_variant(self):
+        board = generate_board(10, 10, random.Random(3))
+        for names in [(), *((name,) for name in RULE_VARIANTS)]:
+            with self.subTest(rules=names or 'standard'):
+                rules = RuleSet.from_names(names)
+                solution = solve_board(*board, rules=rules)
+                result = simulate_games(*board, GAMES, PLAYERS, seed=1, rules=rules)
+                finished = result.winners >= 0
+                self.assertTrue(finished.all())
+                self.assertAlmostEqual(result.rounds.mean(), expected_rounds(solution, PLAYERS),
+                                       delta=ROUNDS_TOLERANCE)
+                win_rates = np.bincount(result.winners, minlength=PLAYERS) / GAMES
+                np.testing.assert_allclose(win_rates, seat_win_probabilities(solution, PLAYERS),
+                                           atol=WIN_RATE_TOLERANCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""멀티코어 시뮬레이션: 한 번 더 굴리기 규칙에서도 보드별 평균 라운드가 정확한지 확인합니다."""
+import random
+import unittest
+
+from game_engine import RuleSet, generate_board
+from markov_solver import expected_rounds, solve_board
+from parallel_simulation import ParallelSimulation
+
+GAMES = 20000
+ROUNDS_TOLERANCE = 0.5  # 표준 오차의 약 5배
+
+
+class BoardSummaryTest(unittest.TestCase):
+    def test_mean_rounds_with_extra_turns(self):
+        rules = RuleSet.from_names(['extra_turn'])
+        board = generate_board(10, 10, random.Random(3))
+        with ParallelSimulation([board], GAMES, 2, seed=1, workers=1, rules=rules) as simulation:
+            simulation.start().wait()
+            summary = simulation.board_summaries()[0]
+            turns = simulation.results['turns'].copy()
+            rounds = simulation.results['rounds'].copy()
+        self.assertEqual(summary['finished'], GAMES)
+        self.assertAlmostEqual(summary['mean_rounds'], expected_rounds(solve_board(*board, rules=rules), 2),
+                               delta=ROUNDS_TOLERANCE)
+        self.assertTrue((turns >= 2 * rounds - 1).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
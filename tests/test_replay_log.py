@@ -0,0 +1,78 @@
+"""게임 기록: 파일로 쓰고 읽어도 같은 기록인지, 규칙이나 시드와 맞지 않는 기록을 거부하는지 확인합니다."""
+import os
+import random
+import tempfile
+import unittest
+
+from game_engine import STANDARD_RULES, GameEngine, RuleSet, generate_board
+from replay_log import (FORMAT_VERSION, GameRecord, ReplayError, ReplayWriter, decode_game, encode_game, game_rngs,
+                        read_game, verify_game)
+
+
+def record_game(seed, num_players=2, rules=STANDARD_RULES):
+    """시드의 보드와 주사위로 게임 하나를 끝까지 진행한 GameRecord"""
+    board_rng, dice_rng = game_rngs(seed)
+    snakes, ladders = generate_board(10, 10, board_rng)
+    engine = GameEngine(num_players, snakes, ladders, dice_rng, rules=rules)
+    rolls = bytearray()
+    while not engine.game_over:
+        rolls.append(engine.play_turn().roll)
+    return GameRecord(seed, engine.board_size, num_players, snakes, ladders, bytes(rolls), rules)
+
+
+class RoundTripTest(unittest.TestCase):
+    def test_writer_and_reader(self):
+        records = [record_game(seed) for seed in range(4)]
+        records.append(record_game(5, 300, RuleSet.from_names(['three_sixes'])))
+        records.append(record_game(6, 3, RuleSet.from_names(['two_dice', 'exact_finish'])))
+        records.append(records[0]._replace(rolls=records[0].rolls[:-1]))  # 진행 중에 끊긴 게임
+        self.assertEqual({len(record.rolls) % 2 for record in records}, {0, 1})  # 채움값이 있는 기록과 없는 기록
+        with tempfile.TemporaryDirectory() as directory:
+            for index, record in enumerate(records):
+                path = os.path.join(directory, f"{index}.lcr")
+                with ReplayWriter(path, record.seed, record.snakes, record.ladders, record.num_players,
+                                  record.board_size, record.rules) as writer:
+                    for roll in record.rolls:
+                        writer.record(roll)
+                with self.subTest(seed=record.seed):
+                    self.assertEqual(read_game(path), record)
+                    with open(path, 'rb') as f:
+                        self.assertEqual(f.read(), encode_game(record))
+                    replay = verify_game(read_game(path))
+                    self.assertEqual(replay.num_turns, len(record.rolls))
+
+
+class VerifyTest(unittest.TestCase):
+    def setUp(self):
+        self.record = record_game(1)
+
+    def test_changed_roll_fails_dice_check(self):
+        rolls = bytearray(self.record.rolls)
+        rolls[0] = rolls[0] % 6 + 1
+        tampered = self.record._replace(rolls=bytes(rolls))
+        with self.assertRaises(ReplayError):
+            verify_game(tampered)
+
+    def test_other_seed_fails_dice_check(self):
+        with self.assertRaises(ReplayError):
+            verify_game(self.record._replace(seed=self.record.seed + 1))
+        verify_game(self.record._replace(seed=self.record.seed + 1), check_dice=False)
+
+    def test_rule_violations(self):
+        with self.assertRaises(ReplayError):
+            verify_game(self.record._replace(rolls=self.record.rolls + b'\x01'), check_dice=False)
+        with self.assertRaises(ReplayError):
+            verify_game(self.record._replace(rolls=b'\x07'), check_dice=False)
+
+    def test_bad_header(self):
+        data = encode_game(self.record)
+        with self.assertRaises(ReplayError):
+            decode_game(b'XXXX' + data[4:])
+        with self.assertRaises(ReplayError):
+            decode_game(data[:4] + bytes((FORMAT_VERSION + 1,)) + data[5:])
+        with self.assertRaises(ReplayError):
+            decode_game(data[:30])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""스프라이트 로더: 로컬 PokeAPI 대역 서버로 네트워크/캐시/오프라인/실패 동작을 확인합니다."""
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from sprite_cache import OfflineCacheMiss, SpriteCache  # noqa: E402
+from sprite_loader import SpriteLoader  # noqa: E402
+from stub_pokeapi import StubPokeAPI  # noqa: E402
+
+NUM_SPRITES = 4
+LOAD_TIMEOUT = 10
+
+
+class SequenceRng:
+    """작업 스레드마다 정해진 포켓몬 ID를 차례로 돌려주는 난수 대역"""
+    def __init__(self, ids):
+        self.ids = list(ids)
+        self.lock = threading.Lock()
+
+    def randint(self, low, high):
+        with self.lock:
+            return self.ids.pop(0)
+
+    def choice(self, items):
+        with self.lock:
+            return items[0]
+
+    def sample(self, items, count):
+        return sorted(items)[:count]
+
+
+class SpriteLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="sprite-test-")
+        self.stub = StubPokeAPI(fail_ids=[13]).__enter__()
+        self.loaders = []
+
+    def tearDown(self):
+        for loader in self.loaders:
+            loader.shutdown()
+        self.stub.__exit__(None, None, None)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def loader(self, offline=False):
+        loader = SpriteLoader(SpriteCache(self.cache_dir, offline=offline), base_url=self.stub.base_url)
+        self.loaders.append(loader)
+        return loader
+
+    def load(self, loader, ids, count=NUM_SPRITES):
+        """count개를 불러와 (성공 dict, 실패 dict)를 반환합니다. (콜백은 이 스레드에서 실행)"""
+        callbacks = queue.Queue()
+        sprites, errors = {}, {}
+        loader.load(count, sprites.__setitem__, errors.__setitem__, dispatch=callbacks.put, rng=SequenceRng(ids))
+        for _ in range(count):
+            callbacks.get(timeout=LOAD_TIMEOUT)()
+        return sprites, errors
+
+    def test_cold_load_uses_network_and_warm_load_uses_cache(self):
+        sprites, errors = self.load(self.loader(), [1, 2, 3, 4])
+        self.assertEqual((len(sprites), errors), (NUM_SPRITES, {}))
+        cold_requests = self.stub.request_count
+        self.assertEqual(cold_requests, 1 + 2 * NUM_SPRITES)  # 포켓몬 수 + (JSON, PNG) x 4
+
+        sprites, errors = self.load(self.loader(), [5, 6, 7, 8])  # 온라인이어도 캐시된 포켓몬을 먼저 고름
+        self.assertEqual((len(sprites), errors), (NUM_SPRITES, {}))
+        self.assertEqual(self.stub.request_count, cold_requests)
+
+    def test_network_only_fills_missing_sprites(self):
+        self.load(self.loader(), [1, 2], count=2)
+        requests_before = self.stub.request_count
+        sprites, errors = self.load(self.loader(), [5, 6])
+        self.assertEqual((len(sprites), errors), (NUM_SPRITES, {}))
+        self.assertEqual(self.stub.request_count - requests_before, 2 * 2)  # 새 포켓몬 2마리 (포켓몬 수는 캐시에 있음)
+
+    def test_offline_mode_uses_cached_sprites_only(self):
+        sprites, errors = self.load(self.loader(offline=True), [])
+        self.assertEqual(len(errors), NUM_SPRITES)
+        self.assertTrue(all(isinstance(error, OfflineCacheMiss) for error in errors.values()))
+        self.assertEqual(self.stub.request_count, 0)
+
+        self.load(self.loader(), [7], count=1)
+        requests_before = self.stub.request_count
+        sprites, errors = self.load(self.loader(offline=True), [])
+        self.assertEqual((len(sprites), errors), (NUM_SPRITES, {}))
+        self.assertEqual(self.stub.request_count, requests_before)
+
+    def test_one_failure_does_not_abort_the_batch(self):
+        sprites, errors = self.load(self.loader(), [1, 13, 2, 3])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(len(sprites), NUM_SPRITES - 1)
+        self.assertEqual(set(sprites) | set(errors), set(range(NUM_SPRITES)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""승리 확률: 마지막 칸을 넘어간 위치가 있는 기록을 끝까지 돌려 봐도 멈추지 않는지 확인합니다."""
+import unittest
+
+from game_engine import BOARD_SIZE, GameEngine, generate_board
+from replay_log import GameRecord, Replay, game_rngs
+from win_probability import WinProbabilityTable
+
+OVERSHOOT_SEED = 0  # 마지막 턴 위치가 (102, 93)인 2인 게임
+
+
+def record_game(seed, num_players=2):
+    """시드의 보드와 주사위로 게임 하나를 끝까지 진행한 GameRecord"""
+    board_rng, dice_rng = game_rngs(seed)
+    snakes, ladders = generate_board(10, 10, board_rng)
+    engine = GameEngine(num_players, snakes, ladders, dice_rng)
+    rolls = bytearray()
+    while not engine.game_over:
+        rolls.append(engine.play_turn().roll)
+    return GameRecord(seed, engine.board_size, num_players, snakes, ladders, bytes(rolls))
+
+
+class FakeLabel:
+    def __init__(self):
+        self.text = None
+
+    def config(self, text=None, **options):
+        self.text = text
+
+
+class OvershootTest(unittest.TestCase):
+    def setUp(self):
+        self.replay = Replay(record_game(OVERSHOOT_SEED))
+        self.final = self.replay.positions_at(self.replay.num_turns)
+        self.assertGreater(max(self.final), BOARD_SIZE)
+        record = self.replay.record
+        self.table = WinProbabilityTable(record.snakes, record.ladders)
+
+    def test_table_clamps_overshoot(self):
+        chances = self.table.probabilities(self.final, self.replay.current_player_at(self.replay.num_turns))
+        self.assertEqual(len(chances), len(self.final))
+        self.assertEqual(self.table.probabilities([min(p, BOARD_SIZE) for p in self.final], 0),
+                         self.table.probabilities(self.final, 0))
+
+    def test_scrub_replay_to_final_turn(self):
+        from snake_and_ladder_game import SnakeAndLadderGame
+
+        game = SnakeAndLadderGame.__new__(SnakeAndLadderGame)
+        game.replay = self.replay
+        game.num_players = self.replay.record.num_players
+        game.num_computer_players = 0
+        game.player_names = []
+        game.game_seed = OVERSHOOT_SEED
+        game.game_over = False
+        game.win_table = self.table
+        game.dice_label = FakeLabel()
+        game.status_label = FakeLabel()
+        game.win_label = FakeLabel()
+        game.draw_players = lambda: None
+
+        for turn in range(self.replay.num_turns + 1):
+            game.show_replay_turn(turn)
+        self.assertEqual(game.win_label.text, "")
+        game.show_replay_turn(1)
+        self.assertIn("%", game.win_label.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
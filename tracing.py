@@ -0,0 +1,154 @@
+"""핫 패스 계측 (선택 사항)
+
+span()/traced()로 구간 시간을 재서 크기가 고정된 링 버퍼에 모으고,
+Chrome/Perfetto trace-event JSON 또는 요약 히스토그램으로 내보냅니다.
+꺼져 있을 때는 플래그 확인 한 번만 하므로 비용이 거의 없습니다.
+
+환경 변수:
+  LADDER_TRACE=1             계측 켜기
+  LADDER_TRACE_FILE=경로      종료 시 trace-event JSON 저장 (지정하면 자동으로 켜짐)
+  LADDER_TRACE_BUFFER=개수    링 버퍼 크기 (기본 65536)
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_BUFFER_SIZE = 65536
+HISTOGRAM_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+class Tracer:
+    """구간 기록을 링 버퍼에 모으는 계측기"""
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE, enabled=False):
+        self.enabled = enabled
+        self.events = deque(maxlen=buffer_size)  # (이름, 시작 ns, 길이 ns, 스레드 ID, 인자)
+        self.origin_ns = time.perf_counter_ns()
+
+    def record(self, name, start_ns, duration_ns, args=None):
+        # deque.append는 스레드 안전하므로 잠금이 필요 없습니다
+        self.events.append((name, start_ns, duration_ns, threading.get_ident(), args))
+
+    def clear(self):
+        self.events.clear()
+
+    def to_chrome_trace(self):
+        """Chrome/Perfetto에서 열 수 있는 trace-event 딕셔너리"""
+        pid = os.getpid()
+        trace_events = []
+        for name, start_ns, duration_ns, tid, args in list(self.events):
+            event = {'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': (start_ns - self.origin_ns) / 1000, 'dur': duration_ns / 1000}
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """trace-event JSON 파일로 저장합니다."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+    def summary(self):
+        """이름별 호출 수, 합계/평균/백분위 시간(ms)과 히스토그램"""
+        durations = {}
+        for name, _, duration_ns, _, _ in list(self.events):
+            durations.setdefault(name, []).append(duration_ns / 1e6)
+
+        result = {}
+        for name, values in durations.items():
+            values.sort()
+            count = len(values)
+            histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+            for value in values:
+                index = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS) if value <= bound),
+                             len(HISTOGRAM_BUCKETS_MS))
+                histogram[index] += 1
+            result[name] = {
+                'count': count,
+                'total_ms': sum(values),
+                'mean_ms': sum(values) / count,
+                'p50_ms': values[count // 2],
+                'p95_ms': values[min(count - 1, int(count * 0.95))],
+                'max_ms': values[-1],
+                'histogram': histogram,
+            }
+        return result
+
+    def format_summary(self):
+        """요약을 사람이 읽기 쉬운 표 문자열로 만듭니다."""
+        lines = [f"{'span':<28} {'count':>7} {'total ms':>10} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}"]
+        rows = sorted(self.summary().items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        for name, stats in rows:
+            lines.append(f"{name:<28} {stats['count']:>7} {stats['total_ms']:>10.2f} {stats['mean_ms']:>8.3f} "
+                         f"{stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} {stats['max_ms']:>8.3f}")
+        return "\n".join(lines)
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start_ns')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        tracer.record(self.name, self.start_ns, time.perf_counter_ns() - self.start_ns, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+_trace_file = os.environ.get("LADDER_TRACE_FILE")
+tracer = Tracer(int(os.environ.get("LADDER_TRACE_BUFFER", DEFAULT_BUFFER_SIZE)),
+                enabled=bool(_trace_file) or os.environ.get("LADDER_TRACE", "") not in ("", "0"))
+
+
+def enable(enabled=True):
+    tracer.enabled = enabled
+
+
+def span(name, **args):
+    """with span("이름"): ... 형태로 구간 시간을 기록합니다."""
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+
+def traced(name=None):
+    """함수 호출 전체를 구간으로 기록하는 데코레이터"""
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            start_ns = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.record(span_name, start_ns, time.perf_counter_ns() - start_ns)
+        return wrapper
+    return decorator
+
+
+if _trace_file:
+    atexit.register(tracer.export_chrome_trace, _trace_file)
@@ -0,0 +1,96 @@
+"""칸별 종료 턴 분포로 계산하는 실시간 승리 확률
+
+보드(와 규칙)마다 한 번, 모든 칸에서 출발했을 때 t턴이 지나도 끝나지 않을 확률 표
+survival[t, 칸]을 마르코프 전이 행렬로 만들어 둡니다. 게임 중에는 플레이어들의 현재 칸 열을
+꺼내 턴 순서대로 결합하므로 시뮬레이션 없이 배열 연산 몇 번으로 끝납니다.
+(플레이어끼리는 서로 영향을 주지 않으므로 각자의 종료 턴은 독립입니다)
+같은 (말 위치, 현재 플레이어) 상태는 캐시에서 바로 돌려줍니다.
+"""
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from game_engine import BOARD_SIZE, STANDARD_RULES
+from markov_solver import DENSE_MAX_STATES, build_transition_matrix
+
+WIN_TAIL_EPSILON = 1e-9  # 모든 칸의 남은 확률이 이보다 작아지면 표를 끝냄
+MAX_TABLE_TURNS = 5000
+WIN_CACHE_SIZE = 4096  # (말 위치, 현재 플레이어)별 결과 캐시 항목 수
+
+
+def finish_survival_table(snakes, ladders, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+    """survival[t, s] = s번 칸에서 출발해 t턴이 지나도 끝나지 않았을 확률
+
+    열 번호가 칸 번호입니다. (0번 열은 쓰지 않고, board_size 열은 이미 끝났으므로 0)
+    """
+    matrix = build_transition_matrix(snakes, ladders, board_size, rules)
+    size = board_size - 1
+    transient = matrix[:size, :size]
+    transient = transient.toarray() if size <= DENSE_MAX_STATES else transient.tocsr()
+
+    rows = [np.ones(size)]
+    while rows[-1].max() > WIN_TAIL_EPSILON and len(rows) <= MAX_TABLE_TURNS:
+        rows.append(transient @ rows[-1])
+    survival = np.zeros((len(rows), board_size + 1))
+    survival[:, 1:board_size] = rows
+    return survival
+
+
+class WinProbabilityTable:
+    """한 보드의 종료 턴 표와 상태별 승리 확률 캐시"""
+    def __init__(self, snakes, ladders, board_size=BOARD_SIZE, rules=STANDARD_RULES):
+        self.board_size = board_size
+        self.survival = finish_survival_table(snakes, ladders, board_size, rules)
+        self.by_square = np.ascontiguousarray(self.survival.T)  # 칸별 행 (플레이어 순서로 모을 때 연속 메모리)
+        self.log_by_square = np.log(np.where(self.by_square > 0, self.by_square, 1.0))  # 0번/마지막 칸은 쓰지 않음
+        self.cache = OrderedDict()
+
+    def horizon(self, positions):
+        """아무도 끝내지 못했을 확률이 WIN_TAIL_EPSILON보다 작아지는 턴 + 1
+
+        칸별 인원수와 로그 표의 곱이라 플레이어 수와 관계없이 계산되며, 플레이어가 많을수록
+        결합할 턴 수가 줄어듭니다. (확률 곱이 비정규 수로 작아져 느려지는 것도 막습니다)
+        """
+        counts = np.bincount(positions, minlength=self.by_square.shape[0])
+        nobody_done = counts @ self.log_by_square
+        turns = nobody_done.size - 1
+        below = np.flatnonzero(nobody_done < math.log(WIN_TAIL_EPSILON))
+        return min(int(below[0]) + 1, turns) if below.size else turns
+
+    def probabilities(self, positions, current_player):
+        """자리별 승리 확률 튜플 (current_player부터 턴 순서대로 굴린다고 봄)
+
+        턴 순서 k번째 플레이어가 t번째 턴에 끝내고 이기려면 앞 순서는 t턴까지,
+        뒤 순서는 t-1턴까지 끝나지 않아야 합니다.
+        마지막 칸을 넘어간 위치(기록에는 그대로 남음)는 마지막 칸으로 봅니다.
+        """
+        positions = [min(position, self.board_size) for position in positions]
+        key = (tuple(positions), current_player)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            return cached
+
+        num_players = len(positions)
+        order = [(current_player + k) % num_players for k in range(num_players)]
+        rows = self.by_square[[positions[seat] for seat in order], :self.horizon(positions) + 1]
+        before, after = rows[:, :-1], rows[:, 1:]  # 턴 순서 k번째 플레이어의 P(T > t - 1), P(T > t)
+        finish = before - after
+        ahead = np.ones_like(after)  # 앞 순서 플레이어들의 P(T > t) 곱
+        np.cumprod(after[:-1], axis=0, out=ahead[1:])
+        behind = np.ones_like(before)  # 뒤 순서 플레이어들의 P(T > t - 1) 곱
+        np.cumprod(before[:0:-1], axis=0, out=behind[-2::-1])
+        wins = (finish * ahead * behind).sum(axis=1)
+        total = wins.sum()
+        if total > 0:
+            wins /= total  # 표 끝에서 잘린 아주 작은 확률을 나눠 줍니다
+
+        result = [0.0] * num_players
+        for k, seat in enumerate(order):
+            result[seat] = float(wins[k])
+        result = tuple(result)
+        self.cache[key] = result
+        if len(self.cache) > WIN_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return result